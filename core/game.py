@@ -9,7 +9,8 @@ from ui.ui import UI
 from core.audio_manager import AudioManager
 from core.level_loader import LevelLoader
 from core.save_system import SaveSystem
-from src.tetracoin.spec import GridState, EntityType, ColorType, PhysicsEngine, Entity, Coin, PiggyBank, Obstacle, FixedBlock
+from src.tetracoin.spec import GridState, EntityType, ColorType, PhysicsEngine, SleepingPhysics, EventKind, Entity, Coin, PiggyBank, Obstacle, FixedBlock
+from src.tetracoin.timestep import FixedTimestep, interpolate
 from typing import Optional
 
 class Game:
@@ -41,6 +42,9 @@ class Game:
         
         # New Physics Engine State
         self.grid_state: GridState = None
+        self.physics: Optional[SleepingPhysics] = None # Ticks only coins that can still move
+        self.physics_clock = FixedTimestep.from_rate(PHYSICS_TICK_RATE, MAX_PHYSICS_STEPS_PER_FRAME)
+        self.previous_positions = {} # Coin id -> (row, col) before the last tick, for interpolation
         self.mode = "LEGACY" # "LEGACY" or "PHYSICS"
         
         # PHYSICS mode gameplay state
@@ -56,23 +60,13 @@ class Game:
         # Create GridState
         self.grid_state = GridState(rows=rows, cols=cols)
         
-        # Convert entities JSON to Dataclasses
+        # Convert entities JSON to Dataclasses (every EntityType)
         for e_data in self.level_data['entities']:
-            etype = EntityType(e_data['type'])
-            color = ColorType(e_data['color'])
-            
-            if etype == EntityType.COIN:
-                entity = Coin(id=e_data['id'], row=e_data['row'], col=e_data['col'], color=color)
-            elif etype == EntityType.PIGGYBANK:
-                entity = PiggyBank(id=e_data['id'], row=e_data['row'], col=e_data['col'], color=color)
-                entity.capacity = e_data.get('capacity', 5)
-                entity.current_count = e_data.get('current_count', 0)
-            elif etype == EntityType.OBSTACLE:
-                entity = Obstacle(id=e_data['id'], row=e_data['row'], col=e_data['col'], color=color)
-            elif etype == EntityType.FIXED_BLOCK:
-                entity = FixedBlock(id=e_data['id'], row=e_data['row'], col=e_data['col'], color=color)
-            
-            self.grid_state.entities.append(entity)
+            self.grid_state.entities.append(Entity.from_dict(e_data))
+        self.physics = SleepingPhysics(self.grid_state)
+        self.physics.events.subscribe(EventKind.COLLECT, self._on_coin_collected)
+        self.physics_clock.reset()
+        self.previous_positions = {}
             
         # Init visual environment
         max_grid_width = SCREEN_WIDTH - 20
@@ -95,8 +89,12 @@ class Game:
         self.entity_sprite_map = {} # Map entity_id -> sprite
         self._sync_sprites_to_state(rebuild=True)
         
-    def _sync_sprites_to_state(self, rebuild=False):
-        """Synchronize Pygame sprites with the logical GridState."""
+    def _sync_sprites_to_state(self, rebuild=False, alpha=1.0):
+        """
+        Synchronize Pygame sprites with the logical GridState.
+        alpha places moving coins between their position before the last
+        physics tick (0.0) and after it (1.0).
+        """
         if rebuild:
             self.all_sprites.empty()
             self.coin_sprites.empty()
@@ -145,12 +143,16 @@ class Game:
                     
                 if entity.id in self.entity_sprite_map:
                     sprite = self.entity_sprite_map[entity.id]
-                    # Direct position update (bypass animation for now)
                     sprite.grid_x = entity.col
                     sprite.grid_y = entity.row
+                    row, col = entity.row, entity.col
+                    previous = self.previous_positions.get(entity.id)
+                    if previous is not None:
+                        row = interpolate(previous[0], row, alpha)
+                        col = interpolate(previous[1], col, alpha)
                     # Manually update rect if we bypass Sprite.update logic
-                    sprite.rect.x = GRID_OFFSET_X + entity.col * self.tile_size
-                    sprite.rect.y = GRID_OFFSET_Y + entity.row * self.tile_size - (15 if entity.type == EntityType.COIN else 0)
+                    sprite.rect.x = GRID_OFFSET_X + round(col * self.tile_size)
+                    sprite.rect.y = GRID_OFFSET_Y + round(row * self.tile_size) - (15 if entity.type == EntityType.COIN else 0)
 
     def _init_legacy_level(self):
         """Initialize the game state from legacy level format."""
@@ -614,10 +616,7 @@ class Game:
         """Get entity at grid position (row, col)."""
         if not self.grid_state:
             return None
-        for entity in self.grid_state.entities:
-            if not entity.is_collected and entity.row == row and entity.col == col:
-                return entity
-        return None
+        return self.grid_state.get_entity_at(row, col)
     
     def _is_movable(self, entity: Entity) -> bool:
         """Check if entity type is movable by player."""
@@ -648,14 +647,22 @@ class Game:
             return
         
         # Apply move
+        old_row, old_col = entity.row, entity.col
         entity.row = new_row
         entity.col = new_col
         self.physics_move_count += 1
         self.audio_manager.play_move()
         print(f"Moved {entity.id} to ({new_row}, {new_col})")
         
-        # Physics will update in next update() cycle
+        # Physics will update in next update() cycle, if the move freed a coin;
+        # the moved sprite itself is synced now
+        self.physics.moved(entity, old_row, old_col)
+        self._sync_sprites_to_state()
     
+    def _on_coin_collected(self, event):
+        """A coin dropped into a piggybank during a physics tick."""
+        self.audio_manager.play_collect()
+
     def _check_physics_win_condition(self):
         """Check if all coins are collected in PHYSICS mode."""
         if not self.grid_state:
@@ -784,22 +791,27 @@ class Game:
             # ========== PHYSICS MODE UPDATE FLOW ==========
             # 1. Input is handled in handle_input() (already integrated)
             # 2. Gameplay logic (move validation done in _move_entity_physics)
-            # 3. Physics Step
+            # 3. Physics Steps at a fixed rate, as many as the frame's real time
+            #    allows (skipped while the grid is at rest)
             if self.grid_state:
-                self.grid_state, events = PhysicsEngine.update(self.grid_state)
-                
-                # 4. Handle Physics Events (coin collection, etc.)
-                for event in events:
-                    if event.startswith("COLLECT_"):
-                        color = event.split("_")[1]
-                        self.audio_manager.play_collect()
-                        # Update stats if needed
-                
-                # 5. Sync Sprites with State
-                self._sync_sprites_to_state()
+                steps = self.physics_clock.advance(dt)
+                for _ in range(steps):
+                    if not self.physics.is_awake or self.level_complete:
+                        self.physics_clock.reset()
+                        break
+                    # Positions before the tick, for render interpolation
+                    self.previous_positions = {e.id: (e.row, e.col) for e in self.grid_state.entities
+                                               if e.type == EntityType.COIN and not e.is_collected}
+                    # 4. Physics Events (coin collection, etc.) go to the
+                    #    subscribers registered in _init_physics_level
+                    self.physics.step()
+                    
+                    # 5. Check Win Condition (all coins collected)
+                    self._check_physics_win_condition()
                 
-                # 6. Check Win Condition (all coins collected)
-                self._check_physics_win_condition()
+                # 6. Sync Sprites with State, between the last two ticks
+                if steps or self.physics.is_awake:
+                    self._sync_sprites_to_state(alpha=self.physics_clock.alpha)
             
             # 7. Update Timer
             elapsed_time = (pygame.time.get_ticks() - self.start_time) / 1000
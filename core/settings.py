@@ -5,6 +5,8 @@ SCREEN_WIDTH = 540
 SCREEN_HEIGHT = 960
 TITLE = "TetraCoin"
 FPS = 60
+PHYSICS_TICK_RATE = 60  # Simulation ticks per second, independent of FPS
+MAX_PHYSICS_STEPS_PER_FRAME = 5  # Catch-up limit after a late frame
 
 # Layout Settings
 SAFE_AREA_TOP = 40    # Space for status bar/notch
@@ -19,6 +19,8 @@ from src.tetracoin.spec import (
 )
 from src.tetracoin.difficulty import TetracoinDifficultyAnalyzer
 from src.tetracoin.solver import TetracoinSolver
+from src.tetracoin.solve_cache import SolveCache
+from src.tetracoin.solver_stats import SolutionSpace
 
 class AdjustmentStrategy(Enum):
     """Strategies available to modify difficulty."""
@@ -63,6 +65,9 @@ class AdjusterConfig:
     allow_obstacles: bool = True
     max_obstacles: int = 10
     convergence_patience: int = 5  # Iterations without improvement before forcing strategy change
+    solver_engine: str = "bfs"  # TetracoinSolver.solve engine: "bfs", "astar", "idastar"
+    solver_timeout: Optional[float] = None  # Seconds per solve; timed-out grids count as unsolvable
+    measure_solution_space: bool = False  # bfs engine: score with SolutionSpace metrics (costs extra expansions)
     strategy_weights: Dict[str, float] = None
     
     def __post_init__(self):
@@ -97,14 +102,18 @@ class TetracoinAutoAdjuster:
     
     def __init__(
         self,
-        config: Optional[AdjusterConfig] = None
+        config: Optional[AdjusterConfig] = None,
+        solve_cache: Optional[SolveCache] = None
     ):
         """
         Initialize the auto-adjuster.
         Note: We use static methods from Analyzer and Solver usually, but can instantiate if needed.
         The prompts suggests passing instances. We'll assume they are stateless or singletons mostly.
+        Solver results go through `solve_cache` (a private in-memory one by default),
+        so checking solvability and difficulty of the same grid costs one search.
         """
         self.config = config or AdjusterConfig()
+        self.solve_cache = solve_cache if solve_cache is not None else SolveCache()
         
         # Internal state
         self._iteration_count = 0
@@ -340,15 +349,23 @@ class TetracoinAutoAdjuster:
     def _calculate_difficulty(self, grid: GridState) -> Optional[float]:
         # Need solution for analysis
         # Find solution first
-        found, step_count, moves = TetracoinSolver.solve_bfs(grid, max_depth=20)
+        space = (SolutionSpace() if self.config.measure_solution_space and self.config.solver_engine == "bfs"
+                 else None)
+        found, step_count, moves = TetracoinSolver.solve(
+            grid, engine=self.config.solver_engine, max_depth=20, timeout=self.config.solver_timeout,
+            solution_space=space, cache=self.solve_cache
+        )
         if not found:
             return None
             
-        report = TetracoinDifficultyAnalyzer.analyze(grid, moves)
+        report = TetracoinDifficultyAnalyzer.analyze(grid, moves, space)
         return report.score # 0-100 range
 
     def _is_solvable(self, grid: GridState) -> bool:
-        found, _, _ = TetracoinSolver.solve_bfs(grid, max_depth=20)
+        found, _, _ = TetracoinSolver.solve(
+            grid, engine=self.config.solver_engine, max_depth=20, timeout=self.config.solver_timeout,
+            cache=self.solve_cache
+        )
         return found
         
     def _is_within_tolerance(self, current_score: float, target_ratio: float) -> bool:
@@ -0,0 +1,196 @@
+"""
+Tetracoin Batched Physics.
+Vectorised counterpart of spec.PhysicsEngine that simulates many grids of
+the same size at once, for generators and Monte-Carlo evaluators that
+settle thousands of candidates.
+
+BatchPhysics keeps N grids as a struct of arrays, one (N, rows, cols)
+array per attribute:
+
+    kind      cell content (EMPTY, COIN, PIGGY, BLOCK, OTHER)
+    color     color code of the coin or piggybank in the cell
+    count     piggybank fill level, capacity its capacity
+    falling   is_falling of the coin in the cell
+    entity    index in grid.entities of the entity in the cell (-1: none)
+
+update() advances every grid by one tick with the rules of
+PhysicsEngine._update_coin. Rows are processed bottom-up like the
+row-sorted entity loop of PhysicsEngine.update, so a coin follows the one
+below it within the same tick. settle() ticks until every grid is at
+rest, and write_back() copies coin positions, flags and piggybank counts
+into the GridStates. Grids must hold at most one live entity per cell.
+
+NumPy is optional (pip install numpy): the module imports without it,
+and BatchPhysics raises ImportError when used.
+"""
+from typing import List, Optional, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # Optional dependency
+    np = None
+
+from src.tetracoin.spec import GridState, EntityType, ColorType
+
+# Cell kinds
+EMPTY = 0
+COIN = 1
+PIGGY = 2
+BLOCK = 3  # Stops a coin and clears is_falling (obstacles, fixed blocks)
+OTHER = 4  # Stops a coin and leaves is_falling alone (supports, deflectors, ...)
+
+_KINDS = {
+    EntityType.COIN: COIN,
+    EntityType.PIGGYBANK: PIGGY,
+    EntityType.OBSTACLE: BLOCK,
+    EntityType.FIXED_BLOCK: BLOCK,
+}
+_COLORS = {color: code for code, color in enumerate(ColorType)}
+
+
+class BatchPhysics:
+    """
+    N same-sized grids simulated together.
+    Build with BatchPhysics.from_grids(grids); the GridStates are only read
+    again by write_back.
+    """
+
+    def __init__(self, size: int, rows: int, cols: int, max_entities: int):
+        if np is None:
+            raise ImportError("BatchPhysics requires numpy")
+        self.size = size
+        self.rows = rows
+        self.cols = cols
+        shape = (size, rows, cols)
+        self.kind = np.zeros(shape, dtype=np.int8)
+        self.color = np.full(shape, -1, dtype=np.int8)
+        self.count = np.zeros(shape, dtype=np.int32)
+        self.capacity = np.zeros(shape, dtype=np.int32)
+        self.falling = np.zeros(shape, dtype=bool)
+        self.entity = np.full(shape, -1, dtype=np.int32)
+        # Coins collected so far: flag, plus the row and is_falling they had
+        self.collected = np.zeros((size, max_entities), dtype=bool)
+        self.collected_row = np.zeros((size, max_entities), dtype=np.int32)
+        self.collected_falling = np.zeros((size, max_entities), dtype=bool)
+
+    @classmethod
+    def from_grids(cls, grids: Sequence[GridState]) -> 'BatchPhysics':
+        if not grids:
+            raise ValueError("from_grids needs at least one grid")
+        rows, cols = grids[0].rows, grids[0].cols
+        if any((g.rows, g.cols) != (rows, cols) for g in grids):
+            raise ValueError("All grids in a batch must have the same size")
+
+        batch = cls(len(grids), rows, cols, max(len(g.entities) for g in grids))
+        for n, grid in enumerate(grids):
+            # Reversed: the first entity in list order wins a shared cell
+            for index in range(len(grid.entities) - 1, -1, -1):
+                e = grid.entities[index]
+                if e.is_collected or not (0 <= e.row < rows and 0 <= e.col < cols):
+                    continue
+                at = (n, e.row, e.col)
+                batch.kind[at] = _KINDS.get(e.type, OTHER)
+                batch.entity[at] = index
+                if e.type in (EntityType.COIN, EntityType.PIGGYBANK):
+                    batch.color[at] = _COLORS[e.color]
+                if e.type == EntityType.COIN:
+                    batch.falling[at] = e.is_falling
+                elif e.type == EntityType.PIGGYBANK:
+                    batch.count[at] = e.current_count
+                    batch.capacity[at] = e.capacity
+        return batch
+
+    # --- Simulation ----------------------------------------------------------
+
+    def update(self) -> 'np.ndarray':
+        """
+        Advance every grid by one tick.
+        Returns the (N,) mask of grids in which a coin fell or was collected.
+        """
+        kind, color, falling, entity = self.kind, self.color, self.falling, self.entity
+        moved = np.zeros(self.size, dtype=bool)
+
+        # Bottom row: nowhere to fall
+        falling[:, -1][kind[:, -1] == COIN] = False
+
+        has_coins = (kind[:, :-1] == COIN).any(axis=(0, 2))
+        for r in range(self.rows - 2, -1, -1):
+            if not has_coins[r]:
+                continue
+            coin = kind[:, r] == COIN
+            below = kind[:, r + 1]
+            fall = coin & (below == EMPTY)
+            at_piggy = coin & (below == PIGGY)
+            collect = (at_piggy & (color[:, r + 1] == color[:, r])
+                       & (self.count[:, r + 1] < self.capacity[:, r + 1]))
+            stop = coin & ((below == COIN) | (below == BLOCK) | (at_piggy & ~collect))
+
+            falling[:, r][stop] = False
+            if fall.any():
+                kind[:, r + 1][fall] = COIN
+                color[:, r + 1][fall] = color[:, r][fall]
+                entity[:, r + 1][fall] = entity[:, r][fall]
+                falling[:, r + 1][fall] = True
+                self._clear(r, fall)
+            if collect.any():
+                self.count[:, r + 1] += collect
+                n = np.nonzero(collect)[0]
+                index = entity[:, r][collect]
+                self.collected[n, index] = True
+                self.collected_row[n, index] = r
+                self.collected_falling[n, index] = falling[:, r][collect]
+                self._clear(r, collect)
+            moved |= (fall | collect).any(axis=1)
+        return moved
+
+    def settle(self, max_ticks: int = 100) -> 'np.ndarray':
+        """
+        Tick until every grid is at rest (or max_ticks).
+        Returns the (N,) ticks each grid took, counting its final quiet tick.
+        """
+        ticks = np.zeros(self.size, dtype=np.int32)
+        active = np.ones(self.size, dtype=bool)
+        for _ in range(max_ticks):
+            moved = self.update()
+            ticks += active
+            active &= moved
+            if not active.any():
+                break
+        return ticks
+
+    def _clear(self, r: int, mask: 'np.ndarray'):
+        self.kind[:, r][mask] = EMPTY
+        self.color[:, r][mask] = -1
+        self.entity[:, r][mask] = -1
+        self.falling[:, r][mask] = False
+
+    # --- Results -------------------------------------------------------------
+
+    @property
+    def coins_left(self) -> 'np.ndarray':
+        """(N,) live coins per grid."""
+        return (self.kind == COIN).sum(axis=(1, 2))
+
+    @property
+    def won(self) -> 'np.ndarray':
+        """(N,) mask of grids with every coin collected."""
+        return self.coins_left == 0
+
+    def write_back(self, grids: Sequence[GridState], indices: Optional[List[int]] = None):
+        """
+        Copy the simulated state into `grids` (the batch's grids, or those
+        at `indices`), as if PhysicsEngine had run on them.
+        """
+        for n in (range(self.size) if indices is None else indices):
+            entities = grids[n].entities
+            for r, c in zip(*np.nonzero(self.kind[n] == COIN)):
+                coin = entities[self.entity[n, r, c]]
+                coin.row = int(r)
+                coin.is_falling = bool(self.falling[n, r, c])
+            for r, c in zip(*np.nonzero(self.kind[n] == PIGGY)):
+                entities[self.entity[n, r, c]].current_count = int(self.count[n, r, c])
+            for index in np.nonzero(self.collected[n])[0]:
+                coin = entities[index]
+                coin.row = int(self.collected_row[n, index])
+                coin.is_falling = bool(self.collected_falling[n, index])
+                coin.is_collected = True
@@ -0,0 +1,101 @@
+"""
+Tetracoin Batch Solver.
+Solves many grids in one call (TetracoinSolver.solve_many), streaming
+(index, SolveResult) pairs back as they become available.
+
+Setup is paid once per batch rather than once per grid: Zobrist tables are
+shared by all levels of a size (solver_state.zobrist_rows), and with
+workers > 1 a process pool is started before the first grid is sent, each
+worker warming its tables on one sample grid of every size found among the
+first grids. Grids travel in tasks of GRIDS_PER_TASK to keep IPC off the
+critical path of small levels, and at most `workers * TASKS_PER_WORKER`
+tasks are submitted or buffered at once, so `grids` may be a lazy iterator
+of any length.
+"""
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+import itertools
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from src.tetracoin.spec import GridState
+from src.tetracoin.solver_state import PackedLevel
+from src.tetracoin.solver_stats import BatchSolveStats, SolverStats
+
+# Grids sent to a worker at once; small levels solve faster than a round trip
+GRIDS_PER_TASK = 4
+# Tasks queued per worker, to keep workers busy between results
+TASKS_PER_WORKER = 2
+
+
+def _init_worker(samples: List[GridState]):
+    for grid in samples:
+        PackedLevel(grid)
+
+
+def _solve_one(index: int, grid: GridState, options: Dict[str, Any], collect_stats: bool):
+    # Imported here: solver.py dispatches to this module
+    from src.tetracoin.solver import TetracoinSolver
+    stats = SolverStats() if collect_stats else None
+    return index, TetracoinSolver.solve(grid, stats=stats, **options)
+
+
+def _solve_task(task: List[Tuple[int, GridState]], options: Dict[str, Any], collect_stats: bool):
+    return [_solve_one(index, grid, options, collect_stats) for index, grid in task]
+
+
+def solve_many(grids: Iterable[GridState], options: Dict[str, Any], workers: int = 1, ordered: bool = True,
+               batch_stats: Optional[BatchSolveStats] = None, collect_stats: bool = False) -> Iterator[Tuple[int, Any]]:
+    """
+    Solve every grid with TetracoinSolver.solve(**options).
+    Yields (index in `grids`, SolveResult), in input order when `ordered`,
+    otherwise as soon as each grid is done. `batch_stats` is updated as
+    results are yielded. Leaving the loop early shuts the pool down.
+    """
+    started = time.monotonic()
+    if batch_stats is not None:
+        batch_stats.workers = max(1, workers)
+
+    def report(index, result):
+        if batch_stats is not None:
+            batch_stats.record(result)
+            batch_stats.wall_time = time.monotonic() - started
+        return index, result
+
+    if workers <= 1:
+        for index, grid in enumerate(grids):
+            yield report(*_solve_one(index, grid, options, collect_stats))
+        return
+
+    limit = workers * TASKS_PER_WORKER
+    indexed = enumerate(grids)
+    tasks = iter(lambda: list(itertools.islice(indexed, GRIDS_PER_TASK)), [])
+    first = list(itertools.islice(tasks, limit))
+    samples = list({(g.rows, g.cols): g for task in first for _, g in task}.values())
+    pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(samples,))
+    pending = set()
+    finished: Dict[int, Any] = {}  # Ordered mode: results waiting for an earlier grid
+    next_index = 0
+
+    def submit(task):
+        pending.add(pool.submit(_solve_task, task, options, collect_stats))
+
+    try:
+        for task in first:
+            submit(task)
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                pending.discard(future)
+                for index, result in future.result():
+                    if ordered:
+                        finished[index] = result
+                    else:
+                        yield report(index, result)
+            while next_index in finished:
+                yield report(next_index, finished.pop(next_index))
+                next_index += 1
+            room = limit - len(pending) - len(finished) // GRIDS_PER_TASK
+            for task in itertools.islice(tasks, max(0, room)):
+                submit(task)
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
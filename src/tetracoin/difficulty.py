@@ -5,9 +5,11 @@ Unified difficulty engine for the entire project.
 from __future__ import annotations
 from dataclasses import dataclass
 from enum import Enum, auto
-from typing import List, Tuple, Any, Dict, Set
+import math
+from typing import List, Tuple, Any, Dict, Set, Optional
 
 from src.tetracoin.spec import GridState, EntityType
+from src.tetracoin.solver_stats import SolutionSpace
 # We treat imports inside methods to avoid circular deps if needed, but typings need them
 # Using string forward refs for Grid and Move
 
@@ -32,6 +34,7 @@ class DifficultyReport:
     score       : float            # 0–100 composite difficulty score
     tier        : DifficultyTier   # EASY | MEDIUM | HARD | EXPERT
     breakdown   : Dict[str, float] # normalised contributions per metric
+    space       : Optional[SolutionSpace] = None # solver measurements used, if any
 
 
 # --------------------------------------------------------------------------- #
@@ -41,6 +44,9 @@ class TetracoinDifficultyAnalyzer:
     """
     Unified difficulty engine for the entire project.
     Call            >>> report = TetracoinDifficultyAnalyzer.analyze(grid, path)
+    or, with the state space measured by the solver in the same search,
+                    >>> TetracoinSolver.solve_bfs(grid, solution_space=space)
+                    >>> report = TetracoinDifficultyAnalyzer.analyze(grid, path, space)
     """
 
     # === tuning knobs ===
@@ -59,21 +65,24 @@ class TetracoinDifficultyAnalyzer:
 
     # === public API =======================================================
     @classmethod
-    def analyze(cls, grid: GridState, solution_path: List['Move']) -> DifficultyReport:
+    def analyze(cls, grid: GridState, solution_path: List['Move'],
+                space: Optional[SolutionSpace] = None) -> DifficultyReport:
         """
         Parameters
         ----------
         grid : the immutable level object.
         solution_path : ordered list of moves that solves `grid`.
+        space : SolutionSpace filled by the solver that found `solution_path`;
+                replaces the routing estimate with measured branching.
         """
-        raw = cls._measure(grid, solution_path)
+        raw = cls._measure(grid, solution_path, space)
         breakdown, score = cls._normalise_and_score(raw)
         tier = cls._tier_for(score)
-        return DifficultyReport(metrics=raw, score=score, tier=tier, breakdown=breakdown)
+        return DifficultyReport(metrics=raw, score=score, tier=tier, breakdown=breakdown, space=space)
 
     # === private helpers ===================================================
     @staticmethod
-    def _measure(grid: GridState, path: List['Move']) -> DifficultyMetrics:
+    def _measure(grid: GridState, path: List['Move'], space: Optional[SolutionSpace] = None) -> DifficultyMetrics:
         """Extract *raw* (un-scaled) difficulty signals from grid + path."""
         # ---- Collection complexity ---------------------------------------
         coins = [e for e in grid.entities if e.type == EntityType.COIN]
@@ -102,6 +111,14 @@ class TetracoinDifficultyAnalyzer:
         # We'll normalize this.
         routing_nodes = len(path) * movable_count
 
+        routing = routing_nodes // 4 # Scale down a bit? Or adjust Max Expected
+        if space is not None and len(space.path_branching) == len(path):
+            # Measured: bits of choice along the solution (log2 of the move
+            # sequences of its length) minus the bits given away by having
+            # several optimal solutions
+            bits = sum(math.log2(b) for b in space.path_branching if b > 0)
+            routing = max(0, round(bits - math.log2(max(1, space.optimal_solutions))))
+
         # ---- Move complexity ---------------------------------------------
         move_count = len(path)
 
@@ -113,10 +130,13 @@ class TetracoinDifficultyAnalyzer:
         for e in all_movable:
             if e.id not in moved_ids:
                 deception += 1
+        if space is not None:
+            # Moves that look playable but lose the level
+            deception += round(space.dead_end_ratio * TetracoinDifficultyAnalyzer._MAX_EXPECTED['deception'])
 
         return DifficultyMetrics(
             collection=total_required_coins,
-            routing=routing_nodes // 4, # Scale down a bit? Or adjust Max Expected
+            routing=routing,
             moves=move_count,
             deception=deception,
         )
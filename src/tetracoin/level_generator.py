@@ -19,9 +19,11 @@ from src.tetracoin.level_generator_spec import (
 from src.tetracoin.generator import TetracoinGridGenerator
 from src.tetracoin.coin_placer import CoinPlacer
 from src.tetracoin.flow_control import FlowControlObstacleAdder
-from src.tetracoin.solver import TetracoinSolver
+from src.tetracoin.solver import TetracoinSolver, SolveStatus
+from src.tetracoin.solver_stats import SolutionSpace, SolverStats
+from src.tetracoin.solve_cache import SolveCache
 from src.tetracoin.difficulty import TetracoinDifficultyAnalyzer
-from src.tetracoin.auto_adjuster import TetracoinAutoAdjuster
+from src.tetracoin.auto_adjuster import TetracoinAutoAdjuster, AdjusterConfig
 from src.tetracoin.config_validator import TetracoinConfigValidator, ValidationResult
 from src.tetracoin.spec import GridState
 
@@ -41,6 +43,7 @@ class TetracoinLevelGenerator:
         difficulty_analyzer: Optional[TetracoinDifficultyAnalyzer] = None,
         auto_adjuster: Optional[TetracoinAutoAdjuster] = None,
         config_validator: Optional[TetracoinConfigValidator] = None,
+        solve_cache: Optional[SolveCache] = None,
         logger: Optional[logging.Logger] = None,
         enable_auto_adjustment: bool = True,
         max_generation_attempts: int = 10,
@@ -69,8 +72,14 @@ class TetracoinLevelGenerator:
         self.coin_placer = coin_placer or CoinPlacer(rng=random)
         self.obstacle_adder = obstacle_adder or FlowControlObstacleAdder(rng=random)
         self.solver = solver or TetracoinSolver()
+        # Shared with the default adjuster: grids it already solved are not searched again
+        self.solve_cache = solve_cache if solve_cache is not None else SolveCache(path=self.config.solve_cache_path)
         self.difficulty_analyzer = difficulty_analyzer or TetracoinDifficultyAnalyzer()
-        self.auto_adjuster = auto_adjuster or TetracoinAutoAdjuster()
+        self.auto_adjuster = auto_adjuster or TetracoinAutoAdjuster(
+            AdjusterConfig(solver_engine=self.config.solver_engine, solver_timeout=self.config.solver_timeout,
+                           measure_solution_space=self.config.measure_solution_space),
+            solve_cache=self.solve_cache
+        )
         self.config_validator = config_validator or TetracoinConfigValidator()
         
         self.enable_auto_adjustment = enable_auto_adjustment
@@ -105,6 +114,16 @@ class TetracoinLevelGenerator:
         current_config = copy.deepcopy(self.config)
         if difficulty_target:
             current_config = TetracoinGenerationConfig.from_difficulty(difficulty_target)
+            # Solver settings are not part of the difficulty presets
+            current_config.solver_engine = self.config.solver_engine
+            current_config.solver_beam_width = self.config.solver_beam_width
+            current_config.require_optimal_solution = self.config.require_optimal_solution
+            current_config.solver_macro_moves = self.config.solver_macro_moves
+            current_config.solver_visited_store = self.config.solver_visited_store
+            current_config.solver_memory_mb = self.config.solver_memory_mb
+            current_config.solver_timeout = self.config.solver_timeout
+            current_config.collect_solver_stats = self.config.collect_solver_stats
+            current_config.measure_solution_space = self.config.measure_solution_space
             
         if custom_config:
             # Simple override (deep merge would be better but keeping it simple)
@@ -155,14 +174,31 @@ class TetracoinLevelGenerator:
                 grid = self.obstacle_adder.add_obstacles(grid, numeric_difficulty)
                 
                 # 2.4 Verify Solvability
-                # TetracoinSolver.solve_bfs returns (found, steps, moves)
-                # max_depth based on difficulty
+                # TetracoinSolver.solve returns a SolveResult (unpacks as found, steps, moves)
+                # max_depth based on difficulty, engine and time budget from config
                 max_depth = 8 + numeric_difficulty * 2
                 
-                is_solvable, steps, moves = self.solver.solve_bfs(
+                solve_result = self.solver.solve(
                     GridState(rows=grid.rows, cols=grid.cols, entities=grid.entities), 
-                    max_depth=max_depth
+                    engine=current_config.solver_engine,
+                    macro_moves=current_config.solver_macro_moves,
+                    visited_store=current_config.solver_visited_store,
+                    memory_mb=current_config.solver_memory_mb,
+                    beam_width=current_config.solver_beam_width,
+                    max_depth=max_depth,
+                    timeout=current_config.solver_timeout,
+                    stats=SolverStats() if current_config.collect_solver_stats else None,
+                    solution_space=self._solution_space(current_config),
+                    cache=self.solve_cache
                 )
+                is_solvable, steps, moves = solve_result
+                
+                if solve_result.status == SolveStatus.UNKNOWN:
+                    # Not proven unsolvable, just too expensive: drop it quickly
+                    self.stats.increment_unknown_attempts()
+                    self.logger.debug(f"Solver gave up after {solve_result.elapsed:.2f}s "
+                                      f"(no solution within {solve_result.depth_proven} moves), retrying...")
+                    continue
                 
                 if not is_solvable:
                     self.stats.increment_unsolvable_attempts()
@@ -175,7 +211,7 @@ class TetracoinLevelGenerator:
                 # 2.5 Analyze Difficulty
                 # DifficultyAnalyzer expects GridState and Moves
                 # If unsolvable and forced is False, moves is empty list probably.
-                difficulty_report = self.difficulty_analyzer.analyze(grid, moves)
+                difficulty_report = self.difficulty_analyzer.analyze(grid, moves, solve_result.solution_space)
                 
                 # 2.6 Auto-adjustment
                 # Only if solvable (otherwise score is invalid usually) and enabled
@@ -201,12 +237,42 @@ class TetracoinLevelGenerator:
                          if adjust_res.success:
                              grid = adjust_res.grid
                              # Re-solve and Re-analyze
-                             is_solvable, steps, moves = self.solver.solve_bfs(
+                             solve_result = self.solver.solve(
                                 GridState(rows=grid.rows, cols=grid.cols, entities=grid.entities), 
-                                max_depth=max_depth
+                                engine=current_config.solver_engine,
+                                macro_moves=current_config.solver_macro_moves,
+                                visited_store=current_config.solver_visited_store,
+                                memory_mb=current_config.solver_memory_mb,
+                                beam_width=current_config.solver_beam_width,
+                                max_depth=max_depth,
+                                timeout=current_config.solver_timeout,
+                                stats=SolverStats() if current_config.collect_solver_stats else None,
+                                solution_space=self._solution_space(current_config),
+                                cache=self.solve_cache
                              )
-                             difficulty_report = self.difficulty_analyzer.analyze(grid, moves)
+                             is_solvable, steps, moves = solve_result
+                             difficulty_report = self.difficulty_analyzer.analyze(grid, moves, solve_result.solution_space)
                 
+                # 2.6b Exact re-solve
+                # Approximate engines (beam search) screen candidates quickly;
+                # only the surviving level pays for an optimal solution
+                if is_solvable and current_config.require_optimal_solution and not solve_result.proven_optimal:
+                    exact_result = self.solver.solve(
+                        GridState(rows=grid.rows, cols=grid.cols, entities=grid.entities),
+                        engine="astar",
+                        max_depth=max_depth,
+                        timeout=current_config.solver_timeout,
+                        stats=SolverStats() if current_config.collect_solver_stats else None,
+                        cache=self.solve_cache
+                    )
+                    if exact_result.status != SolveStatus.SOLVED:
+                        self.stats.increment_unknown_attempts()
+                        self.logger.debug("No optimal solution within the time budget, retrying...")
+                        continue
+                    solve_result = exact_result
+                    is_solvable, steps, moves = solve_result
+                    difficulty_report = self.difficulty_analyzer.analyze(grid, moves, solve_result.solution_space)
+
                 # 2.7 Final Validation
                 # Validate using config dictionary format
                 config_dict = self.grid_generator.to_config_dict(grid)
@@ -233,7 +299,10 @@ class TetracoinLevelGenerator:
                     num_coins=len(current_config.num_coins) if isinstance(current_config.num_coins, list) else current_config.num_coins, # Fix: num_coins is int
                     num_obstacles=len(config_dict['obstacles']),
                     grid_dimensions=(current_config.grid_width, current_config.grid_height),
-                    seed_used=seed
+                    seed_used=seed,
+                    solver_stats=solve_result.stats.to_dict() if solve_result.stats else None,
+                    solution_proven_optimal=solve_result.proven_optimal,
+                    solution_space=solve_result.solution_space.to_dict() if solve_result.solution_space is not None else None
                 )
                 # Fix num_coins read
                 metadata.num_coins = len([e for e in grid.entities if e.type == 'COIN']) # Better count directly
@@ -342,6 +411,13 @@ class TetracoinLevelGenerator:
                 
         return levels
 
+    @staticmethod
+    def _solution_space(config: TetracoinGenerationConfig) -> Optional[SolutionSpace]:
+        # Only BFS sees whole layers; other engines keep the path-based estimate
+        if config.measure_solution_space and config.solver_engine == "bfs":
+            return SolutionSpace()
+        return None
+
     @staticmethod
     def _generate_worker(task: Dict[str, Any]) -> Any:
         # Re-hydrate generator
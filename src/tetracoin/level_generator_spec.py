@@ -48,7 +48,15 @@ class TetracoinGenerationConfig:
     
     # Solver / Validation
     solver_timeout: float = 2.0
-    require_optimal_solution: bool = False
+    require_optimal_solution: bool = False # Re-solve the final level exactly when the engine is approximate
+    solver_engine: str = "bfs" # "bfs", "astar", "idastar", "beam" (fast, possibly non-optimal)
+    solver_beam_width: int = 64 # States kept per depth by the "beam" engine
+    solver_macro_moves: bool = False # Search over multi-cell slides; hints are still primitive moves
+    solver_visited_store: str = "exact" # "exact", "bloom" (fast, probably-unsolvable rejection), "disk"
+    solver_memory_mb: Optional[float] = None # Visited store budget (bfs engine only)
+    collect_solver_stats: bool = True # Attach SolverStats.to_dict() to LevelMetadata
+    measure_solution_space: bool = False # bfs engine: count optimal solutions, branching, dead ends for the difficulty score (finishes the solution's BFS layer)
+    solve_cache_path: Optional[str] = None # sqlite file for solve results shared across runs/workers (None: memory only)
     
     # Auto Adjustment
     max_adjustment_iterations: int = 20
@@ -78,6 +86,7 @@ class GenerationStats:
     total_attempts: int = 0
     successful_generations: int = 0
     unsolvable_attempts: int = 0
+    unknown_attempts: int = 0 # Solver gave up (timeout / node limit)
     validation_failures: int = 0
     exception_count: int = 0
     total_generation_time: float = 0.0
@@ -100,6 +109,9 @@ class GenerationStats:
     def increment_unsolvable_attempts(self):
         self.unsolvable_attempts += 1
         
+    def increment_unknown_attempts(self):
+        self.unknown_attempts += 1
+        
     def increment_validation_failures(self):
         self.validation_failures += 1
         
@@ -123,6 +135,9 @@ class LevelMetadata:
     grid_dimensions: Tuple[int, int]
     seed_used: Optional[int]
     timestamp: datetime.datetime = field(default_factory=datetime.datetime.now)
+    solver_stats: Optional[Dict[str, Any]] = None # SolverStats.to_dict() of the final solve
+    solution_proven_optimal: bool = True # False when solution_length is only an upper bound
+    solution_space: Optional[Dict[str, Any]] = None # SolutionSpace.to_dict() when measured
 
 # --- Results ---
 
@@ -0,0 +1,99 @@
+"""
+Tetracoin Parallel Solver.
+Layer-synchronous BFS whose frontier layers are expanded by a process pool.
+
+Workers each compile the level once (pool initializer) and expand chunks of
+packed states (with the move that produced them), returning
+(move_code, child, hash) triples. The parent process hands them, in
+frontier order, to the search loop the serial TetracoinSolver.solve_bfs
+uses (solver._BreadthFirstSearch), so the solution, node counts, status and
+solution space are exactly those of the serial search; only wall time
+changes.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+
+from src.tetracoin.spec import GridState
+from src.tetracoin.solver_state import PackedLevel, PackedState
+from src.tetracoin.solver_stats import SolutionSpace, SolverStats
+
+# Layers smaller than this are expanded in the parent: not worth the IPC
+MIN_PARALLEL_LAYER = 64
+# Chunks per worker and layer, to balance uneven expansion costs
+CHUNKS_PER_WORKER = 4
+
+_worker_level: Optional[PackedLevel] = None
+
+
+def _init_worker(grid: GridState, timed: bool, macro_moves: bool):
+    global _worker_level
+    _worker_level = PackedLevel(grid, SolverStats() if timed else None, macro_moves)
+
+
+def _expand(level: PackedLevel, frontier: List[Tuple[PackedState, int, int]]):
+    """Per-parent (children, pruned, skipped, repeated) for (state, hash, last move) entries."""
+    expanded = []
+    for state, state_hash, last_move in frontier:
+        pruned, skipped, repeated = level.pruned, level.skipped, level.repeated
+        children = level.successors(state, state_hash, last_move)
+        expanded.append((children, level.pruned - pruned, level.skipped - skipped, level.repeated - repeated))
+    return expanded
+
+
+def _expand_chunk(chunk: List[Tuple[PackedState, int, int]]):
+    """Worker side of _expand; also returns the worker's timings."""
+    level = _worker_level
+    if level.stats is not None:
+        level.stats = SolverStats()
+    return _expand(level, chunk), level.stats
+
+
+def _expand_layer(search, pool: ProcessPoolExecutor, workers: int, nodes: List[int]):
+    """Children of each of `nodes`, in order. Small layers stay in this process."""
+    if len(nodes) < MIN_PARALLEL_LAYER:
+        return search.expand(nodes)
+
+    tree = search.tree
+    frontier = [(tree.states[n], tree.hashes[n], tree.move[n]) for n in nodes]
+    size = -(-len(frontier) // (workers * CHUNKS_PER_WORKER))
+    chunks = [frontier[i:i + size] for i in range(0, len(frontier), size)]
+    expanded = []
+    for part, worker_stats in pool.map(_expand_chunk, chunks):
+        expanded.extend(part)
+        if search.stats is not None:
+            search.stats.add_worker_timings(worker_stats)
+    return _credit(search.level, expanded)
+
+
+def _credit(level: PackedLevel, expanded):
+    """Hand over each parent's children, counting its dropped moves as it is merged."""
+    for children, pruned, skipped, repeated in expanded:
+        level.pruned += pruned
+        level.skipped += skipped
+        level.repeated += repeated
+        yield children
+
+
+def solve_bfs_parallel(initial_grid: GridState, max_depth: int = 20, max_nodes: int = 10000,
+                       timeout: Optional[float] = None, stats: Optional[SolverStats] = None,
+                       workers: int = 2, macro_moves: bool = False,
+                       visited_store: str = "exact", memory_mb: Optional[float] = None,
+                       solution_space: Optional[SolutionSpace] = None):
+    """
+    Parallel BFS. Same contract and results as TetracoinSolver.solve_bfs.
+    The deadline is also checked between layers, but a layer already
+    handed to the workers is expanded to completion.
+    Returns: SolveResult, unpacking as (found, steps, moves)
+    """
+    # Imported here: solver.py dispatches to this module
+    from src.tetracoin.solver import _BreadthFirstSearch
+
+    search = _BreadthFirstSearch(initial_grid, max_depth, max_nodes, timeout, stats, macro_moves,
+                                 visited_store, memory_mb, solution_space)
+    # Workers fork lazily: the first layers are usually expanded in-process
+    pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                               initargs=(initial_grid, stats is not None, macro_moves))
+    try:
+        return search.run(lambda nodes: _expand_layer(search, pool, workers, nodes))
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,216 @@
+"""
+Tetracoin Solve Cache.
+Content-addressed cache of solver results, shared by the level generator,
+the auto-adjuster and the tools, which otherwise solve the same grid
+several times per level.
+
+Grids are addressed by grid_fingerprint: a digest of what the solver
+actually sees once the level is compiled (static layout, entity ids and
+color classes, piggybank cells, settled initial state), independent of
+entity order and of coins that have not finished falling. Results are
+keyed by fingerprint plus the parameters that change the answer (engine,
+macro-moves, visited store, beam width). Search budgets are not part of
+the key: a SOLVED entry answers any query whose max_depth admits its
+solution, an UNSOLVABLE entry any query it already proves. UNKNOWN results
+depend on the clock and are never cached.
+
+SolveCache keeps an in-process LRU tier and, given a path, an sqlite tier
+that survives across runs and is shared by worker processes (each process
+opens its own connection).
+"""
+from collections import OrderedDict
+from dataclasses import asdict
+import hashlib
+import json
+import os
+import sqlite3
+from typing import Any, Dict, Optional
+
+from src.tetracoin.spec import GridState
+from src.tetracoin.solver import TetracoinSolver, SolveResult, SolveStatus, Move, DEFAULT_BEAM_WIDTH
+from src.tetracoin.solver_state import PackedLevel
+from src.tetracoin.solver_stats import SolutionSpace, SolverStats
+
+# Bump when the packed representation or the solvers change their answers
+FINGERPRINT_VERSION = 2
+DEFAULT_CACHE_ENTRIES = 4096
+
+
+def grid_fingerprint(grid: GridState) -> str:
+    """Hex digest identifying the puzzle `grid` poses to the solver."""
+    ordered = GridState(rows=grid.rows, cols=grid.cols, entities=sorted(grid.entities, key=lambda e: e.id))
+    level = PackedLevel(ordered)
+    movables = {e.id: (e.type.value, getattr(e, 'direction', None), getattr(e, 'subtype', None))
+                for e in ordered.entities if e.id in set(level.movable_ids)}
+    colors: Dict[Any, int] = {}
+    content = (
+        FINGERPRINT_VERSION, level.rows, level.cols, bytes(level._static),
+        # Colors only matter up to renaming: number them by first appearance
+        tuple((e.id, colors.setdefault(e.color, len(colors))) for e in ordered.entities),
+        # Which piggybank (by id, hence color) sits in each piggybank cell
+        tuple(zip(level.piggy_ids, level.piggy_cells)),
+        tuple(level.piggy_capacity),
+        tuple(movables[i] for i in level.movable_ids),
+        level.typecode, level.settled(level.initial),
+    )
+    return hashlib.sha256(repr(content).encode()).hexdigest()
+
+
+class SolveCache:
+    """
+    Two-tier cache of TetracoinSolver.solve results.
+    Use cache.solve(grid, ...) (or TetracoinSolver.solve(..., cache=cache))
+    in place of TetracoinSolver.solve. Hits come back with
+    SolveResult.cached set, the original nodes_explored / elapsed and, when
+    `stats` or `solution_space` was requested, the values recorded by the
+    original solve (entries without them are solved again).
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_CACHE_ENTRIES, path: Optional[str] = None):
+        self.max_entries = max_entries
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._memory: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._db = None
+        self._db_pid = None
+
+    def __len__(self) -> int:
+        return len(self._memory)
+
+    def __getstate__(self):
+        # Connections do not cross processes; the child reopens the file
+        state = self.__dict__.copy()
+        state['_db'] = None
+        state['_db_pid'] = None
+        return state
+
+    @staticmethod
+    def key(fingerprint: str, engine: str = "bfs", macro_moves: bool = False, visited_store: str = "exact",
+            memory_mb: Optional[float] = None, beam_width: int = DEFAULT_BEAM_WIDTH) -> str:
+        params = {"engine": engine, "macro_moves": macro_moves}
+        if visited_store == "bloom":
+            # Exact and disk stores agree; a Bloom filter's size changes its answers
+            params["bloom_mb"] = memory_mb
+        if engine == "beam":
+            params["beam_width"] = beam_width
+        return f"{fingerprint}:{json.dumps(params, sort_keys=True)}"
+
+    def solve(self, initial_grid: GridState, engine: str = "bfs", max_depth: int = 20, max_nodes: int = 10000,
+              timeout: Optional[float] = None, stats: Optional[SolverStats] = None, workers: int = 1,
+              macro_moves: bool = False, visited_store: str = "exact", memory_mb: Optional[float] = None,
+              beam_width: int = DEFAULT_BEAM_WIDTH, solution_space: Optional[SolutionSpace] = None) -> SolveResult:
+        """TetracoinSolver.solve, answered from the cache when possible."""
+        key = self.key(grid_fingerprint(initial_grid), engine, macro_moves, visited_store, memory_mb, beam_width)
+        entry = self._lookup(key)
+        if (entry is not None and self._answers(entry, max_depth)
+                and (stats is None or entry["stats"] is not None)
+                and (solution_space is None or entry.get("solution_space") is not None)):
+            self.hits += 1
+            return self._result(entry, stats, solution_space)
+
+        self.misses += 1
+        result = TetracoinSolver.solve(initial_grid, engine=engine, max_depth=max_depth, max_nodes=max_nodes,
+                                       timeout=timeout, stats=stats, workers=workers, macro_moves=macro_moves,
+                                       visited_store=visited_store, memory_mb=memory_mb, beam_width=beam_width,
+                                       solution_space=solution_space)
+        if result.status != SolveStatus.UNKNOWN:
+            self.put(key, result)
+        return result
+
+    @staticmethod
+    def _answers(entry: Dict[str, Any], max_depth: int) -> bool:
+        if entry["status"] == SolveStatus.SOLVED.value:
+            return len(entry["moves"]) <= max_depth
+        return entry["depth_proven"] >= max_depth
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Raw entry for `key`, or None."""
+        return self._lookup(key)
+
+    def put(self, key: str, result: SolveResult) -> None:
+        entry = {
+            "status": result.status.value,
+            "moves": [[m.entity_id, m.direction] for m in result.moves],
+            "nodes_explored": result.nodes_explored,
+            "depth_proven": result.depth_proven,
+            "elapsed": result.elapsed,
+            "pruned": result.pruned,
+            "approximate": result.approximate,
+            "proven_optimal": result.proven_optimal,
+            "stats": asdict(result.stats) if result.stats is not None else None,
+            "solution_space": asdict(result.solution_space) if result.solution_space is not None else None,
+        }
+        self._remember(key, entry)
+        db = self._connection()
+        if db is not None:
+            db.execute("INSERT OR REPLACE INTO solves VALUES (?, ?)", (key, json.dumps(entry)))
+
+    def clear(self) -> None:
+        """Empty both tiers."""
+        self._memory.clear()
+        db = self._connection()
+        if db is not None:
+            db.execute("DELETE FROM solves")
+
+    def close(self) -> None:
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def _lookup(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._memory.get(key)
+        if entry is not None:
+            self._memory.move_to_end(key)
+            return entry
+        db = self._connection()
+        if db is None:
+            return None
+        row = db.execute("SELECT entry FROM solves WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        entry = json.loads(row[0])
+        self._remember(key, entry)
+        return entry
+
+    def _remember(self, key: str, entry: Dict[str, Any]) -> None:
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _connection(self) -> Optional[sqlite3.Connection]:
+        if self.path is None:
+            return None
+        if self._db is None or self._db_pid != os.getpid():
+            # Autocommit, and wait for other processes instead of failing
+            self._db = sqlite3.connect(self.path, timeout=30.0, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("CREATE TABLE IF NOT EXISTS solves (key TEXT PRIMARY KEY, entry TEXT)")
+            self._db_pid = os.getpid()
+        return self._db
+
+    @staticmethod
+    def _result(entry: Dict[str, Any], stats: Optional[SolverStats],
+                solution_space: Optional[SolutionSpace] = None) -> SolveResult:
+        if stats is not None:
+            recorded = entry["stats"]
+            for name, value in recorded.items():
+                setattr(stats, name, value)
+            stats.frontier_by_depth = {int(d): n for d, n in recorded["frontier_by_depth"].items()}
+        if solution_space is not None and entry.get("solution_space") is not None:
+            for name, value in entry["solution_space"].items():
+                setattr(solution_space, name, value)
+        return SolveResult(
+            status=SolveStatus(entry["status"]),
+            moves=[Move(entity_id, direction) for entity_id, direction in entry["moves"]],
+            nodes_explored=entry["nodes_explored"],
+            depth_proven=entry["depth_proven"],
+            elapsed=entry["elapsed"],
+            stats=stats,
+            pruned=entry["pruned"],
+            approximate=entry["approximate"],
+            proven_optimal=entry["proven_optimal"],
+            cached=True,
+            solution_space=solution_space,
+        )
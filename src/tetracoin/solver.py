@@ -1,19 +1,28 @@
 """
 Tetracoin Solver Module.
-Implements a BFS solver for the physics-based Tetracoin puzzle.
+Implements BFS, A*, IDA* and beam-search solvers for the physics-based Tetracoin puzzle.
 """
 from dataclasses import dataclass, field, replace
-from typing import Tuple, List, FrozenSet, Dict, Optional, Set
-from collections import deque
+from enum import Enum
+from typing import Callable, Iterable, Iterator, Tuple, List, FrozenSet, Dict, Optional, Set
 import copy
+import heapq
+import itertools
+import sys
+import time
 
 from src.tetracoin.spec import (
     GridState, EntityType, ColorType, PhysicsEngine, Entity, 
     Coin, PiggyBank, Obstacle, FixedBlock, Support, Deflector, Gateway, Trap
 )
+from src.tetracoin.solver_state import PackedLevel, PackedState, SearchTree
+from src.tetracoin.solver_stats import BatchSolveStats, SolutionSpace, SolverStats
+from src.tetracoin.visited_stores import make_visited_store
 
 MoveDirection = str # "UP", "DOWN", "LEFT", "RIGHT"
 
+DEFAULT_BEAM_WIDTH = 64  # States kept per depth by solve_beam
+
 @dataclass(frozen=True)
 class Move:
     entity_id: str
@@ -124,6 +133,7 @@ class GameState:
         # 2. Apply Player Move
         # Find entity
         entity = next((e for e in new_grid_state.entities if e.id == move.entity_id), None)
+        dirty_cols = set()
         if entity:
             dr, dc = 0, 0
             if move.direction == "UP": dr = -1
@@ -133,73 +143,684 @@ class GameState:
             
             # Move blindly (validation was in get_valid_moves, but check again?)
             # Logic: Teleport to new pos
+            # The wrapped grid is at rest: only the columns the entity left
+            # and entered can start moving
+            dirty_cols.add(entity.col)
             entity.row += dr
             entity.col += dc
+            dirty_cols.add(entity.col)
             
         # 3. Process Physics (Gravity/Simulation)
-        # Run until settled or max ticks
-        max_ticks = 100
-        stable = False
-        
-        for _ in range(max_ticks):
-            prev_snapshot = str([(e.id, e.row, e.col, e.is_collected) for e in new_grid_state.entities])
-            new_grid_state, events = PhysicsEngine.update(new_grid_state)
-            curr_snapshot = str([(e.id, e.row, e.col, e.is_collected) for e in new_grid_state.entities])
-            
-            if prev_snapshot == curr_snapshot:
-                stable = True
-                break
+        # Settle only the disturbed columns; the end state is all we need
+        PhysicsEngine.drop(new_grid_state, dirty_cols)
                 
         # 4. Return new state
         new_moves = self.moves + (move,)
         return GameState(new_grid_state, new_moves)
 
+class SolveStatus(str, Enum):
+    """Outcome of a solver run."""
+    SOLVED = "SOLVED"
+    UNSOLVABLE = "UNSOLVABLE"  # Search space exhausted within max_depth
+    UNKNOWN = "UNKNOWN"        # Gave up: time budget, max_nodes or memory budget reached
+
+@dataclass
+class SolveResult:
+    """
+    Solver outcome plus the partial information gathered on the way.
+    Unpacks as the legacy (found, steps, moves) tuple.
+    """
+    status: SolveStatus
+    moves: List[Move] = field(default_factory=list)
+    nodes_explored: int = 0
+    depth_proven: int = 0  # No solution with this many moves or fewer (when not SOLVED)
+    elapsed: float = 0.0
+    stats: Optional[SolverStats] = None  # Only when requested
+    pruned: int = 0  # Dead states dropped before being queued
+    approximate: bool = False  # Lossy visited store: UNSOLVABLE / depth_proven are only probable
+    proven_optimal: bool = False  # SOLVED and no shorter solution exists (in single steps)
+    cached: bool = False  # Answered by a SolveCache (see solve_cache)
+    solution_space: Optional[SolutionSpace] = None  # Only when requested (solve_bfs)
+
+    @property
+    def found(self) -> bool:
+        return self.status == SolveStatus.SOLVED
+
+    @property
+    def steps(self) -> int:
+        return len(self.moves)
+
+    def __iter__(self):
+        return iter((self.found, self.steps, self.moves))
+
+@dataclass
+class VerifyResult:
+    """Outcome of replaying a stored solution with TetracoinSolver.verify."""
+    valid: bool  # Every move is legal and the final state wins
+    failed_at: Optional[int] = None  # Index of the first illegal move (len(moves) if the end does not win)
+    optimal: Optional[bool] = None  # No shorter solution exists; None when not (fully) checked
+    depth_checked: int = 0  # Shorter solutions searched up to this many moves
+    elapsed: float = 0.0
+
+    def __bool__(self) -> bool:
+        return self.valid
+
+class _Deadline:
+    """Wall-clock budget, polled once every CHECK_INTERVAL expansions."""
+    CHECK_INTERVAL = 64
+
+    def __init__(self, timeout: Optional[float], level: PackedLevel):
+        self.started = time.monotonic()
+        self.at = None if timeout is None else self.started + timeout
+        self.level = level
+        self.stats = level.stats
+        self.approximate = False  # Set when a lossy visited store is in use
+        self.solution_space: Optional[SolutionSpace] = None
+
+    def expired(self, nodes: int) -> bool:
+        return (self.at is not None and nodes % self.CHECK_INTERVAL == 0
+                and time.monotonic() >= self.at)
+
+    def passed(self) -> bool:
+        """Unthrottled check, for coarse-grained loops."""
+        return self.at is not None and time.monotonic() >= self.at
+
+    def result(self, status: SolveStatus, nodes: int, depth_proven: int = 0, moves: Optional[List[Move]] = None,
+               optimal: bool = True) -> SolveResult:
+        """`optimal`: the engine guarantees a shortest solution (not beam search)."""
+        elapsed = time.monotonic() - self.started
+        pruned = self.level.pruned
+        if self.stats is not None:
+            self.stats.wall_time = elapsed
+            self.stats.dead_states_pruned = pruned
+            self.stats.independent_moves_skipped = self.level.skipped
+        # Lossy stores may hide a shorter path; macro searches minimise macro-moves
+        proven_optimal = status == SolveStatus.SOLVED and (
+            not moves or (optimal and not self.approximate and not self.level.macro_moves))
+        return SolveResult(status, moves or [], nodes, depth_proven, elapsed, self.stats, pruned,
+                           self.approximate and status != SolveStatus.SOLVED, proven_optimal,
+                           solution_space=self.solution_space)
+
+class _BreadthFirstSearch:
+    """
+    Layer-by-layer BFS shared by TetracoinSolver.solve_bfs and
+    parallel_solver.solve_bfs_parallel. run() owns the visited store, the
+    search tree, budgets, stats and solution-space bookkeeping; the caller
+    only supplies the function that expands a layer, so the serial and the
+    parallel search differ in nothing but where successors are computed.
+    """
+
+    def __init__(self, initial_grid: GridState, max_depth: int, max_nodes: int, timeout: Optional[float],
+                 stats: Optional[SolverStats], macro_moves: bool, visited_store: str,
+                 memory_mb: Optional[float], solution_space: Optional[SolutionSpace]):
+        if stats is not None:
+            stats.engine = "bfs"
+        self.level = PackedLevel(initial_grid, stats, macro_moves)
+        self.deadline = _Deadline(timeout, self.level)
+        self.deadline.solution_space = solution_space
+        self.stats = stats
+        self.space = solution_space
+        self.max_depth = max_depth
+        self.max_nodes = max_nodes
+        self.visited_store = visited_store
+        self.memory_mb = memory_mb
+        self.tree: Optional[SearchTree] = None
+        self.nodes_explored = 0
+        self.solution = None  # (node, move) of the first win, while its layer is finished
+        # Solution space only
+        self.paths = [1]  # Shortest paths from the start to each tree node
+        # Legal moves at each expanded tree node; BFS expands nodes in index order
+        self.branching: List[int] = []
+        self.next_layer_map = None  # Nodes of the next layer: rediscoveries add paths
+        self.generated = 0
+        self.wins = 0
+
+    def expand(self, nodes: List[int]) -> Iterator[List[Tuple[int, PackedState, int]]]:
+        """Serial layer expansion: successors of each node, computed on demand."""
+        level, tree = self.level, self.tree
+        for node in nodes:
+            yield level.successors(tree.states[node], tree.hashes[node], tree.move[node])
+
+    def run(self, expand_layer: Callable[[List[int]], Iterable[List[Tuple[int, PackedState, int]]]]) -> SolveResult:
+        """
+        Search with `expand_layer(nodes)`, which returns the children of
+        each of `nodes` (a prefix of a layer), in order. It may expand them
+        lazily, but a parent's pruned / skipped / repeated counts must be on
+        the level by the time its children are handed over.
+        """
+        level, deadline = self.level, self.deadline
+        max_depth, max_nodes = self.max_depth, self.max_nodes
+
+        # 0. Settle initial grid (simulate gravity/interactions without player input)
+        start = level.settled(level.initial)
+
+        if level.is_winning(start):
+            return deadline.result(SolveStatus.SOLVED, 0)
+        if level.is_dead(start):
+            # No sequence of moves can ever collect every coin
+            return deadline.result(SolveStatus.UNSOLVABLE, 0, max_depth)
+
+        # Layers hold node indices into the search tree (state, parent, move)
+        start_hash = level.zobrist(start)
+        self.tree = tree = SearchTree(start, start_hash)
+        self.entry_bytes = sys.getsizeof(start) + 2 * sys.getsizeof(start_hash) + 18  # visited + tree entry
+        self.visited = visited = make_visited_store(level, self.visited_store, self.memory_mb, self.entry_bytes)
+        deadline.approximate = visited.lossy
+        max_entries = visited.max_entries
+
+        try:
+            visited.add(start_hash, start)
+            layer = [0]
+            while layer:
+                # Every state with fewer moves has been expanded and none wins
+                depth = tree.depth[layer[0]]
+                if deadline.passed():
+                    return deadline.result(SolveStatus.UNKNOWN, self.nodes_explored, depth)
+
+                # Only the parents that max_nodes lets the search reach
+                if depth < max_depth:
+                    expanded = iter(expand_layer(layer[:max_nodes - self.nodes_explored + 1]))
+                    if self.space is not None:
+                        self.next_layer_map = level.state_map()
+                self.next_layer = []
+                for node in layer:
+                    if (self.nodes_explored > max_nodes or deadline.expired(self.nodes_explored)
+                            or (max_entries is not None and len(visited) > max_entries)):
+                        if self.solution is not None:
+                            return self._solved(complete=False)
+                        return deadline.result(SolveStatus.UNKNOWN, self.nodes_explored, depth)
+                    self.nodes_explored += 1
+                    if depth >= max_depth:
+                        continue
+                    if self.space is not None:
+                        # Moves the expansion dropped (dead, commuting, repeated) are legal too
+                        dropped = level.pruned + level.skipped + level.repeated
+                        children = next(expanded)
+                        self.branching.append(len(children) + level.pruned + level.skipped + level.repeated - dropped)
+                    else:
+                        children = next(expanded)
+                    result = self._merge(node, depth, children)
+                    if result is not None:
+                        return result
+
+                if self.solution is not None:
+                    return self._solved(complete=True)
+                layer = self.next_layer
+
+            if self.space is not None:
+                self._dead_end_ratio()
+                self.space.complete = True
+            return deadline.result(SolveStatus.UNSOLVABLE, self.nodes_explored, max_depth)
+        finally:
+            visited.close()
+
+    def _merge(self, node: int, depth: int, children: List[Tuple[int, PackedState, int]]) -> Optional[SolveResult]:
+        """Add the new children of `node` to the next layer; returns the result on a win."""
+        level, tree, visited, stats, space = self.level, self.tree, self.visited, self.stats, self.space
+        if stats is not None:
+            stats.record_expansion(len(children))
+        if space is not None:
+            layer_map, paths = self.next_layer_map, self.paths
+            self.generated += len(children)
+            wins_before = self.wins
+        for move_code, next_state, next_hash in children:
+            if visited.add(next_hash, next_state):
+                if level.is_winning(next_state):
+                    if space is None:
+                        moves = TetracoinSolver._decode_path(level, tree.path(node) + (move_code,))
+                        return self.deadline.result(SolveStatus.SOLVED, self.nodes_explored, moves=moves)
+                    if self.solution is None:
+                        self.solution = (node, move_code)
+                    self.wins += paths[node]
+                elif self.solution is None:
+                    child = tree.add(next_state, next_hash, node, move_code)
+                    self.next_layer.append(child)
+                    if space is not None:
+                        paths.append(paths[node])
+                        layer_map.put(next_hash, next_state, child)
+                    if stats is not None:
+                        stats.record_frontier(depth + 1)
+                        stats.record_visited(visited, self.entry_bytes)
+                continue
+            if stats is not None:
+                stats.duplicate_hits += 1
+            if space is not None:
+                # Another shortest route to a node of the next layer, or to a win
+                known = layer_map.get(next_hash, next_state)
+                if known is not None:
+                    paths[known] += paths[node]
+                elif self.solution is not None and level.is_winning(next_state):
+                    self.wins += paths[node]
+        if space is not None and self.wins > wins_before:
+            space.near_win_states += 1
+        return None
+
+    def _dead_end_ratio(self):
+        pruned = self.level.pruned
+        self.space.dead_end_ratio = pruned / (pruned + self.generated) if pruned else 0.0
+
+    def _solved(self, complete: bool) -> SolveResult:
+        """
+        Result for the first solution found while measuring the solution
+        space; `complete`: its whole layer was expanded.
+        """
+        level, tree, space = self.level, self.tree, self.space
+        node, move_code = self.solution
+        self._dead_end_ratio()
+        space.optimal_solutions = self.wins
+        space.complete = complete
+        path = tree.path(node) + (move_code,)
+        # Recorded when the path's states were expanded
+        on_path = []
+        while node >= 0:
+            on_path.append(self.branching[node])
+            node = tree.parent[node]
+        space.path_branching = on_path[::-1]
+        moves = TetracoinSolver._decode_path(level, path)
+        return self.deadline.result(SolveStatus.SOLVED, self.nodes_explored, moves=moves)
+
+
 class TetracoinSolver:
     @staticmethod
-    def solve_bfs(initial_grid: GridState, max_depth: int = 20, max_nodes: int = 10000) -> Tuple[bool, int, List[Move]]:
+    def solve_bfs(initial_grid: GridState, max_depth: int = 20, max_nodes: int = 10000,
+                  timeout: Optional[float] = None, stats: Optional[SolverStats] = None,
+                  workers: int = 1, macro_moves: bool = False,
+                  visited_store: str = "exact", memory_mb: Optional[float] = None,
+                  solution_space: Optional[SolutionSpace] = None) -> SolveResult:
         """
         BFS Solver.
-        Returns: (found, steps, moves)
+        Searches over packed states (see solver_state.PackedLevel); the input
+        grid is never mutated. Stops with UNKNOWN after `timeout` seconds.
+        Fills `stats` (SolverStats) in place when given. With workers > 1,
+        frontier layers are expanded by a process pool (see parallel_solver);
+        results are identical to the serial search.
+        `visited_store` ("exact", "bloom" or "disk", see visited_stores) and
+        `memory_mb` choose how visited states are kept. The exact store
+        gives up with UNKNOWN when it outgrows the budget. With the lossy
+        Bloom store, UNSOLVABLE only means probably unsolvable
+        (SolveResult.approximate).
+        With `solution_space` (SolutionSpace, filled in place), the search
+        counts shortest paths and records branching as it goes and, after
+        the first solution, finishes expanding its layer to find every
+        optimal solution. That last step is not free: it can expand about
+        as many nodes again as the search did up to the solution. The
+        returned solution is the same as without it.
+        Returns: SolveResult, unpacking as (found, steps, moves)
         """
-        # 0. Settle initial grid (simulate gravity/interactions without player input)
-        # We need a copy because we don't want to mutate the input grid passed by caller
-        settled_grid = copy.deepcopy(initial_grid)
-        max_ticks = 1000
-        for _ in range(max_ticks):
-            prev_snapshot = str([(e.id, e.row, e.col, e.is_collected) for e in settled_grid.entities])
-            settled_grid, _ = PhysicsEngine.update(settled_grid)
-            curr_snapshot = str([(e.id, e.row, e.col, e.is_collected) for e in settled_grid.entities])
-            if prev_snapshot == curr_snapshot:
-                break
-                
-        initial_state = GameState(settled_grid)
-        
-        if initial_state.is_winning():
-            return True, 0, []
-            
-        queue = deque([initial_state])
-        visited: Set[GameStateData] = {initial_state.data}
+        if workers > 1:
+            from src.tetracoin.parallel_solver import solve_bfs_parallel
+            return solve_bfs_parallel(initial_grid, max_depth=max_depth, max_nodes=max_nodes,
+                                      timeout=timeout, stats=stats, workers=workers, macro_moves=macro_moves,
+                                      visited_store=visited_store, memory_mb=memory_mb,
+                                      solution_space=solution_space)
+
+        search = _BreadthFirstSearch(initial_grid, max_depth, max_nodes, timeout, stats, macro_moves,
+                                     visited_store, memory_mb, solution_space)
+        return search.run(search.expand)
+
+    @staticmethod
+    def solve_astar(initial_grid: GridState, max_depth: int = 20, max_nodes: int = 10000,
+                    timeout: Optional[float] = None, stats: Optional[SolverStats] = None,
+                    macro_moves: bool = False) -> SolveResult:
+        """
+        A* Solver guided by PackedLevel.lower_bound.
+        The bound is admissible and consistent, so the first solution found
+        is optimal, like solve_bfs, while expanding far fewer nodes.
+        Returns: SolveResult, unpacking as (found, steps, moves)
+        """
+        if stats is not None:
+            stats.engine = "astar"
+        level = PackedLevel(initial_grid, stats, macro_moves)
+        deadline = _Deadline(timeout, level)
+        start = level.settled(level.initial)
+
+        if level.is_winning(start):
+            return deadline.result(SolveStatus.SOLVED, 0)
+        if level.is_dead(start):
+            # No sequence of moves can ever collect every coin
+            return deadline.result(SolveStatus.UNSOLVABLE, 0, max_depth)
+
+        # Heap items: (f, -g, tie, node); deeper nodes first on equal f
+        # Open/closed map: state -> node index in the search tree (g = depth)
+        tie = itertools.count()
+        start_hash = level.zobrist(start)
+        tree = SearchTree(start, start_hash)
+        heap = [(level.lower_bound(start), 0, next(tie), 0)]
+        best = level.state_map()
+        best.put(start_hash, start, 0)
         nodes_explored = 0
-        
-        while queue:
-            if nodes_explored > max_nodes:
-                # print(f"Solver Limit Reached ({max_nodes} nodes)")
-                return False, 0, []
-                
-            state = queue.popleft()
+        entry_bytes = sys.getsizeof(start) + 2 * sys.getsizeof(start_hash) + 74  # map entry + tree entry
+
+        while heap:
+            # Consistent bound: no solution cheaper than the smallest open f
+            depth_proven = heap[0][0] - 1
+
+            if nodes_explored > max_nodes or deadline.expired(nodes_explored):
+                return deadline.result(SolveStatus.UNKNOWN, nodes_explored, depth_proven)
+
+            _, neg_g, _, node = heapq.heappop(heap)
+            g = -neg_g
+            if tree.depth[node] < g:
+                continue  # Stale heap entry
             nodes_explored += 1
-            
-            if len(state.moves) >= max_depth:
+
+            if g >= max_depth:
                 continue
-                
-            for move in state.get_valid_moves():
-                next_state = state.apply_move(move)
-                
-                if next_state.data not in visited:
-                    if next_state.is_winning():
-                        return True, len(next_state.moves), list(next_state.moves)
-                        
-                    visited.add(next_state.data)
-                    queue.append(next_state)
-                    
-        return False, 0, []
+
+            children = level.successors(tree.states[node], tree.hashes[node])
+            if stats is not None:
+                stats.record_expansion(len(children))
+                stats.record_visited(best, entry_bytes)
+            for move_code, next_state, next_hash in children:
+                known = best.get(next_hash, next_state)
+                if known is not None and tree.depth[known] <= g + 1:
+                    if stats is not None:
+                        stats.duplicate_hits += 1
+                    continue
+
+                if level.is_winning(next_state):
+                    moves = TetracoinSolver._decode_path(level, tree.path(node) + (move_code,))
+                    return deadline.result(SolveStatus.SOLVED, nodes_explored, moves=moves)
+
+                f = g + 1 + level.lower_bound(next_state)
+                if f > max_depth:
+                    continue
+                if known is None:
+                    child = tree.add(next_state, next_hash, node, move_code)
+                    best.put(next_hash, next_state, child)
+                else:
+                    child = known
+                    tree.reparent(child, node, move_code, next_state)
+                heapq.heappush(heap, (f, -(g + 1), next(tie), child))
+                if stats is not None:
+                    stats.record_frontier(g + 1)
+
+        return deadline.result(SolveStatus.UNSOLVABLE, nodes_explored, max_depth)
+
+    @staticmethod
+    def solve_idastar(initial_grid: GridState, max_depth: int = 20, max_nodes: int = 10000,
+                      timeout: Optional[float] = None, stats: Optional[SolverStats] = None,
+                      macro_moves: bool = False) -> SolveResult:
+        """
+        IDA* Solver: depth-first iterative deepening on f = g + lower_bound.
+        Memory is limited to the current path, at the cost of re-expanding
+        nodes on every iteration. Returns optimal solutions.
+        Returns: SolveResult, unpacking as (found, steps, moves)
+        """
+        if stats is not None:
+            stats.engine = "idastar"
+        level = PackedLevel(initial_grid, stats, macro_moves)
+        deadline = _Deadline(timeout, level)
+        start = level.settled(level.initial)
+
+        if level.is_winning(start):
+            return deadline.result(SolveStatus.SOLVED, 0)
+        if level.is_dead(start):
+            # No sequence of moves can ever collect every coin
+            return deadline.result(SolveStatus.UNSOLVABLE, 0, max_depth)
+
+        start_hash = level.zobrist(start)
+        path_states = [(start, start_hash)]
+        on_path = level.state_set()
+        on_path.add(start_hash, start)
+        path_moves: List[int] = []
+        nodes_explored = 0
+        gave_up = False
+        entry_bytes = sys.getsizeof(start) + sys.getsizeof(start_hash)
+
+        def search(g: int, bound: int) -> Tuple[bool, int]:
+            """Returns (found, smallest f that exceeded the bound)."""
+            nonlocal nodes_explored, gave_up
+            state, state_hash = path_states[-1]
+            f = g + level.lower_bound(state)
+            if f > bound:
+                return False, f
+            if level.is_winning(state):
+                return True, f
+            if nodes_explored > max_nodes or deadline.expired(nodes_explored):
+                gave_up = True
+                return False, max_depth + 1
+            nodes_explored += 1
+
+            next_bound = max_depth + 1
+            children = level.successors(state, state_hash, path_moves[-1] if path_moves else -1)
+            if stats is not None:
+                stats.record_expansion(len(children))
+            for move_code, next_state, next_hash in children:
+                if not on_path.add(next_hash, next_state):
+                    if stats is not None:
+                        stats.duplicate_hits += 1
+                    continue
+                path_states.append((next_state, next_hash))
+                path_moves.append(move_code)
+                if stats is not None:
+                    stats.record_frontier(g + 1)
+                    stats.record_visited(on_path, entry_bytes)
+                found, t = search(g + 1, bound)
+                if found:
+                    return True, t
+                on_path.discard(next_hash, next_state)
+                path_moves.pop()
+                path_states.pop()
+                if gave_up:
+                    break
+                next_bound = min(next_bound, t)
+            return False, next_bound
+
+        bound = level.lower_bound(start)
+        while bound <= max_depth:
+            found, next_bound = search(0, bound)
+            if found:
+                moves = TetracoinSolver._decode_path(level, tuple(path_moves))
+                return deadline.result(SolveStatus.SOLVED, nodes_explored, moves=moves)
+            if gave_up:
+                # The interrupted iteration only proves the previous bound
+                return deadline.result(SolveStatus.UNKNOWN, nodes_explored, bound - 1)
+            bound = next_bound
+
+        return deadline.result(SolveStatus.UNSOLVABLE, nodes_explored, max_depth)
+
+    @staticmethod
+    def solve_beam(initial_grid: GridState, width: int = DEFAULT_BEAM_WIDTH,
+                   heuristic: Optional[Callable[[PackedLevel, PackedState], float]] = None,
+                   max_depth: int = 20, max_nodes: int = 10000, timeout: Optional[float] = None,
+                   stats: Optional[SolverStats] = None, macro_moves: bool = False) -> SolveResult:
+        """
+        Beam-search Solver: BFS that keeps only the `width` most promising
+        new states of each depth, ranked by `heuristic(level, state)` (lower
+        is better; defaults to PackedLevel.lower_bound, the A* estimate).
+        Cost grows linearly with depth instead of with the state space, so
+        it answers quickly on boards too large for the exact engines, but it
+        is incomplete: once a layer has been cut, a solution may be longer
+        than necessary (SolveResult.proven_optimal is False) and running out
+        of states gives UNKNOWN rather than UNSOLVABLE.
+        Returns: SolveResult, unpacking as (found, steps, moves)
+        """
+        if stats is not None:
+            stats.engine = "beam"
+        level = PackedLevel(initial_grid, stats, macro_moves)
+        deadline = _Deadline(timeout, level)
+        start = level.settled(level.initial)
+
+        if level.is_winning(start):
+            return deadline.result(SolveStatus.SOLVED, 0)
+        if level.is_dead(start):
+            # No sequence of moves can ever collect every coin
+            return deadline.result(SolveStatus.UNSOLVABLE, 0, max_depth)
+
+        if heuristic is None:
+            score = level.lower_bound
+        else:
+            score = lambda state: heuristic(level, state)
+
+        start_hash = level.zobrist(start)
+        tree = SearchTree(start, start_hash)
+        visited = level.state_set()
+        visited.add(start_hash, start)
+        entry_bytes = sys.getsizeof(start) + 2 * sys.getsizeof(start_hash) + 18  # Same estimate as solve_bfs
+        beam = [0]
+        depth = 0
+        depth_proven = 0
+        truncated = False
+        nodes_explored = 0
+
+        while beam and depth < max_depth:
+            # Candidates: (parent, move, state, hash), in generation order
+            candidates = []
+            for node in beam:
+                if nodes_explored > max_nodes or deadline.expired(nodes_explored):
+                    return deadline.result(SolveStatus.UNKNOWN, nodes_explored, depth_proven)
+                nodes_explored += 1
+
+                children = level.successors(tree.states[node], tree.hashes[node], tree.move[node])
+                if stats is not None:
+                    stats.record_expansion(len(children))
+                for move_code, next_state, next_hash in children:
+                    if not visited.add(next_hash, next_state):
+                        if stats is not None:
+                            stats.duplicate_hits += 1
+                        continue
+                    if level.is_winning(next_state):
+                        moves = TetracoinSolver._decode_path(level, tree.path(node) + (move_code,))
+                        return deadline.result(SolveStatus.SOLVED, nodes_explored, moves=moves,
+                                               optimal=not truncated)
+                    candidates.append((node, move_code, next_state, next_hash))
+
+            depth += 1
+            if not truncated:
+                # Every child of this depth was generated and none wins
+                depth_proven = depth
+            if len(candidates) > width:
+                truncated = True
+                # nsmallest is stable: ties keep generation order
+                candidates = heapq.nsmallest(width, candidates, key=lambda c: score(c[2]))
+
+            beam = []
+            for node, move_code, next_state, next_hash in candidates:
+                beam.append(tree.add(next_state, next_hash, node, move_code))
+                if stats is not None:
+                    stats.record_frontier(depth)
+            if stats is not None:
+                stats.record_visited(visited, entry_bytes)
+
+        if truncated:
+            return deadline.result(SolveStatus.UNKNOWN, nodes_explored, depth_proven)
+        return deadline.result(SolveStatus.UNSOLVABLE, nodes_explored, max_depth)
+
+    @staticmethod
+    def solve(initial_grid: GridState, engine: str = "bfs", max_depth: int = 20, max_nodes: int = 10000,
+              timeout: Optional[float] = None, stats: Optional[SolverStats] = None,
+              workers: int = 1, macro_moves: bool = False,
+              visited_store: str = "exact", memory_mb: Optional[float] = None,
+              beam_width: int = DEFAULT_BEAM_WIDTH, cache=None,
+              solution_space: Optional[SolutionSpace] = None) -> SolveResult:
+        """
+        Dispatch to a search engine by name ("bfs", "astar", "idastar" or
+        "beam"). Only "beam" may return non-optimal solutions, with
+        `beam_width` states kept per depth (see solve_beam).
+        `workers` > 1 (parallel BFS), `visited_store`, `memory_mb` and
+        `solution_space` are bfs-only options (see solve_bfs).
+        `macro_moves` makes every engine search over macro-moves, where one
+        move slides an entity across any number of empty cells (see
+        solver_state). Solutions are then shortest in macro-moves rather
+        than in single steps, and depths count macro-moves; the returned
+        moves are still the primitive steps, so they replay unchanged.
+        Macro-moves pay off when solutions need long slides through narrow
+        regions; with many free movables the branching factor grows with
+        their regions and single-step search is faster.
+        With a `cache` (solve_cache.SolveCache), results already known for
+        the same puzzle and parameters are returned without searching.
+        Returns: SolveResult, unpacking as (found, steps, moves)
+        """
+        if cache is not None:
+            return cache.solve(initial_grid, engine=engine, max_depth=max_depth, max_nodes=max_nodes,
+                               timeout=timeout, stats=stats, workers=workers, macro_moves=macro_moves,
+                               visited_store=visited_store, memory_mb=memory_mb, beam_width=beam_width,
+                               solution_space=solution_space)
+        if workers > 1 or visited_store != "exact" or memory_mb is not None or solution_space is not None:
+            if engine != "bfs":
+                raise ValueError(f"Parallel search, visited stores and solution-space metrics are only available "
+                                 f"for the 'bfs' engine, not '{engine}'")
+            return TetracoinSolver.solve_bfs(initial_grid, max_depth=max_depth, max_nodes=max_nodes,
+                                             timeout=timeout, stats=stats, workers=workers, macro_moves=macro_moves,
+                                             visited_store=visited_store, memory_mb=memory_mb,
+                                             solution_space=solution_space)
+        engines = {
+            "bfs": TetracoinSolver.solve_bfs,
+            "astar": TetracoinSolver.solve_astar,
+            "idastar": TetracoinSolver.solve_idastar,
+            "beam": TetracoinSolver.solve_beam,
+        }
+        if engine not in engines:
+            raise ValueError(f"Unknown solver engine '{engine}', expected one of {sorted(engines)}")
+        options = {"width": beam_width} if engine == "beam" else {}
+        return engines[engine](initial_grid, max_depth=max_depth, max_nodes=max_nodes, timeout=timeout, stats=stats,
+                               macro_moves=macro_moves, **options)
+
+    @staticmethod
+    def solve_many(grids: Iterable[GridState], engine: str = "bfs", max_depth: int = 20, max_nodes: int = 10000,
+                   timeout: Optional[float] = None, workers: int = 1, ordered: bool = True,
+                   batch_stats: Optional[BatchSolveStats] = None, collect_stats: bool = False,
+                   macro_moves: bool = False, visited_store: str = "exact", memory_mb: Optional[float] = None,
+                   beam_width: int = DEFAULT_BEAM_WIDTH) -> Iterator[Tuple[int, SolveResult]]:
+        """
+        Solve a batch of grids, sharing setup across them (see batch_solver).
+        Yields (index, SolveResult) pairs in input order or, with
+        ordered=False, as each grid finishes. With workers > 1 the grids are
+        spread over a process pool started once for the whole batch (each
+        grid is still solved serially). `batch_stats` collects aggregate
+        throughput and `collect_stats` gives every result its own
+        SolverStats; the other options are those of solve.
+        """
+        from src.tetracoin.batch_solver import solve_many
+        options = dict(engine=engine, max_depth=max_depth, max_nodes=max_nodes, timeout=timeout,
+                       macro_moves=macro_moves, visited_store=visited_store, memory_mb=memory_mb,
+                       beam_width=beam_width)
+        return solve_many(grids, options, workers=workers, ordered=ordered, batch_stats=batch_stats,
+                          collect_stats=collect_stats)
+
+    @staticmethod
+    def verify(initial_grid: GridState, moves: List[Move], max_depth: Optional[int] = None,
+               engine: str = "astar", max_nodes: int = 10000, timeout: Optional[float] = None) -> VerifyResult:
+        """
+        Check a stored solution by replaying it through the packed physics:
+        O(len(moves)), no search. With `max_depth`, also search (with
+        `engine`, within max_nodes / timeout) for a solution shorter than
+        `moves` of at most `max_depth` moves; `optimal` is then True only if
+        every shorter length was ruled out.
+        Returns: VerifyResult, truthy when the solution is valid
+        """
+        started = time.monotonic()
+        level = PackedLevel(initial_grid)
+        state = level.settled(level.initial)
+        for i, move in enumerate(moves):
+            code = level.encode_move(move.entity_id, move.direction)
+            state = level.apply(state, code) if code >= 0 else None
+            if state is None:
+                return VerifyResult(False, failed_at=i, elapsed=time.monotonic() - started)
+        if not level.is_winning(state):
+            return VerifyResult(False, failed_at=len(moves), elapsed=time.monotonic() - started)
+        if max_depth is None:
+            return VerifyResult(True, elapsed=time.monotonic() - started)
+
+        bound = min(max_depth, len(moves) - 1)
+        if bound < 0:
+            # Already won without moving
+            return VerifyResult(True, optimal=True, elapsed=time.monotonic() - started)
+        shorter = TetracoinSolver.solve(initial_grid, engine=engine, max_depth=bound, max_nodes=max_nodes,
+                                        timeout=timeout)
+        if shorter.status == SolveStatus.SOLVED:
+            optimal, depth_checked = False, bound
+        elif shorter.status == SolveStatus.UNSOLVABLE:
+            optimal, depth_checked = (True if bound == len(moves) - 1 else None), bound
+        else:
+            optimal, depth_checked = None, shorter.depth_proven
+        return VerifyResult(True, optimal=optimal, depth_checked=depth_checked,
+                            elapsed=time.monotonic() - started)
+
+    @staticmethod
+    def _decode_path(level: PackedLevel, path: Tuple[int, ...]) -> List[Move]:
+        """Convert packed move codes (macro-moves included) back to Move objects."""
+        if level.macro_moves:
+            path = level.primitive_path(level.settled(level.initial), path)
+        return [Move(*level.decode_move(code)) for code in path]
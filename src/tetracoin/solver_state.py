@@ -0,0 +1,927 @@
+"""
+Tetracoin Packed Search State.
+Compact, solver-internal representation of a level used while searching.
+
+A level is compiled once per search into a PackedLevel, which keeps every
+static entity (fixed blocks, piggybank cells, gateways, traps) in a single
+occupancy template. Each search node is then a small ``bytes`` object with a
+fixed slot layout:
+
+    [coin cells ...][movable cells ...][piggybank counts ...]
+
+Cells are row-major indices (row * cols + col); collected coins hold the
+COLLECTED sentinel. Expanding a node never touches dataclasses or deepcopy:
+the GridState is rebuilt only for the final solution.
+
+Every state also carries a 64-bit Zobrist hash (one random key per
+slot x cell and per piggybank x count). Moves and physics ticks update it
+with XOR, and StateSet / StateMap use it as the dictionary key so a
+visited lookup only compares packed states when the hashes match.
+
+Interchangeable movables (same type, color and direction/subtype) share
+their Zobrist keys, so states that only differ by swapping them hash the
+same and compare equal through PackedLevel.canonical. Search nodes keep
+their concrete slot layout, so solutions still name real entity ids.
+
+Moves that touch disjoint parts of the board commute: playing them in
+either order reaches the same state. successors() takes the move that
+produced the expanded state and skips every independent move that sorts
+before it (moves are ordered by source cell, then direction), so only one
+order of each commuting pair is generated. Every state keeps a shortest
+route in which no adjacent pair is out of order, so BFS and IDA* still
+find optimal solutions.
+
+In macro-move mode (PackedLevel(..., macro_moves=True)) one move slides a
+movable along any path of empty cells. Only leaving a cell right under a
+coin sets anything in motion, so such a movable is limited to one step;
+any other movable can end up anywhere in its empty-cell region without
+physics running at all. Macro codes are
+(movable_index * num_cells + destination) * 2 + quiet and are expanded
+back to primitive moves by primitive_path.
+"""
+from array import array
+import copy
+import random
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+
+from src.tetracoin.spec import GridState, EntityType, PiggyBank
+from src.tetracoin.solver_stats import SolverStats
+
+PackedState = bytes
+
+# Occupancy codes of the scratch buffer built for each expanded node
+EMPTY = 0
+SOLID = 1
+PIGGY = 2
+COIN = 3
+MOVABLE = 4
+
+# Entities the player can slide (mirrors GameState.get_valid_moves)
+MOVABLE_TYPES = (EntityType.OBSTACLE, EntityType.DEFLECTOR, EntityType.SUPPORT)
+
+# (name, d_row, d_col) in the same order as GameState.get_valid_moves
+DIRECTIONS = (("UP", -1, 0), ("DOWN", 1, 0), ("LEFT", 0, -1), ("RIGHT", 0, 1))
+
+# Fixed seed: hashes are reproducible across runs and processes
+ZOBRIST_SEED = 0x7E7AC014
+
+
+# Zobrist key rows by row length, grown on demand (see zobrist_rows)
+_ZOBRIST_ROWS: Dict[int, List[List[int]]] = {}
+
+
+def zobrist_rows(length: int, count: int) -> List[List[int]]:
+    """
+    The first `count` rows of `length` random 64-bit keys. Rows are built
+    once per process and reused by every level with the same row length,
+    and row i is the same in every process. Callers must not modify them.
+    """
+    rows = _ZOBRIST_ROWS.setdefault(length, [])
+    while len(rows) < count:
+        rng = random.Random(ZOBRIST_SEED * 1_000_003 + length * 7919 + len(rows))
+        rows.append([rng.getrandbits(64) for _ in range(length)])
+    return rows[:count]
+
+
+class PackedLevel:
+    """
+    Static, per-search view of a level.
+    Maps entity ids to small slot indices and owns the physics/move rules
+    working directly on packed states.
+    When `stats` is given, successors() records physics ticks and the time
+    split between move generation and physics; its StateSet / StateMap
+    charge their probes to hashing time. With `macro_moves`, successors()
+    generates macro-moves instead of single steps (see module docstring).
+    """
+
+    def __init__(self, grid: GridState, stats: Optional[SolverStats] = None, macro_moves: bool = False):
+        self.grid = grid
+        self.stats = stats
+        self.macro_moves = macro_moves
+        self.rows = grid.rows
+        self.cols = grid.cols
+        self.num_cells = grid.rows * grid.cols
+
+        self.coin_ids: List[str] = []
+        self.coin_colors: List[int] = []
+        self.movable_ids: List[str] = []
+        self.piggy_ids: List[str] = []
+        self.piggy_cells: List[int] = []
+        self.piggy_colors: List[int] = []
+        self.piggy_capacity: List[int] = []
+
+        colors: Dict[str, int] = {}
+        coin_cells: List[int] = []
+        movable_cells: List[int] = []
+        movable_groups: Dict[tuple, List[int]] = {}
+        piggy_counts: List[int] = []
+
+        self._static = bytearray(self.num_cells)
+        self._piggy_at = [-1] * self.num_cells
+
+        for e in grid.entities:
+            color = colors.setdefault(e.color, len(colors))
+            if e.type == EntityType.COIN:
+                self.coin_ids.append(e.id)
+                self.coin_colors.append(color)
+                coin_cells.append(-1 if e.is_collected else self._cell(e.row, e.col))
+                continue
+            if e.is_collected:
+                continue
+            cell = self._cell(e.row, e.col)
+            if e.type in MOVABLE_TYPES:
+                group = (e.type, e.color, getattr(e, 'direction', None), getattr(e, 'subtype', None))
+                movable_groups.setdefault(group, []).append(len(self.movable_ids))
+                self.movable_ids.append(e.id)
+                movable_cells.append(cell)
+            elif e.type == EntityType.PIGGYBANK:
+                pb: PiggyBank = e
+                self._piggy_at[cell] = len(self.piggy_ids)
+                self.piggy_ids.append(pb.id)
+                self.piggy_cells.append(cell)
+                self.piggy_colors.append(color)
+                self.piggy_capacity.append(pb.capacity)
+                piggy_counts.append(pb.current_count)
+                self._static[cell] = PIGGY
+            else:
+                self._static[cell] = SOLID
+
+        # Coins only fall straight down, so each coin's column is fixed
+        self._column_coins: List[List[int]] = [[] for _ in range(self.cols)]
+        for i, cell in enumerate(coin_cells):
+            if cell >= 0:
+                self._column_coins[cell % self.cols].append(i)
+
+        # Static reachability: the first static cell below a coin decides its
+        # fate. Only a piggybank there can ever collect it (index, or -1).
+        # A coin's drop is "sealed" when no cell between it and that piggybank
+        # opens sideways: a movable in there can never leave the column.
+        self._reach = [-1] * self.num_cells
+        self._sealed = bytearray(self.num_cells)
+        for col in range(self.cols):
+            target = -1
+            sealed = False
+            for row in range(self.rows - 1, -1, -1):
+                cell = row * self.cols + col
+                self._reach[cell] = target
+                if self._static[cell] == PIGGY:
+                    target = self._piggy_at[cell]
+                    sealed = True
+                elif self._static[cell] == SOLID:
+                    target = -1
+                    sealed = False
+                else:
+                    self._sealed[cell] = sealed
+                    sealed = sealed and not self._opens_sideways(row, col)
+        self._column_sealed = [any(self._sealed[r * self.cols + c] for r in range(self.rows)) for c in range(self.cols)]
+        self.pruned = 0  # Dead children dropped by successors()
+        self.skipped = 0  # Commuting moves skipped by successors()
+        self.repeated = 0  # Repeated quiet slides skipped by successors() in macro-move mode
+
+        self.num_coins = len(self.coin_ids)
+        self.num_movables = len(self.movable_ids)
+        self.num_piggies = len(self.piggy_ids)
+        self.movable_offset = self.num_coins
+        self.piggy_offset = self.num_coins + self.num_movables
+
+        # Slot lists of interchangeable movables (groups of two or more)
+        self._symmetric_groups: List[List[int]] = [
+            [self.movable_offset + j for j in slots] for slots in movable_groups.values() if len(slots) > 1
+        ]
+
+        # One byte per slot unless cell indices or counts do not fit
+        widest = max([self.num_cells] + self.piggy_capacity + piggy_counts)
+        self.typecode = 'B' if widest < 0xFF else 'H'
+        self.COLLECTED = 0xFF if self.typecode == 'B' else 0xFFFF
+
+        coin_cells = [self.COLLECTED if c < 0 else c for c in coin_cells]
+        self.initial: PackedState = self.pack(array(self.typecode, coin_cells + movable_cells + piggy_counts))
+
+        # Zobrist keys. Coins get an extra key (index num_cells) for "collected";
+        # counts only grow while below capacity, so capacity bounds the table.
+        # Rows come from a table shared by every level of the same size.
+        rows = zobrist_rows(widest + 1, self.num_coins + len(movable_groups) + self.num_piggies)
+        self._z_coin = rows[:self.num_coins]
+        self._z_movable: List[List[int]] = [None] * self.num_movables
+        for g, slots in enumerate(movable_groups.values()):
+            for j in slots:
+                self._z_movable[j] = rows[self.num_coins + g]  # Shared: hash is invariant under swaps
+        self._z_piggy = rows[self.num_coins + len(movable_groups):]
+
+    def _cell(self, row: int, col: int) -> int:
+        return row * self.cols + col
+
+    def _opens_sideways(self, row: int, col: int) -> bool:
+        """True if a neighbour to the left or right is not static."""
+        return ((col > 0 and self._static[row * self.cols + col - 1] == EMPTY) or
+                (col < self.cols - 1 and self._static[row * self.cols + col + 1] == EMPTY))
+
+    # --- Encoding ----------------------------------------------------------
+
+    def unpack(self, state: PackedState) -> array:
+        buf = array(self.typecode)
+        buf.frombytes(state)
+        return buf
+
+    @staticmethod
+    def pack(buf: array) -> PackedState:
+        return buf.tobytes()
+
+    def canonical(self, state: PackedState) -> PackedState:
+        """Representative of a state up to swaps of interchangeable movables."""
+        if not self._symmetric_groups:
+            return state
+        buf = self.unpack(state)
+        for slots in self._symmetric_groups:
+            for slot, cell in zip(slots, sorted(buf[slot] for slot in slots)):
+                buf[slot] = cell
+        return buf.tobytes()
+
+    def occupancy(self, buf: array) -> bytearray:
+        """Build the per-cell occupancy buffer for an unpacked state."""
+        occ = bytearray(self._static)
+        collected = self.COLLECTED
+        for i in range(self.num_coins):
+            if buf[i] != collected:
+                occ[buf[i]] = COIN
+        for j in range(self.movable_offset, self.piggy_offset):
+            occ[buf[j]] = MOVABLE
+        return occ
+
+    # --- Rules -------------------------------------------------------------
+
+    def is_winning(self, state: PackedState) -> bool:
+        """All coins collected."""
+        buf = self.unpack(state)
+        collected = self.COLLECTED
+        return all(buf[i] == collected for i in range(self.num_coins))
+
+    def zobrist(self, state: PackedState) -> int:
+        """Full Zobrist hash of a state; searches then update it incrementally."""
+        buf = self.unpack(state)
+        collected = self.COLLECTED
+        h = 0
+        for i in range(self.num_coins):
+            h ^= self._z_coin[i][self.num_cells if buf[i] == collected else buf[i]]
+        for j in range(self.num_movables):
+            h ^= self._z_movable[j][buf[self.movable_offset + j]]
+        for k in range(self.num_piggies):
+            h ^= self._z_piggy[k][buf[self.piggy_offset + k]]
+        return h
+
+    def settled(self, state: PackedState) -> PackedState:
+        """Run physics on a state until it comes to rest."""
+        buf = self.unpack(state)
+        self.settle(buf, self.occupancy(buf))
+        return self.pack(buf)
+
+    def settle(self, buf: array, occ: bytearray, columns=None) -> Tuple[int, int]:
+        """
+        Bring the dirty columns (default: all) to rest in place, one pass per
+        column (see _drop_column). Ends in the same state as settle_ticked.
+        Returns (ticks settle_ticked would simulate, XOR delta to apply to
+        the Zobrist hash).
+        """
+        ticks = 0
+        delta = 0
+        for col in (range(self.cols) if columns is None else columns):
+            steps, d = self._drop_column(buf, occ, col)
+            delta ^= d
+            # One tick per row fallen or coin collected, plus the quiet tick
+            ticks = max(ticks, steps + 1)
+        return ticks, delta
+
+    def _drop_column(self, buf: array, occ: bytearray, col: int) -> Tuple[int, int]:
+        """
+        Settle one column in closed form: each live coin, lowest first, scans
+        down to the first occupied cell and lands on it, or is collected by a
+        matching, non-full piggybank there. Lower coins move first within a
+        tick, so no coin ever waits for the one below and arrivals happen in
+        the same order as with ticks.
+        Returns (longest run of moving ticks, Zobrist delta).
+        """
+        cols = self.cols
+        num_cells = self.num_cells
+        collected = self.COLLECTED
+        piggy_offset = self.piggy_offset
+        live = [i for i in self._column_coins[col] if buf[i] != collected]
+        live.sort(key=lambda i: -buf[i])
+        steps = 0
+        delta = 0
+
+        for i in live:
+            cell = buf[i]
+            rest = cell
+            below = cell + cols
+            while below < num_cells and occ[below] == EMPTY:
+                rest = below
+                below += cols
+            fallen = (rest - cell) // cols
+            keys = self._z_coin[i]
+            if below < num_cells and occ[below] == PIGGY:
+                k = self._piggy_at[below]
+                count = buf[piggy_offset + k]
+                if self.piggy_colors[k] == self.coin_colors[i] and count < self.piggy_capacity[k]:
+                    buf[piggy_offset + k] = count + 1
+                    buf[i] = collected
+                    occ[cell] = EMPTY
+                    delta ^= keys[cell] ^ keys[num_cells] ^ self._z_piggy[k][count] ^ self._z_piggy[k][count + 1]
+                    steps = max(steps, fallen + 1)
+                    continue
+            if fallen:
+                occ[cell] = EMPTY
+                occ[rest] = COIN
+                buf[i] = rest
+                delta ^= keys[cell] ^ keys[rest]
+                steps = max(steps, fallen)
+        return steps, delta
+
+    def settle_ticked(self, buf: array, occ: bytearray, columns=None, max_ticks: int = 100) -> Tuple[int, int]:
+        """
+        Reference for settle: tick gravity in place until the dirty columns
+        (default: all) are at rest. Same rules and processing order as
+        PhysicsEngine.update: coins fall one row per tick, bottom-up, and are
+        collected by a matching, non-full piggybank directly below. Coins
+        never leave their column, so a column where nothing moved during a
+        tick is clean.
+        Returns (ticks simulated, XOR delta to apply to the Zobrist hash).
+        """
+        dirty = list(range(self.cols)) if columns is None else list(columns)
+        delta = 0
+        for tick in range(max_ticks):
+            if not dirty:
+                return tick, delta
+            still_moving = []
+            for col in dirty:
+                d = self._tick_column(buf, occ, col)
+                if d is not None:
+                    delta ^= d
+                    still_moving.append(col)
+            dirty = still_moving
+        return max_ticks, delta
+
+    def _tick_column(self, buf: array, occ: bytearray, col: int) -> Optional[int]:
+        """
+        Advance one column by a single tick.
+        Returns the Zobrist delta of the tick, or None if nothing moved.
+        """
+        cols = self.cols
+        num_cells = self.num_cells
+        collected = self.COLLECTED
+        piggy_offset = self.piggy_offset
+        live = [i for i in self._column_coins[col] if buf[i] != collected]
+        live.sort(key=lambda i: -buf[i])
+        moved = False
+        delta = 0
+
+        for i in live:
+            cell = buf[i]
+            below = cell + cols
+            if below >= num_cells:
+                continue
+            hit = occ[below]
+            if hit == EMPTY:
+                occ[cell] = EMPTY
+                occ[below] = COIN
+                buf[i] = below
+                keys = self._z_coin[i]
+                delta ^= keys[cell] ^ keys[below]
+                moved = True
+            elif hit == PIGGY:
+                k = self._piggy_at[below]
+                count = buf[piggy_offset + k]
+                if self.piggy_colors[k] == self.coin_colors[i] and count < self.piggy_capacity[k]:
+                    buf[piggy_offset + k] = count + 1
+                    buf[i] = collected
+                    occ[cell] = EMPTY
+                    keys = self._z_coin[i]
+                    delta ^= keys[cell] ^ keys[num_cells] ^ self._z_piggy[k][count] ^ self._z_piggy[k][count + 1]
+                    moved = True
+        return delta if moved else None
+
+    def is_dead(self, state: PackedState) -> bool:
+        """
+        True if some coin can provably never be collected. A live coin is lost if:
+        - the first static cell below it is not a piggybank of its color;
+        - more live coins depend on that piggybank than it has room left;
+        - its drop is sealed and holds a movable (see _trapped).
+        Coins never pass a static cell, and a collected coin frees the room it
+        needed, so the first two conditions hold for every state reachable
+        from a dead one and never appear later: checking them on the start
+        state is enough. Only the third can appear during the search.
+        """
+        buf = self.unpack(state)
+        occ = self.occupancy(buf)
+        collected = self.COLLECTED
+        need: Dict[int, int] = {}
+        for i in range(self.num_coins):
+            cell = buf[i]
+            if cell == collected:
+                continue
+            k = self._reach[cell]
+            if k < 0 or self.piggy_colors[k] != self.coin_colors[i]:
+                return True
+            need[k] = need.get(k, 0) + 1
+        if any(n > self.piggy_capacity[k] - buf[self.piggy_offset + k] for k, n in need.items()):
+            return True
+        return any(self._trapped(buf, occ, col) for col in range(self.cols) if self._column_sealed[col])
+
+    def _trapped(self, buf: array, occ: bytearray, col: int) -> bool:
+        """
+        True if a live coin in `col` sits above a movable inside a sealed drop.
+        The movable can then only shuffle up and down between the coin and
+        the piggybank, so the coin is never collected.
+        """
+        collected = self.COLLECTED
+        cols = self.cols
+        for i in self._column_coins[col]:
+            cell = buf[i]
+            if cell == collected or not self._sealed[cell]:
+                continue
+            below = cell + cols
+            while occ[below] != PIGGY:
+                if occ[below] == MOVABLE:
+                    return True
+                below += cols
+        return False
+
+    def lower_bound(self, state: PackedState) -> int:
+        """
+        Admissible estimate of the moves still needed to win.
+        Coins never change column, so every column holding live coins needs
+        each non-coin blocker between its lowest coin and the piggybank below
+        to be slid out of the column (at least one move in any case). A move
+        displaces a single entity, so the per-column counts add up.
+        """
+        buf = self.unpack(state)
+        occ = self.occupancy(buf)
+        cols = self.cols
+        num_cells = self.num_cells
+        collected = self.COLLECTED
+        estimate = 0
+
+        for coins in self._column_coins:
+            lowest = -1
+            for i in coins:
+                if buf[i] != collected and buf[i] > lowest:
+                    lowest = buf[i]
+            if lowest < 0:
+                continue
+            blockers = 0
+            cell = lowest + cols
+            while cell < num_cells and occ[cell] != PIGGY:
+                if occ[cell] != EMPTY:
+                    blockers += 1
+                cell += cols
+            estimate += blockers or 1
+        return estimate
+
+    def successors(self, state: PackedState, state_hash: Optional[int] = None,
+                   last_move: int = -1) -> List[Tuple[int, PackedState, int]]:
+        """
+        Expand a state.
+        Returns (move_code, settled child, child Zobrist hash) triples in
+        GameState.get_valid_moves order; move_code is
+        movable_index * 4 + direction_index.
+        Children that are provably dead (see is_dead) are dropped and counted
+        in `pruned`. The parent is assumed live, so only the column the move
+        vacated, where coins may have fallen, can hold a newly trapped coin.
+        `last_move` is the move that produced `state` (-1 for the root);
+        moves independent of it that sort before it are skipped and counted
+        in `skipped` (single-step mode only). A move reads and writes its source and target cells,
+        the cell above the source and, when a coin rests there, the whole
+        source column (the coins fall). The previous move is charged its
+        whole source column plus its target, since the state no longer
+        shows whether a coin fell behind it. Moves whose footprints are
+        disjoint commute and neither enables nor disables the other.
+        """
+        if state_hash is None:
+            state_hash = self.zobrist(state)
+        if self.macro_moves:
+            return self._macro_successors(state, state_hash, last_move)
+        stats = self.stats
+        if stats is not None:
+            started = time.perf_counter()
+            physics = 0.0
+
+        buf = self.unpack(state)
+        occ = self.occupancy(buf)
+        rows, cols = self.rows, self.cols
+        children = []
+
+        if last_move >= 0:
+            last_j, last_d = divmod(last_move, 4)
+            _, last_dr, last_dc = DIRECTIONS[last_d]
+            last_target = buf[self.movable_offset + last_j]
+            last_source = last_target - last_dr * cols - last_dc
+            last_key = last_source * 4 + last_d
+            last_col = last_source % cols
+            last_target_col = last_target % cols
+        else:
+            last_key = -1
+
+        for j in range(self.num_movables):
+            slot = self.movable_offset + j
+            cell = buf[slot]
+            r, c = divmod(cell, cols)
+            for d, (_, dr, dc) in enumerate(DIRECTIONS):
+                nr, nc = r + dr, c + dc
+                if not (0 <= nr < rows and 0 <= nc < cols):
+                    continue
+                target = nr * cols + nc
+                if occ[target] != EMPTY:
+                    continue
+                # Independent of the previous move and sorting before it:
+                # the other order reaches the same child at the same depth
+                if (cell * 4 + d < last_key and c != last_col and nc != last_col
+                        and cell != last_target and cell - cols != last_target
+                        and (c != last_target_col or cell < cols or occ[cell - cols] != COIN)):
+                    self.skipped += 1
+                    continue
+                child = array(self.typecode, buf)
+                child_occ = bytearray(occ)
+                child[slot] = target
+                child_occ[cell] = EMPTY
+                child_occ[target] = MOVABLE
+                child_hash = state_hash ^ self._z_movable[j][cell] ^ self._z_movable[j][target]
+                # Settled parent: only the vacated column can start falling
+                if stats is None:
+                    _, delta = self.settle(child, child_occ, (c,))
+                else:
+                    t0 = time.perf_counter()
+                    ticks, delta = self.settle(child, child_occ, (c,))
+                    physics += time.perf_counter() - t0
+                    stats.physics_ticks += ticks
+                if self._column_sealed[c] and self._trapped(child, child_occ, c):
+                    self.pruned += 1
+                    continue
+                children.append((j * 4 + d, child.tobytes(), child_hash ^ delta))
+
+        if stats is not None:
+            stats.time_physics += physics
+            stats.time_move_generation += time.perf_counter() - started - physics
+        return children
+
+    def apply(self, state: PackedState, move_code: int) -> Optional[PackedState]:
+        """
+        Play a single primitive move on a settled state and settle it.
+        Returns None if the move is illegal (off the board or into an
+        occupied cell). Unlike successors(), dead results are returned too.
+        """
+        j, d = divmod(move_code, 4)
+        if not 0 <= j < self.num_movables:
+            return None
+        buf = self.unpack(state)
+        occ = self.occupancy(buf)
+        slot = self.movable_offset + j
+        cell = buf[slot]
+        r, c = divmod(cell, self.cols)
+        _, dr, dc = DIRECTIONS[d]
+        nr, nc = r + dr, c + dc
+        if not (0 <= nr < self.rows and 0 <= nc < self.cols) or occ[nr * self.cols + nc] != EMPTY:
+            return None
+        target = nr * self.cols + nc
+        buf[slot] = target
+        occ[cell] = EMPTY
+        occ[target] = MOVABLE
+        self.settle(buf, occ, (c,))
+        return self.pack(buf)
+
+    def encode_move(self, entity_id: str, direction: str) -> int:
+        """Inverse of decode_move; -1 if the entity is not a movable."""
+        if entity_id not in self.movable_ids:
+            return -1
+        names = [name for name, _, _ in DIRECTIONS]
+        return self.movable_ids.index(entity_id) * 4 + names.index(direction)
+
+    # --- Macro-moves -------------------------------------------------------
+
+    def _slide(self, occ: bytearray, start: int, max_steps: Optional[int] = None) -> Dict[int, Tuple[int, int]]:
+        """
+        Cells a movable at `start` reaches through empty cells, in BFS order
+        (nearest first, then DIRECTIONS order). Maps each reached cell to
+        (previous cell, direction index) along a shortest path.
+        """
+        rows, cols = self.rows, self.cols
+        came_from = {start: (-1, -1)}
+        layer = [start]
+        steps = 0
+        while layer and (max_steps is None or steps < max_steps):
+            steps += 1
+            next_layer = []
+            for cell in layer:
+                r, c = divmod(cell, cols)
+                for d, (_, dr, dc) in enumerate(DIRECTIONS):
+                    nr, nc = r + dr, c + dc
+                    if not (0 <= nr < rows and 0 <= nc < cols):
+                        continue
+                    target = nr * cols + nc
+                    if occ[target] != EMPTY or target in came_from:
+                        continue
+                    came_from[target] = (cell, d)
+                    next_layer.append(target)
+            layer = next_layer
+        del came_from[start]
+        return came_from
+
+    def _under_coin(self, occ: bytearray, cell: int) -> bool:
+        """True if leaving `cell` lets a coin fall."""
+        return cell >= self.cols and occ[cell - self.cols] == COIN
+
+    def _macro_successors(self, state: PackedState, state_hash: int, last_move: int) -> List[Tuple[int, PackedState, int]]:
+        """
+        successors() in macro-move mode: (macro_code, settled child, child hash) triples.
+        A movable that just made a quiet slide is not moved again: it can
+        only slide quietly within the same region, which the previous
+        slide could have reached directly.
+        """
+        stats = self.stats
+        if stats is not None:
+            started = time.perf_counter()
+            physics = 0.0
+
+        buf = self.unpack(state)
+        occ = self.occupancy(buf)
+        cols = self.cols
+        num_cells = self.num_cells
+        children = []
+
+        slid = last_move >> 1 if last_move >= 0 and last_move & 1 else -1
+        for j in range(self.num_movables):
+            slot = self.movable_offset + j
+            cell = buf[slot]
+            c = cell % cols
+            keys = self._z_movable[j]
+            if not self._under_coin(occ, cell):
+                if slid // num_cells == j:
+                    self.repeated += len(self._slide(occ, cell))
+                    continue
+                # Nothing falls anywhere along the way: no physics to run
+                for target in self._slide(occ, cell):
+                    child = array(self.typecode, buf)
+                    child[slot] = target
+                    children.append(((j * num_cells + target) * 2 + 1, child.tobytes(),
+                                     state_hash ^ keys[cell] ^ keys[target]))
+                continue
+
+            for target in self._slide(occ, cell, max_steps=1):
+                child = array(self.typecode, buf)
+                child_occ = bytearray(occ)
+                child[slot] = target
+                child_occ[cell] = EMPTY
+                child_occ[target] = MOVABLE
+                if stats is None:
+                    _, delta = self.settle(child, child_occ, (c,))
+                else:
+                    t0 = time.perf_counter()
+                    ticks, delta = self.settle(child, child_occ, (c,))
+                    physics += time.perf_counter() - t0
+                    stats.physics_ticks += ticks
+                if self._column_sealed[c] and self._trapped(child, child_occ, c):
+                    self.pruned += 1
+                    continue
+                children.append(((j * num_cells + target) * 2, child.tobytes(),
+                                 state_hash ^ keys[cell] ^ keys[target] ^ delta))
+
+        if stats is not None:
+            stats.time_physics += physics
+            stats.time_move_generation += time.perf_counter() - started - physics
+        return children
+
+    def primitive_path(self, start: PackedState, codes) -> List[int]:
+        """
+        Expand the move codes of a path from `start` into primitive move
+        codes (movable_index * 4 + direction_index). Macro-moves become
+        the shortest slide to their destination; single steps are
+        returned unchanged.
+        """
+        if not self.macro_moves:
+            return list(codes)
+        moves: List[int] = []
+        buf = self.unpack(start)
+        for code in codes:
+            j, target = divmod(code >> 1, self.num_cells)
+            slot = self.movable_offset + j
+            occ = self.occupancy(buf)
+            cell = buf[slot]
+            came_from = self._slide(occ, cell)
+            steps = []
+            at = target
+            while at != cell:
+                at, d = came_from[at]
+                steps.append(j * 4 + d)
+            moves.extend(reversed(steps))
+            buf[slot] = target
+            occ[cell] = EMPTY
+            occ[target] = MOVABLE
+            self.settle(buf, occ, (cell % self.cols,))
+        return moves
+
+    # --- Visited tables ----------------------------------------------------
+
+    @property
+    def symmetric(self) -> bool:
+        """True if some movables are interchangeable (states compare through canonical)."""
+        return bool(self._symmetric_groups)
+
+    def state_set(self) -> 'StateSet':
+        return StateSet(self.stats, self.canonical if self.symmetric else None)
+
+    def state_map(self) -> 'StateMap':
+        return StateMap(self.stats, self.canonical if self.symmetric else None)
+
+    # --- Conversion back to the object model ------------------------------
+
+    def decode_move(self, move_code: int) -> Tuple[str, str]:
+        """Return (entity_id, direction) for a move code."""
+        j, d = divmod(move_code, 4)
+        return self.movable_ids[j], DIRECTIONS[d][0]
+
+    def to_grid_state(self, state: PackedState) -> GridState:
+        """Materialise a packed state as a standalone GridState."""
+        grid = copy.deepcopy(self.grid)
+        buf = self.unpack(state)
+        coins = iter(range(self.num_coins))
+        movables = iter(range(self.movable_offset, self.piggy_offset))
+        piggies = iter(range(self.piggy_offset, len(buf)))
+
+        for e in grid.entities:
+            if e.type == EntityType.COIN:
+                cell = buf[next(coins)]
+                if cell == self.COLLECTED:
+                    e.is_collected = True
+                else:
+                    e.row, e.col = divmod(cell, self.cols)
+                e.is_falling = False
+            elif e.is_collected:
+                continue
+            elif e.type in MOVABLE_TYPES:
+                e.row, e.col = divmod(buf[next(movables)], self.cols)
+            elif e.type == EntityType.PIGGYBANK:
+                e.current_count = buf[next(piggies)]
+        return grid
+
+
+class _HashedStates:
+    """
+    Shared plumbing of StateSet / StateMap.
+    Entries are keyed by Zobrist hash and packed states are only compared
+    when two hashes match; genuine collisions (different states, same hash)
+    spill into a small overflow keyed by the state itself. With a
+    `canonical` function, states are compared (and overflow-keyed) up to
+    symmetry. With SolverStats, probing time is added to stats.time_hashing.
+    """
+
+    def __init__(self, canonical=None):
+        self._canonical = canonical
+        self._overflow: Dict[PackedState, object] = {}
+
+    def __len__(self) -> int:
+        return len(self._by_hash) + len(self._overflow)
+
+    def __sizeof__(self) -> int:
+        return object.__sizeof__(self) + sys.getsizeof(self._by_hash) + sys.getsizeof(self._overflow)
+
+    def _same(self, a: PackedState, b: PackedState) -> bool:
+        return a == b or (self._canonical is not None and self._canonical(a) == self._canonical(b))
+
+    def _overflow_key(self, state: PackedState) -> PackedState:
+        return state if self._canonical is None else self._canonical(state)
+
+
+class StateSet(_HashedStates):
+    """
+    Set of packed states keyed by their Zobrist hash.
+    Also the "exact" visited store (see visited_stores): `max_entries`
+    is the budget a search enforces, if any.
+    """
+    lossy = False
+
+    def __init__(self, stats: Optional[SolverStats] = None, canonical=None):
+        super().__init__(canonical)
+        self._by_hash: Dict[int, PackedState] = {}
+        self.max_entries: Optional[int] = None
+        if stats is not None:
+            self.add = _timed(stats, self.add)
+
+    def add(self, key: int, state: PackedState) -> bool:
+        """Insert a state. Returns False if it (or an equivalent one) was already present."""
+        other = self._by_hash.get(key)
+        if other is None:
+            self._by_hash[key] = state
+            return True
+        if other == state or self._same(other, state):
+            return False
+        overflow_key = self._overflow_key(state)
+        if overflow_key in self._overflow:
+            return False
+        self._overflow[overflow_key] = key
+        return True
+
+    def close(self) -> None:
+        pass
+
+    def discard(self, key: int, state: PackedState) -> None:
+        other = self._by_hash.get(key)
+        if other is not None and self._same(other, state):
+            del self._by_hash[key]
+            # Promote a colliding state so lookups by this key still find it
+            for other, other_key in self._overflow.items():
+                if other_key == key:
+                    del self._overflow[other]
+                    self._by_hash[key] = other
+                    break
+        else:
+            self._overflow.pop(self._overflow_key(state), None)
+
+
+class StateMap(_HashedStates):
+    """Mapping from packed states to values, keyed by Zobrist hash."""
+
+    def __init__(self, stats: Optional[SolverStats] = None, canonical=None):
+        super().__init__(canonical)
+        self._by_hash: Dict[int, Tuple[PackedState, object]] = {}
+        if stats is not None:
+            self.get = _timed(stats, self.get)
+            self.put = _timed(stats, self.put)
+
+    def get(self, key: int, state: PackedState, default=None):
+        entry = self._by_hash.get(key)
+        if entry is None:
+            return default
+        if entry[0] == state or self._same(entry[0], state):
+            return entry[1]
+        return self._overflow.get(self._overflow_key(state), default)
+
+    def put(self, key: int, state: PackedState, value) -> None:
+        entry = self._by_hash.get(key)
+        if entry is None or self._same(entry[0], state):
+            self._by_hash[key] = (state, value)
+        else:
+            self._overflow[self._overflow_key(state)] = value
+
+
+def _timed(stats: SolverStats, method):
+    """Wrap a bound method so its run time is charged to stats.time_hashing."""
+    clock = time.perf_counter
+
+    def wrapper(*args):
+        t0 = clock()
+        result = method(*args)
+        stats.time_hashing += clock() - t0
+        return result
+    return wrapper
+
+
+class SearchTree:
+    """
+    Flat storage for the nodes of a search.
+    Node i is described by states[i], hashes[i], parent[i], move[i] and
+    depth[i]; queues and heaps only carry the node index. Move lists are
+    rebuilt by walking parent links once a solution is found, instead of
+    copying the path into every queued node.
+    """
+
+    def __init__(self, root: PackedState, root_hash: int):
+        self.states: List[PackedState] = [root]
+        self.hashes = array('Q', [root_hash])
+        self.parent = array('i', [-1])
+        self.move = array('i', [-1])
+        self.depth = array('H', [0])
+
+    def __len__(self) -> int:
+        return len(self.states)
+
+    def __sizeof__(self) -> int:
+        return (object.__sizeof__(self) + sys.getsizeof(self.states) + sys.getsizeof(self.hashes)
+                + sys.getsizeof(self.parent) + sys.getsizeof(self.move) + sys.getsizeof(self.depth))
+
+    def add(self, state: PackedState, state_hash: int, parent: int, move_code: int) -> int:
+        """Append a child of `parent`; returns its node index."""
+        self.states.append(state)
+        self.hashes.append(state_hash)
+        self.parent.append(parent)
+        self.move.append(move_code)
+        self.depth.append(self.depth[parent] + 1)
+        return len(self.states) - 1
+
+    def reparent(self, node: int, parent: int, move_code: int, state: PackedState) -> None:
+        """
+        Record a shorter route to an existing node.
+        `state` is the concrete state that route reaches; it may differ from
+        the stored one by a swap of interchangeable movables.
+        """
+        self.states[node] = state
+        self.parent[node] = parent
+        self.move[node] = move_code
+        self.depth[node] = self.depth[parent] + 1
+
+    def path(self, node: int) -> Tuple[int, ...]:
+        """Move codes from the root to `node`."""
+        moves = []
+        while self.parent[node] >= 0:
+            moves.append(self.move[node])
+            node = self.parent[node]
+        return tuple(reversed(moves))
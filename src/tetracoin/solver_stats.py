@@ -0,0 +1,182 @@
+"""
+Tetracoin Solver Instrumentation.
+Optional counters and timers filled in by the search engines.
+
+Pass a SolverStats to any TetracoinSolver.solve_* call (or to solve) to
+find out where a search spends its time. Collection only adds a few
+counter increments per node plus perf_counter calls around physics and
+visited-table probes, so it is cheap enough to leave on during generation.
+BatchSolveStats sums up a whole TetracoinSolver.solve_many batch, and
+SolutionSpace describes the states around the optimal solutions.
+"""
+from dataclasses import dataclass, field
+import sys
+from typing import Any, Dict, List
+
+
+@dataclass
+class SolverStats:
+    """Counters and timings of a single solver run."""
+    engine: str = ""
+    nodes_expanded: int = 0
+    nodes_generated: int = 0       # Children produced by move generation (incl. duplicates)
+    duplicate_hits: int = 0        # Children dropped because already visited / on path
+    dead_states_pruned: int = 0    # Children dropped because a coin can never be collected
+    independent_moves_skipped: int = 0  # Moves skipped because they commute with the previous one
+    max_branching: int = 0
+    frontier_by_depth: Dict[int, int] = field(default_factory=dict)  # depth -> nodes queued
+    physics_ticks: int = 0
+    peak_visited: int = 0          # Entries in the visited set at its largest
+    peak_visited_bytes: int = 0    # Approximate memory of the visited set at its largest
+
+    # Wall time split (seconds)
+    time_move_generation: float = 0.0
+    time_physics: float = 0.0
+    time_hashing: float = 0.0          # Visited-table probes (Zobrist keys are updated incrementally)
+    wall_time: float = 0.0
+
+    @property
+    def mean_branching(self) -> float:
+        if self.nodes_expanded == 0:
+            return 0.0
+        return self.nodes_generated / self.nodes_expanded
+
+    @property
+    def nodes_per_second(self) -> float:
+        if self.wall_time <= 0.0:
+            return 0.0
+        return self.nodes_expanded / self.wall_time
+
+    def record_expansion(self, children: int):
+        self.nodes_expanded += 1
+        self.nodes_generated += children
+        if children > self.max_branching:
+            self.max_branching = children
+
+    def record_frontier(self, depth: int):
+        self.frontier_by_depth[depth] = self.frontier_by_depth.get(depth, 0) + 1
+
+    def record_visited(self, visited: Any, entry_bytes: int):
+        """Track the largest visited container seen so far."""
+        size = len(visited)
+        if size > self.peak_visited:
+            self.peak_visited = size
+            self.peak_visited_bytes = sys.getsizeof(visited) + size * entry_bytes
+
+    def add_worker_timings(self, other: 'SolverStats'):
+        """Fold in physics and move-generation work done by a worker process."""
+        self.physics_ticks += other.physics_ticks
+        self.time_physics += other.time_physics
+        self.time_move_generation += other.time_move_generation
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-friendly snapshot, including the derived rates."""
+        return {
+            "engine": self.engine,
+            "nodes_expanded": self.nodes_expanded,
+            "nodes_generated": self.nodes_generated,
+            "duplicate_hits": self.duplicate_hits,
+            "dead_states_pruned": self.dead_states_pruned,
+            "independent_moves_skipped": self.independent_moves_skipped,
+            "mean_branching": round(self.mean_branching, 3),
+            "max_branching": self.max_branching,
+            "frontier_by_depth": {str(d): n for d, n in sorted(self.frontier_by_depth.items())},
+            "physics_ticks": self.physics_ticks,
+            "peak_visited": self.peak_visited,
+            "peak_visited_bytes": self.peak_visited_bytes,
+            "time_move_generation": self.time_move_generation,
+            "time_physics": self.time_physics,
+            "time_hashing": self.time_hashing,
+            "wall_time": self.wall_time,
+            "nodes_per_second": round(self.nodes_per_second, 1),
+        }
+
+    def summary(self) -> str:
+        return (f"{self.engine or 'solver'}: {self.nodes_expanded} nodes in {self.wall_time * 1000:.1f} ms "
+                f"({self.nodes_per_second:.0f}/s), branching {self.mean_branching:.2f} avg / {self.max_branching} max, "
+                f"{self.duplicate_hits} duplicates, {self.dead_states_pruned} dead, "
+                f"{self.independent_moves_skipped} commuting, {self.physics_ticks} ticks, "
+                f"peak visited {self.peak_visited} (~{self.peak_visited_bytes // 1024} KiB); "
+                f"movegen {self.time_move_generation * 1000:.1f} ms, physics {self.time_physics * 1000:.1f} ms, "
+                f"hashing {self.time_hashing * 1000:.1f} ms")
+
+
+@dataclass
+class SolutionSpace:
+    """
+    Shape of the search space around the optimal solutions, filled in by
+    TetracoinSolver.solve_bfs(..., solution_space=...) from the same search.
+    Only optimal_solutions costs extra expansions: the rest of the layer
+    holding the first solution.
+    """
+    optimal_solutions: int = 0  # Shortest move sequences (commuting moves counted in one order)
+    path_branching: List[int] = field(default_factory=list)  # Legal moves at each state of the returned solution
+    dead_end_ratio: float = 0.0  # Share of generated children that could never be won
+    near_win_states: int = 0  # Explored states with a winning move
+    complete: bool = False  # The layer holding the solutions was fully expanded
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "optimal_solutions": self.optimal_solutions,
+            "path_branching": list(self.path_branching),
+            "dead_end_ratio": round(self.dead_end_ratio, 4),
+            "near_win_states": self.near_win_states,
+            "complete": self.complete,
+        }
+
+
+@dataclass
+class BatchSolveStats:
+    """Aggregate throughput of a TetracoinSolver.solve_many run."""
+    grids: int = 0
+    solved: int = 0
+    unsolvable: int = 0
+    unknown: int = 0
+    nodes_explored: int = 0
+    solve_time: float = 0.0  # Sum of per-grid solve times, across all workers
+    wall_time: float = 0.0   # From the call until the last result was yielded
+    workers: int = 1
+
+    @property
+    def grids_per_second(self) -> float:
+        if self.wall_time <= 0.0:
+            return 0.0
+        return self.grids / self.wall_time
+
+    @property
+    def nodes_per_second(self) -> float:
+        if self.wall_time <= 0.0:
+            return 0.0
+        return self.nodes_explored / self.wall_time
+
+    def record(self, result: Any):
+        """Count one SolveResult."""
+        self.grids += 1
+        status = result.status.value
+        if status == "SOLVED":
+            self.solved += 1
+        elif status == "UNSOLVABLE":
+            self.unsolvable += 1
+        else:
+            self.unknown += 1
+        self.nodes_explored += result.nodes_explored
+        self.solve_time += result.elapsed
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "grids": self.grids,
+            "solved": self.solved,
+            "unsolvable": self.unsolvable,
+            "unknown": self.unknown,
+            "nodes_explored": self.nodes_explored,
+            "solve_time": self.solve_time,
+            "wall_time": self.wall_time,
+            "workers": self.workers,
+            "grids_per_second": round(self.grids_per_second, 1),
+            "nodes_per_second": round(self.nodes_per_second, 1),
+        }
+
+    def summary(self) -> str:
+        return (f"{self.grids} grids in {self.wall_time:.2f} s on {self.workers} worker(s) "
+                f"({self.grids_per_second:.1f} grids/s, {self.nodes_per_second:.0f} nodes/s): "
+                f"{self.solved} solved, {self.unsolvable} unsolvable, {self.unknown} unknown")
@@ -3,9 +3,11 @@ Tetracoin Formal Specification Module.
 This module defines the core types, entities, and physics rules for the game system.
 It acts as the single source of truth for the game logic.
 """
-from enum import Enum, auto
-from dataclasses import dataclass, field
-from typing import List, Dict, Optional, Tuple, Set
+from enum import Enum, IntEnum, auto
+import heapq
+from dataclasses import dataclass, field, fields, MISSING
+from operator import attrgetter
+from typing import Any, Callable, List, Dict, NamedTuple, Optional, Tuple, Set
 
 class EntityType(str, Enum):
     """Enumeration of possible entity types in the grid."""
@@ -35,9 +37,37 @@ class Direction(str, Enum):
     LEFT = "LEFT"
     RIGHT = "RIGHT"
 
-@dataclass
+# Entity fields that decide which cell an entity occupies in a GridState index
+_INDEXED_FIELDS = frozenset(("row", "col", "is_collected"))
+
+# Concrete entity class per EntityType, filled by _register (see Entity.from_dict)
+ENTITY_CLASSES: Dict[EntityType, type] = {}
+
+def _register(cls):
+    """Cache the field layout of an entity class and index it by its EntityType."""
+    names = tuple(f.name for f in fields(cls) if f.name != "_owners")
+    cls._field_names = names
+    cls._init_names = tuple(f.name for f in fields(cls) if f.init)
+    cls._values = attrgetter(*names)
+    # Slot descriptors: copies fill slots directly, bypassing __setattr__
+    cls._setters = tuple(getattr(cls, name).__set__ for name in names)
+    entity_type = cls.__dataclass_fields__["type"].default
+    if entity_type is not MISSING:
+        ENTITY_CLASSES[entity_type] = cls
+    return cls
+
+@_register
+@dataclass(slots=True)
 class Entity:
-    """Base class for all game entities."""
+    """
+    Base class for all game entities.
+    Entities are slotted (no per-instance __dict__) and hold only immutable
+    values, so clone() - also used by copy and deepcopy - is a flat copy.
+    """
+    # EntityLists whose occupancy index contains this entity. First field:
+    # __init__ assigns it before the indexed fields.
+    _owners: tuple = field(default=(), init=False, repr=False, compare=False)
+
     id: str
     type: EntityType
     color: ColorType
@@ -47,24 +77,65 @@ class Entity:
     # State flags
     is_falling: bool = False
     is_collected: bool = False
+
+    def __setattr__(self, name, value):
+        if name in _INDEXED_FIELDS and self._owners:
+            owners = self._owners
+            for owner in owners:
+                owner._unindex(self)
+            object.__setattr__(self, name, value)
+            for owner in owners:
+                owner._index(self)
+        else:
+            object.__setattr__(self, name, value)
+
+    def clone(self) -> 'Entity':
+        """Copy of this entity, outside any GridState index."""
+        new = object.__new__(type(self))
+        new.__setstate__(self._values(self))
+        return new
+
+    def __copy__(self):
+        return self.clone()
+
+    def __deepcopy__(self, memo):
+        new = memo[id(self)] = self.clone()
+        return new
+
+    def __getstate__(self):
+        # Index registrations belong to the original grid, never to copies
+        return self._values(self)
+
+    def __setstate__(self, state):
+        object.__setattr__(self, "_owners", ())
+        for setter, value in zip(self._setters, state):
+            setter(self, value)
     
-    def to_dict(self):
-        return {
-            "id": self.id,
-            "type": self.type.value,
-            "color": self.color.value,
-            "row": self.row,
-            "col": self.col,
-            "is_falling": self.is_falling,
-            "is_collected": self.is_collected
-        }
+    def to_dict(self) -> Dict[str, Any]:
+        d = dict(zip(self._field_names, self._values(self)))
+        d["type"] = self.type.value
+        d["color"] = self.color.value
+        return d
 
-@dataclass
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Entity':
+        """
+        Build the entity described by a to_dict() (or level JSON) mapping,
+        whatever its type. Missing optional keys keep their defaults.
+        """
+        entity_cls = ENTITY_CLASSES[EntityType(data["type"])]
+        kwargs = {name: data[name] for name in entity_cls._init_names if name in data}
+        kwargs["color"] = ColorType(data["color"])
+        return entity_cls(**kwargs)
+
+@_register
+@dataclass(slots=True)
 class Coin(Entity):
     """A falling coin entity."""
     type: EntityType = field(default=EntityType.COIN, init=False)
 
-@dataclass
+@_register
+@dataclass(slots=True)
 class PiggyBank(Entity):
     """A container that accepts coins of matching color."""
     type: EntityType = field(default=EntityType.PIGGYBANK, init=False)
@@ -75,83 +146,272 @@ class PiggyBank(Entity):
     def is_full(self) -> bool:
         return self.current_count >= self.capacity
 
-    def to_dict(self):
-        d = super().to_dict()
-        d.update({
-            "capacity": self.capacity,
-            "current_count": self.current_count
-        })
-        return d
-
-@dataclass
+@_register
+@dataclass(slots=True)
 class Obstacle(Entity):
     """An obstacle that deflects falling coins."""
     type: EntityType = field(default=EntityType.OBSTACLE, init=False)
 
-@dataclass
+@_register
+@dataclass(slots=True)
 class FixedBlock(Entity):
     """A static block preventing movement."""
     type: EntityType = field(default=EntityType.FIXED_BLOCK, init=False)
 
-@dataclass
+@_register
+@dataclass(slots=True)
 class Support(Entity):
     """A platform that holds objects but doesn't block movement sideways? Or just a static platform."""
     type: EntityType = field(default=EntityType.SUPPORT, init=False)
 
-@dataclass
+@_register
+@dataclass(slots=True)
 class Deflector(Entity):
     """Deviates falling objects."""
     type: EntityType = field(default=EntityType.DEFLECTOR, init=False)
     direction: str = "LEFT" # LEFT, RIGHT, etc.
 
-    def to_dict(self):
-        d = super().to_dict()
-        d.update({"direction": self.direction})
-        return d
-
-@dataclass
+@_register
+@dataclass(slots=True)
 class Gateway(Entity):
     """A conditional passage."""
     type: EntityType = field(default=EntityType.GATEWAY, init=False)
     is_open: bool = False
     condition: str = "DEFAULT" # e.g. "COIN_COUNT", "SWITCH"
 
-    def to_dict(self):
-        d = super().to_dict()
-        d.update({"is_open": self.is_open, "condition": self.condition})
-        return d
-
-@dataclass
+@_register
+@dataclass(slots=True)
 class Trap(Entity):
     """Hazardous entity."""
     type: EntityType = field(default=EntityType.TRAP, init=False)
     subtype: str = "SPIKES" # SPIKES, PIT
 
-    def to_dict(self):
-        d = super().to_dict()
-        d.update({"subtype": self.subtype})
-        return d
+class EntityList(list):
+    """
+    List of entities with a lazily built occupancy index keyed by (row, col).
+    Once built, the index follows appends/removals on the list and row, col and
+    is_collected changes on its entities, so cell lookups are O(1).
+    Operations that rewrite the list wholesale simply drop the index; it is
+    rebuilt on the next lookup.
+    """
+    _cells: Optional[Dict[Tuple[int, int], List[Entity]]] = None
+
+    def __getstate__(self):
+        # Copies and pickles rebuild their own index
+        return None
+
+    # --- Index maintenance ----------------------------------------------------
+
+    def _index(self, entity: Entity):
+        if not entity.is_collected:
+            self._cells.setdefault((entity.row, entity.col), []).append(entity)
+
+    def _unindex(self, entity: Entity):
+        key = (entity.row, entity.col)
+        bucket = self._cells.get(key)
+        if bucket:
+            for i, e in enumerate(bucket):
+                if e is entity:
+                    del bucket[i]
+                    break
+            if not bucket:
+                del self._cells[key]
+
+    def _attach(self, entity: Entity):
+        if self._cells is None:
+            return
+        if not any(o is self for o in entity._owners):
+            object.__setattr__(entity, "_owners", entity._owners + (self,))
+        self._index(entity)
+
+    def _detach(self, entity: Entity):
+        if self._cells is None:
+            return
+        self._unindex(entity)
+        object.__setattr__(entity, "_owners", tuple(o for o in entity._owners if o is not self))
+
+    def build_index(self):
+        """(Re)build the occupancy index from scratch."""
+        self.drop_index()
+        self._cells = {}
+        for e in self:
+            self._attach(e)
+
+    def drop_index(self):
+        """Forget the index and stop tracking the entities."""
+        if self._cells is None:
+            return
+        for e in self:
+            object.__setattr__(e, "_owners", tuple(o for o in e._owners if o is not self))
+        self._cells = None
+
+    def entity_at(self, row: int, col: int) -> Optional[Entity]:
+        """First non-collected entity (in list order) at the given cell."""
+        if self._cells is None:
+            self.build_index()
+        bucket = self._cells.get((row, col))
+        if not bucket:
+            return None
+        if len(bucket) == 1:
+            return bucket[0]
+        # Overlapping entities: keep list-order semantics
+        for e in self:
+            if e.row == row and e.col == col and not e.is_collected:
+                return e
+        return None
+
+    def verify_index(self):
+        """Raise RuntimeError if the index disagrees with the entities."""
+        if self._cells is None:
+            return
+        expected: Dict[Tuple[int, int], List[int]] = {}
+        for e in self:
+            if not e.is_collected:
+                expected.setdefault((e.row, e.col), []).append(id(e))
+        actual = {key: [id(e) for e in bucket] for key, bucket in self._cells.items()}
+        stale = [key for key in set(expected) | set(actual)
+                 if sorted(expected.get(key, [])) != sorted(actual.get(key, []))]
+        if stale:
+            raise RuntimeError(f"Stale occupancy index entries at cells {sorted(stale)}")
+
+    # --- Mutations ------------------------------------------------------------
+
+    def append(self, entity):
+        super().append(entity)
+        self._attach(entity)
+
+    def extend(self, entities):
+        entities = list(entities)
+        super().extend(entities)
+        for e in entities:
+            self._attach(e)
+
+    def __iadd__(self, entities):
+        self.extend(entities)
+        return self
+
+    def insert(self, index, entity):
+        super().insert(index, entity)
+        self._attach(entity)
+
+    def remove(self, entity):
+        i = self.index(entity)
+        removed = self[i]
+        super().__delitem__(i)
+        self._detach(removed)
+
+    def pop(self, index=-1):
+        removed = super().pop(index)
+        self._detach(removed)
+        return removed
+
+    def clear(self):
+        self.drop_index()
+        super().clear()
+
+    def __setitem__(self, index, value):
+        self.drop_index()
+        super().__setitem__(index, value)
+
+    def __delitem__(self, index):
+        self.drop_index()
+        super().__delitem__(index)
+
+    def __imul__(self, n):
+        self.drop_index()
+        return super().__imul__(n)
+
 @dataclass
 class GridState:
     """Snapshot of the entire grid state."""
     rows: int
     cols: int
-    entities: List[Entity] = field(default_factory=list)
+    entities: List[Entity] = field(default_factory=EntityList)
     player_start: Optional[Tuple[int, int]] = None
     difficulty_tier: str = "UNKNOWN"
     difficulty_score: float = 0.0
+
+    # Debug mode: cross-check every indexed lookup against a linear scan
+    debug_index = False
+
+    def __setattr__(self, name, value):
+        if name == "entities":
+            old = self.__dict__.get("entities")
+            if isinstance(old, EntityList) and old is not value:
+                old.drop_index()
+            if not isinstance(value, EntityList):
+                value = EntityList(value)
+        object.__setattr__(self, name, value)
     
     def get_entity_at(self, row: int, col: int) -> Optional[Entity]:
-        for e in self.entities:
-            if e.row == row and e.col == col and not e.is_collected:
-                return e
-        return None
+        entities = self.entities
+        if self.debug_index:
+            entity = entities.entity_at(row, col)
+            entities.verify_index()
+            return entity
+        cells = entities._cells
+        if cells is None:
+            return entities.entity_at(row, col)
+        bucket = cells.get((row, col))
+        if not bucket:
+            return None
+        if len(bucket) == 1:
+            return bucket[0]
+        return entities.entity_at(row, col)
         
     def is_valid_pos(self, row: int, col: int) -> bool:
         return 0 <= row < self.rows and 0 <= col < self.cols
         
     def is_empty(self, row: int, col: int) -> bool:
-        return self.is_valid_pos(row, col) and self.get_entity_at(row, col) is None
+        return 0 <= row < self.rows and 0 <= col < self.cols and self.get_entity_at(row, col) is None
+
+class EventKind(IntEnum):
+    """Kinds of PhysicsEvent."""
+    COLLECT = 1         # A coin dropped into a piggybank
+    PIGGYBANK_FULL = 2  # That coin filled the piggybank
+
+class PhysicsEvent(NamedTuple):
+    """
+    Something the physics did during a tick.
+    `entity` is the index in GridState.entities of the coin (COLLECT) or
+    piggybank (PIGGYBANK_FULL), and (row, col) its cell.
+    """
+    kind: EventKind
+    entity: int
+    row: int
+    col: int
+    color: ColorType
+
+class EventBuffer(list):
+    """
+    Reusable list of PhysicsEvents with per-kind subscribers.
+    The physics appends events while it ticks and dispatch() hands each one
+    to the handlers subscribed to its kind. Clearing the buffer before the
+    next tick lets a game loop reuse one buffer for every tick.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._handlers: Dict[EventKind, List[Callable[[PhysicsEvent], Any]]] = {kind: [] for kind in EventKind}
+
+    def subscribe(self, kind: EventKind, handler: Callable[[PhysicsEvent], Any]):
+        self._handlers[kind].append(handler)
+
+    def unsubscribe(self, kind: EventKind, handler: Callable[[PhysicsEvent], Any]):
+        self._handlers[kind].remove(handler)
+
+    def dispatch(self):
+        """Deliver the buffered events in order."""
+        handlers = self._handlers
+        for event in self:
+            for handler in handlers[event.kind]:
+                handler(event)
+
+def _entity_index(state: GridState, entity: Entity) -> int:
+    for i, e in enumerate(state.entities):
+        if e is entity:
+            return i
+    return -1
 
 class PhysicsEngine:
     """
@@ -160,14 +420,15 @@ class PhysicsEngine:
     """
     
     @staticmethod
-    def update(state: GridState) -> Tuple[GridState, List[str]]:
+    def update(state: GridState, events: Optional[List[PhysicsEvent]] = None) -> Tuple[GridState, List[PhysicsEvent]]:
         """
         Advance the simulation by one tick.
         Returns:
             - The new state
-            - A list of events triggered (e.g. "COLLECT_RED", "LEVEL_COMPLETE")
+            - The PhysicsEvents triggered, appended to `events` if given
         """
-        events = []
+        if events is None:
+            events = []
         
         # 1. Apply Gravity (Bottom-up to avoid double processing)
         # Sort entities by row descending
@@ -181,9 +442,109 @@ class PhysicsEngine:
                 PhysicsEngine._update_coin(entity, state, events)
                 
         return state, events
-    
+
+    @staticmethod
+    def settle(state: GridState, columns: Optional[Set[int]] = None, max_ticks: int = 100,
+               events: Optional[List[PhysicsEvent]] = None) -> List[PhysicsEvent]:
+        """
+        Tick gravity until the given columns (default: all) are at rest.
+        Coins only ever move down their own column, so a column in which no
+        coin moved during a tick is settled and drops out of the dirty set.
+        Returns the events triggered while settling (`events`, if given).
+        """
+        if events is None:
+            events = []
+        if columns is None:
+            dirty = set(range(state.cols))
+        else:
+            dirty = {c for c in columns if 0 <= c < state.cols}
+
+        for _ in range(max_ticks):
+            if not dirty:
+                break
+            coins = sorted(
+                (e for e in state.entities
+                 if e.type == EntityType.COIN and not e.is_collected and e.col in dirty),
+                key=lambda e: e.row, reverse=True
+            )
+            moved = set()
+            for coin in coins:
+                row = coin.row
+                PhysicsEngine._update_coin(coin, state, events)
+                if coin.row != row or coin.is_collected:
+                    moved.add(coin.col)
+            dirty = moved
+
+        return events
+
+    @staticmethod
+    def drop(state: GridState, columns: Optional[Set[int]] = None,
+             events: Optional[List[PhysicsEvent]] = None) -> List[PhysicsEvent]:
+        """
+        Bring the given columns (default: all) to rest in a single pass.
+        Same end state as settle(): each coin, lowest first, scans down its
+        column to the first occupied cell and lands on it, or is collected by
+        it. A coin never waits for the one below it (lower coins move first
+        within a tick), so arrival order, and hence which coins fit in a
+        piggybank, is the same. Events come out column by column instead of
+        tick by tick. Unlike settle(), there is no tick limit.
+        """
+        if events is None:
+            events = []
+        if columns is None:
+            wanted = set(range(state.cols))
+        else:
+            wanted = {c for c in columns if 0 <= c < state.cols}
+
+        coins = sorted(
+            (e for e in state.entities
+             if e.type == EntityType.COIN and not e.is_collected and e.col in wanted),
+            key=lambda e: (e.col, -e.row)
+        )
+        for coin in coins:
+            PhysicsEngine._drop_coin(coin, state, events)
+        return events
+
     @staticmethod
-    def _update_coin(coin: Coin, state: GridState, events: List[str]):
+    def _drop_coin(coin: Coin, state: GridState, events: List[PhysicsEvent]):
+        """Move a coin straight to where _update_coin ticks would leave it."""
+        row = coin.row
+        while state.is_valid_pos(row + 1, coin.col) and state.get_entity_at(row + 1, coin.col) is None:
+            row += 1
+        fell = row != coin.row
+        collider = state.get_entity_at(row + 1, coin.col) if state.is_valid_pos(row + 1, coin.col) else None
+        if fell:
+            coin.row = row
+
+        if collider is None:
+            # Bottom of the grid
+            coin.is_falling = False
+        elif collider.type == EntityType.PIGGYBANK:
+            piggy: PiggyBank = collider
+            if piggy.color == coin.color and not piggy.is_full:
+                piggy.current_count += 1
+                coin.is_collected = True
+                PhysicsEngine._collected(coin, piggy, state, events)
+                if fell:
+                    coin.is_falling = True
+            else:
+                coin.is_falling = False
+        elif collider.type in (EntityType.OBSTACLE, EntityType.FIXED_BLOCK, EntityType.COIN):
+            coin.is_falling = False
+        elif fell:
+            # Other entities stop the coin without touching the flag
+            coin.is_falling = True
+
+    @staticmethod
+    def _collected(coin: Coin, piggy: PiggyBank, state: GridState, events: List[PhysicsEvent]):
+        """Record that `coin` went into `piggy`."""
+        events.append(PhysicsEvent(EventKind.COLLECT, _entity_index(state, coin), coin.row, coin.col, coin.color))
+        if piggy.is_full:
+            events.append(PhysicsEvent(EventKind.PIGGYBANK_FULL, _entity_index(state, piggy),
+                                       piggy.row, piggy.col, piggy.color))
+
+    @staticmethod
+    def _update_coin(coin: Coin, state: GridState, events: List[PhysicsEvent]):
         """Apply gravity logic to a single coin."""
         
         # Target position: directly below
@@ -210,10 +571,7 @@ class PhysicsEngine:
                 # Collect!
                 piggy.current_count += 1
                 coin.is_collected = True
-                events.append(f"COLLECT_{coin.color.value}")
-                
-                if piggy.is_full:
-                    events.append(f"PIGGYBANK_FULL_{piggy.id}")
+                PhysicsEngine._collected(coin, piggy, state, events)
             else:
                 # Wrong color or full -> Blocked
                 coin.is_falling = False
@@ -238,3 +596,95 @@ class PhysicsEngine:
                 pass
                 
             coin.is_falling = False # Stop for now if simple stack
+
+class SleepingPhysics:
+    """
+    Frame-by-frame driver for PhysicsEngine that lets a settled grid sleep.
+    Only coins can move, and a coin at rest stays at rest until the cell
+    below it changes. The driver keeps the awake set of coins that may
+    still move. step() ticks only those coins, with the same rules and
+    bottom-up order as PhysicsEngine.update, so the grid ends each tick
+    exactly as update() would leave it. A coin goes to sleep on the first
+    tick it does not move. Coins are woken by:
+    - player moves, through moved();
+    - gateway changes, through set_gateway_open();
+    - coins leaving a cell, by falling or by being collected (automatic).
+    Once nothing is awake, step() returns at once.
+    Each tick's events go to `events`, an EventBuffer: subscribe to it to
+    receive them.
+    """
+
+    def __init__(self, state: GridState):
+        self.state = state
+        self.events = EventBuffer()
+        self._awake: Dict[int, Coin] = {}
+        self.wake_all()
+
+    @property
+    def is_awake(self) -> bool:
+        return bool(self._awake)
+
+    @property
+    def awake(self) -> List[Coin]:
+        return list(self._awake.values())
+
+    def wake_all(self):
+        """Wake every live coin (new level, or state edited from outside)."""
+        self._awake = {id(e): e for e in self.state.entities
+                       if e.type == EntityType.COIN and not e.is_collected}
+
+    def wake_cell(self, row: int, col: int):
+        """Something changed at (row, col): wake a coin there and the coin resting on it."""
+        for r in (row, row - 1):
+            entity = self.state.get_entity_at(r, col) if self.state.is_valid_pos(r, col) else None
+            if entity is not None and entity.type == EntityType.COIN:
+                self._awake[id(entity)] = entity
+
+    def moved(self, entity: Entity, from_row: int, from_col: int):
+        """`entity` was moved by the player from (from_row, from_col)."""
+        # Filling a cell only ever stops coins; emptying one can start them
+        self.wake_cell(from_row, from_col)
+
+    def set_gateway_open(self, gateway: Gateway, is_open: bool):
+        if gateway.is_open != is_open:
+            gateway.is_open = is_open
+            self.wake_cell(gateway.row, gateway.col)
+
+    def step(self) -> List[PhysicsEvent]:
+        """
+        Advance the awake coins by one tick and dispatch its events to the
+        subscribers. Returns the events: the `events` buffer, which the
+        next step() clears.
+        """
+        events = self.events
+        events.clear()
+        if not self._awake:
+            return events
+        state = self.state
+        # Lowest first; coins woken during the tick sit above the coin that
+        # woke them and join the same tick, as in update()
+        heap = [(-coin.row, n, coin) for n, coin in enumerate(self._awake.values())]
+        heapq.heapify(heap)
+        queued = set(self._awake)
+        count = len(heap)
+        still_awake: Dict[int, Coin] = {}
+
+        while heap:
+            _, _, coin = heapq.heappop(heap)
+            if coin.is_collected:
+                continue
+            row, col = coin.row, coin.col
+            PhysicsEngine._update_coin(coin, state, events)
+            if coin.row == row and not coin.is_collected:
+                continue  # Blocked: asleep
+            if not coin.is_collected:
+                still_awake[id(coin)] = coin
+            above = state.get_entity_at(row - 1, col) if row > 0 else None
+            if above is not None and above.type == EntityType.COIN and id(above) not in queued:
+                queued.add(id(above))
+                count += 1
+                heapq.heappush(heap, (-above.row, count, above))
+
+        self._awake = still_awake
+        events.dispatch()
+        return events
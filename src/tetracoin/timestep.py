@@ -0,0 +1,53 @@
+"""
+Tetracoin Fixed Timestep.
+Simulation clock that decouples physics ticks from the render frame rate.
+
+Each frame banks its real duration; the simulation then runs as many
+whole ticks of `step` seconds as the bank holds, so gameplay speed is the
+same at 30 and 60 FPS. What is left over, as a fraction of a tick
+(alpha), tells the renderer how far to interpolate between the last two
+simulated states. A frame runs at most `max_steps` ticks: after a long
+stall the rest of the backlog is dropped instead of being simulated in a
+burst that would make the next frame late too.
+"""
+
+
+class FixedTimestep:
+    """Accumulator for fixed-size simulation ticks."""
+
+    def __init__(self, step: float, max_steps: int = 5):
+        if step <= 0:
+            raise ValueError("step must be positive")
+        if max_steps < 1:
+            raise ValueError("max_steps must be at least 1")
+        self.step = step
+        self.max_steps = max_steps
+        self.accumulator = 0.0
+
+    @classmethod
+    def from_rate(cls, ticks_per_second: float, max_steps: int = 5) -> 'FixedTimestep':
+        return cls(1.0 / ticks_per_second, max_steps)
+
+    def advance(self, dt: float) -> int:
+        """Bank `dt` seconds of real time; returns the ticks to simulate now."""
+        self.accumulator += max(0.0, dt)
+        steps = min(int(self.accumulator / self.step), self.max_steps)
+        self.accumulator -= steps * self.step
+        if self.accumulator >= self.step:
+            # Late beyond catching up: keep only the partial tick
+            self.accumulator %= self.step
+        return steps
+
+    @property
+    def alpha(self) -> float:
+        """Progress towards the next tick, in [0, 1)."""
+        return min(self.accumulator / self.step, 1.0)
+
+    def reset(self):
+        """Forget banked time (e.g. while the simulation sleeps)."""
+        self.accumulator = 0.0
+
+
+def interpolate(previous: float, current: float, alpha: float) -> float:
+    """Rendered position between two simulated ones."""
+    return previous + (current - previous) * alpha
@@ -164,3 +164,14 @@ class ValidationEngine:
         if found:
             return [str(m) for m in moves]
         return None
+
+    @staticmethod
+    def verify_solution(initial_state: GridState, moves: List, max_moves: Optional[int] = None) -> bool:
+        """
+        Check a stored solution by replaying it (see TetracoinSolver.verify).
+        With `max_moves`, no shorter solution of up to `max_moves` moves may exist.
+        """
+        result = TetracoinSolver.verify(initial_state, moves, max_depth=max_moves)
+        if max_moves is None or not result.valid:
+            return result.valid
+        return result.optimal is not False and result.depth_checked >= min(max_moves, len(moves) - 1)
@@ -0,0 +1,147 @@
+"""
+Tetracoin Visited Stores.
+Interchangeable visited sets for the BFS solvers, selected per call with
+TetracoinSolver.solve_bfs(..., visited_store=..., memory_mb=...):
+
+- "exact": StateSet, in memory. Under a memory budget the search gives up
+  (UNKNOWN) once the set would outgrow it.
+- "bloom": fixed-size Bloom filter over Zobrist hashes. It never grows, but
+  a false positive hides an unvisited state, so an exhausted search only
+  means "probably unsolvable" (SolveResult.approximate). Meant for quick
+  rejection of candidate levels during generation.
+- "disk": sqlite table in a temporary file, with the page cache bounded by
+  the budget, for exhaustive proofs larger than memory.
+
+Every store exposes add(key, state) -> bool (True if the state is new),
+__len__, close() and `lossy` / `max_entries` attributes.
+"""
+import os
+import sqlite3
+import sys
+import tempfile
+from typing import Optional
+
+from src.tetracoin.solver_state import PackedLevel, PackedState, _timed
+from src.tetracoin.solver_stats import SolverStats
+
+VISITED_STORES = ("exact", "bloom", "disk")
+MB = 1 << 20
+
+# Defaults when no budget is given (the exact store is then unbounded)
+DEFAULT_BLOOM_MB = 16
+DEFAULT_DISK_CACHE_MB = 64
+
+BLOOM_HASHES = 4  # Bit probes per state
+
+
+class BloomStateSet:
+    """
+    Bloom filter keyed by Zobrist hashes (double hashing over the two 32-bit
+    halves). States are never stored; add() can wrongly report a new state
+    as seen, never the reverse. Interchangeable movables share Zobrist keys,
+    so symmetric states are merged like in StateSet.
+    """
+    lossy = True
+    max_entries = None
+
+    def __init__(self, memory_mb: float = DEFAULT_BLOOM_MB, stats: Optional[SolverStats] = None):
+        self.num_bits = max(64, int(memory_mb * MB) * 8)
+        self._bits = bytearray(self.num_bits // 8 + 1)
+        self._count = 0
+        if stats is not None:
+            self.add = _timed(stats, self.add)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __sizeof__(self) -> int:
+        return object.__sizeof__(self) + sys.getsizeof(self._bits)
+
+    def add(self, key: int, state: PackedState) -> bool:
+        bits = self._bits
+        num_bits = self.num_bits
+        h1 = key & 0xFFFFFFFF
+        h2 = (key >> 32) | 1
+        new = False
+        for i in range(BLOOM_HASHES):
+            bit = (h1 + i * h2) % num_bits
+            byte, mask = bit >> 3, 1 << (bit & 7)
+            if not bits[byte] & mask:
+                bits[byte] |= mask
+                new = True
+        if new:
+            self._count += 1
+        return new
+
+    @property
+    def fill_ratio(self) -> float:
+        """Share of bits set; false positives grow with its BLOOM_HASHES-th power."""
+        return int.from_bytes(self._bits, "little").bit_count() / self.num_bits
+
+    def close(self) -> None:
+        pass
+
+
+class DiskStateSet:
+    """
+    Exact visited set in a temporary sqlite database, keyed by
+    (Zobrist hash, canonical state). Memory use is the sqlite page cache,
+    capped at `cache_mb`; the file is deleted by close().
+    """
+    lossy = False
+    max_entries = None
+
+    def __init__(self, canonical=None, cache_mb: float = DEFAULT_DISK_CACHE_MB,
+                 stats: Optional[SolverStats] = None, directory: Optional[str] = None):
+        self._canonical = canonical
+        fd, self.path = tempfile.mkstemp(prefix="tetracoin-visited-", suffix=".sqlite", dir=directory)
+        os.close(fd)
+        self._db = sqlite3.connect(self.path, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=OFF")
+        self._db.execute("PRAGMA synchronous=OFF")
+        self._db.execute(f"PRAGMA cache_size=-{max(1, int(cache_mb * 1024))}")
+        self._db.execute("CREATE TABLE visited (hash INTEGER, state BLOB, PRIMARY KEY (hash, state)) WITHOUT ROWID")
+        self._db.execute("BEGIN")
+        self._insert = "INSERT OR IGNORE INTO visited VALUES (?, ?)"
+        self._count = 0
+        if stats is not None:
+            self.add = _timed(stats, self.add)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def add(self, key: int, state: PackedState) -> bool:
+        if self._canonical is not None:
+            state = self._canonical(state)
+        # sqlite integers are signed 64-bit
+        if self._db.execute(self._insert, (key - (1 << 63), state)).rowcount == 1:
+            self._count += 1
+            return True
+        return False
+
+    def close(self) -> None:
+        if self._db is None:
+            return
+        self._db.close()
+        self._db = None
+        os.remove(self.path)
+
+
+def make_visited_store(level: PackedLevel, kind: str = "exact", memory_mb: Optional[float] = None,
+                       entry_bytes: int = 0):
+    """
+    Build the visited store `kind` for a search over `level`. `memory_mb`
+    bounds the store: the Bloom filter size, the sqlite page cache, or the
+    entry count of the exact set (at `entry_bytes` per entry).
+    """
+    if kind == "exact":
+        store = level.state_set()
+        if memory_mb is not None:
+            store.max_entries = int(memory_mb * MB) // max(1, entry_bytes)
+        return store
+    if kind == "bloom":
+        return BloomStateSet(DEFAULT_BLOOM_MB if memory_mb is None else memory_mb, level.stats)
+    if kind == "disk":
+        return DiskStateSet(level.canonical if level.symmetric else None,
+                            DEFAULT_DISK_CACHE_MB if memory_mb is None else memory_mb, level.stats)
+    raise ValueError(f"Unknown visited store '{kind}', expected one of {list(VISITED_STORES)}")
@@ -1,11 +1,19 @@
 import unittest
 import sys
 import os
+import copy
+import random
 
 # Add project root to path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from src.tetracoin.spec import GridState, PhysicsEngine, EntityType, ColorType, Coin, PiggyBank, Obstacle
+from src.tetracoin.spec import (GridState, PhysicsEngine, Entity, EntityType, ColorType, ENTITY_CLASSES, Coin,
+                                PiggyBank, Obstacle, FixedBlock, Support, Deflector, Gateway, Trap,
+                                SleepingPhysics, EventKind, PhysicsEvent, EventBuffer)
+
+# Events of a red coin stack (c1 over c2) settling into piggybank p1 of capacity 1
+STACK_EVENTS = [PhysicsEvent(EventKind.COLLECT, 2, 3, 1, ColorType.RED),
+                PhysicsEvent(EventKind.PIGGYBANK_FULL, 0, 4, 1, ColorType.RED)]
 
 class TestTetracoinSpec(unittest.TestCase):
     def setUp(self):
@@ -16,6 +24,47 @@ class TestTetracoinSpec(unittest.TestCase):
         self.assertEqual(coin.type, EntityType.COIN)
         self.assertEqual(coin.color, ColorType.RED)
         
+    def test_entities_are_slotted(self):
+        piggy = PiggyBank(id="p1", row=4, col=1, color=ColorType.RED, capacity=2)
+        self.assertFalse(hasattr(piggy, "__dict__"))
+        with self.assertRaises(AttributeError):
+            piggy.label = "extra"
+
+    def test_dict_round_trip(self):
+        self.assertEqual(set(ENTITY_CLASSES), set(EntityType))
+        entities = [
+            Coin(id="c1", row=0, col=0, color=ColorType.RED, is_falling=True),
+            PiggyBank(id="p1", row=4, col=0, color=ColorType.RED, capacity=2, current_count=1),
+            Obstacle(id="o1", row=1, col=1, color=ColorType.GRAY),
+            FixedBlock(id="f1", row=1, col=2, color=ColorType.GRAY),
+            Support(id="s1", row=1, col=3, color=ColorType.GRAY),
+            Deflector(id="d1", row=2, col=1, color=ColorType.GRAY, direction="RIGHT"),
+            Gateway(id="g1", row=2, col=2, color=ColorType.GRAY, is_open=True, condition="SWITCH"),
+            Trap(id="t1", row=2, col=3, color=ColorType.GRAY, subtype="PIT"),
+        ]
+        for entity in entities:
+            data = entity.to_dict()
+            self.assertEqual((data["type"], data["color"]), (entity.type.value, entity.color.value))
+            self.assertEqual(Entity.from_dict(data), entity)
+        # Level JSON may leave optional keys out
+        piggy = Entity.from_dict({"id": "p2", "type": "PIGGYBANK", "color": "BLUE", "row": 4, "col": 1})
+        self.assertEqual((type(piggy), piggy.capacity), (PiggyBank, 5))
+        with self.assertRaises(ValueError):
+            Entity.from_dict({"id": "x", "type": "LASER", "color": "RED", "row": 0, "col": 0})
+
+    def test_clone(self):
+        import pickle
+        coin = Coin(id="c1", row=0, col=0, color=ColorType.RED)
+        self.state.entities.append(coin)
+        self.state.get_entity_at(0, 0)  # Build the index
+        clone = coin.clone()
+        self.assertEqual(clone, coin)
+        clone.row = 3
+        self.assertEqual(coin.row, 0)
+        self.assertIs(self.state.get_entity_at(0, 0), coin)
+        self.assertEqual(copy.copy(coin), coin)
+        self.assertEqual(pickle.loads(pickle.dumps(coin)), coin)
+
     def test_grid_occupancy(self):
         coin = Coin(id="c1", row=2, col=2, color=ColorType.RED)
         self.state.entities.append(coin)
@@ -66,7 +115,7 @@ class TestTetracoinSpec(unittest.TestCase):
         # Coin should be collected
         self.assertTrue(coin.is_collected)
         self.assertEqual(piggy.current_count, 1)
-        self.assertIn("COLLECT_RED", events)
+        self.assertIn(PhysicsEvent(EventKind.COLLECT, 0, 0, 0, ColorType.RED), events)
 
     def test_piggybank_mismatch(self):
         # Red Coin above Blue PiggyBank
@@ -84,5 +133,220 @@ class TestTetracoinSpec(unittest.TestCase):
         self.assertEqual(piggy.current_count, 0)
         self.assertFalse(coin.is_falling)
 
+    def test_settle_dirty_columns(self):
+        # Two coins in different columns; only column 0 is marked dirty
+        c1 = Coin(id="c1", row=0, col=0, color=ColorType.RED)
+        c2 = Coin(id="c2", row=0, col=3, color=ColorType.RED)
+        self.state.entities.extend([c1, c2])
+
+        PhysicsEngine.settle(self.state, {0})
+
+        self.assertEqual(c1.row, 4)
+        self.assertEqual(c2.row, 0)
+
+    def test_settle_matches_update(self):
+        # Stack falling into a piggybank with capacity for one coin
+        piggy = PiggyBank(id="p1", row=4, col=1, color=ColorType.RED, capacity=1)
+        c1 = Coin(id="c1", row=0, col=1, color=ColorType.RED)
+        c2 = Coin(id="c2", row=2, col=1, color=ColorType.RED)
+        self.state.entities.extend([piggy, c1, c2])
+
+        events = PhysicsEngine.settle(self.state)
+
+        self.assertTrue(c2.is_collected)
+        self.assertEqual(c1.row, 3)
+        self.assertEqual(piggy.current_count, 1)
+        self.assertEqual(events, STACK_EVENTS)
+
+def random_grid(rng: random.Random) -> GridState:
+    """Coins over piggybanks and assorted blockers, at most one entity per cell."""
+    state = GridState(rows=rng.randint(3, 12), cols=rng.randint(1, 6))
+    colors = [ColorType.RED, ColorType.BLUE]
+    kinds = [Coin, Coin, Coin, PiggyBank, Obstacle, FixedBlock, Support, Deflector]
+    for row in range(state.rows):
+        for col in range(state.cols):
+            if rng.random() > 0.45:
+                continue
+            kind = PiggyBank if row == state.rows - 1 and rng.random() < 0.7 else rng.choice(kinds)
+            entity_id = f"e{row}_{col}"
+            if kind is Coin:
+                entity = Coin(id=entity_id, row=row, col=col, color=rng.choice(colors), is_falling=rng.random() < 0.5)
+            elif kind is PiggyBank:
+                entity = PiggyBank(id=entity_id, row=row, col=col, color=rng.choice(colors),
+                                   capacity=rng.randint(1, 3), current_count=rng.randint(0, 1))
+            else:
+                entity = kind(id=entity_id, row=row, col=col, color=ColorType.GRAY)
+            state.entities.append(entity)
+    return state
+
+class TestDropEquivalence(unittest.TestCase):
+    """PhysicsEngine.drop must end exactly where settle's ticks do."""
+
+    def test_drop_matches_settle(self):
+        rng = random.Random(20)
+        for case in range(500):
+            ticked = random_grid(rng)
+            dropped = copy.deepcopy(ticked)
+            columns = None if case % 2 else set(rng.sample(range(ticked.cols), rng.randint(0, ticked.cols)))
+
+            ticked_events = PhysicsEngine.settle(ticked, columns, max_ticks=ticked.rows + 2)
+            dropped_events = PhysicsEngine.drop(dropped, columns)
+
+            self.assertEqual([e.to_dict() for e in dropped.entities], [e.to_dict() for e in ticked.entities], case)
+            self.assertEqual(sorted(dropped_events), sorted(ticked_events), case)
+
+    def test_drop_events(self):
+        state = GridState(rows=5, cols=5)
+        piggy = PiggyBank(id="p1", row=4, col=1, color=ColorType.RED, capacity=1)
+        c1 = Coin(id="c1", row=0, col=1, color=ColorType.RED)
+        c2 = Coin(id="c2", row=2, col=1, color=ColorType.RED)
+        state.entities.extend([piggy, c1, c2])
+
+        events = PhysicsEngine.drop(state)
+
+        self.assertEqual((c2.is_collected, c2.is_falling), (True, True))
+        self.assertEqual((c1.row, c1.is_falling), (3, False))
+        self.assertEqual(events, STACK_EVENTS)
+
+class TestSleepingPhysics(unittest.TestCase):
+    """SleepingPhysics.step must leave the grid exactly as PhysicsEngine.update does."""
+
+    def test_step_matches_update(self):
+        rng = random.Random(23)
+        for case in range(100):
+            reference = random_grid(rng)
+            state = copy.deepcopy(reference)
+            physics = SleepingPhysics(state)
+            for tick in range(3 * reference.rows):
+                if tick % 4 == 3:
+                    self._random_move(rng, reference, state, physics)
+                _, expected = PhysicsEngine.update(reference)
+                events = physics.step()
+                self.assertEqual([e.to_dict() for e in state.entities], [e.to_dict() for e in reference.entities],
+                                 (case, tick))
+                self.assertEqual(sorted(events), sorted(expected), (case, tick))
+
+    def _random_move(self, rng, reference, state, physics):
+        """Play the same random player move on both grids."""
+        movable = [i for i, e in enumerate(state.entities)
+                   if e.type in (EntityType.OBSTACLE, EntityType.SUPPORT, EntityType.DEFLECTOR)]
+        rng.shuffle(movable)
+        for i in movable:
+            entity = state.entities[i]
+            dr, dc = rng.choice([(-1, 0), (1, 0), (0, -1), (0, 1)])
+            row, col = entity.row + dr, entity.col + dc
+            if state.is_empty(row, col):
+                from_row, from_col = entity.row, entity.col
+                entity.row, entity.col = row, col
+                reference.entities[i].row, reference.entities[i].col = row, col
+                physics.moved(entity, from_row, from_col)
+                return
+
+    def test_settled_grid_sleeps(self):
+        state = GridState(rows=5, cols=5)
+        piggy = PiggyBank(id="p1", row=4, col=1, color=ColorType.RED, capacity=1)
+        c1 = Coin(id="c1", row=0, col=1, color=ColorType.RED)
+        c2 = Coin(id="c2", row=2, col=1, color=ColorType.RED)
+        obs = Obstacle(id="o1", row=2, col=3, color=ColorType.GRAY)
+        c3 = Coin(id="c3", row=1, col=3, color=ColorType.BLUE)
+        state.entities.extend([piggy, c1, c2, obs, c3])
+        physics = SleepingPhysics(state)
+
+        events = []
+        while physics.is_awake:
+            events += physics.step()
+        self.assertEqual(events, STACK_EVENTS)
+        self.assertEqual(physics.step(), [])
+
+        # Moving the obstacle away wakes only the coin resting on it
+        obs.col = 4
+        physics.moved(obs, 2, 3)
+        self.assertEqual([e.id for e in physics.awake], ["c3"])
+        physics.step()
+        self.assertEqual(c3.row, 2)
+
+        gate = Gateway(id="g1", row=2, col=0, color=ColorType.PURPLE)
+        state.entities.append(gate)
+        physics.set_gateway_open(gate, True)
+        self.assertTrue(gate.is_open)
+
+    def test_event_subscribers(self):
+        state = GridState(rows=5, cols=5)
+        piggy = PiggyBank(id="p1", row=4, col=1, color=ColorType.RED, capacity=1)
+        c1 = Coin(id="c1", row=0, col=1, color=ColorType.RED)
+        c2 = Coin(id="c2", row=2, col=1, color=ColorType.RED)
+        state.entities.extend([piggy, c1, c2])
+        physics = SleepingPhysics(state)
+
+        received = []
+        physics.events.subscribe(EventKind.COLLECT, received.append)
+        physics.events.subscribe(EventKind.PIGGYBANK_FULL, received.append)
+        physics.events.subscribe(EventKind.PIGGYBANK_FULL,
+                                 lambda event: received.append(state.entities[event.entity].id))
+        while physics.is_awake:
+            # step() hands back the same buffer every tick
+            self.assertIs(physics.step(), physics.events)
+        self.assertEqual(received, STACK_EVENTS + ["p1"])
+
+        physics.events.unsubscribe(EventKind.COLLECT, received.append)
+        buffer = EventBuffer()
+        buffer.subscribe(EventKind.COLLECT, received.append)
+        PhysicsEngine.drop(GridState(rows=2, cols=1, entities=[Coin(id="c", row=0, col=0, color=ColorType.RED),
+                                                               PiggyBank(id="p", row=1, col=0, color=ColorType.RED)]),
+                           events=buffer)
+        buffer.dispatch()
+        self.assertEqual(received[-1], PhysicsEvent(EventKind.COLLECT, 0, 0, 0, ColorType.RED))
+
+class TestGridStateIndex(unittest.TestCase):
+    def setUp(self):
+        self.state = GridState(rows=5, cols=5)
+        self.coin = Coin(id="c1", row=0, col=0, color=ColorType.RED)
+        self.obs = Obstacle(id="o1", row=2, col=2, color=ColorType.GRAY)
+        self.state.entities.extend([self.coin, self.obs])
+
+    def test_index_follows_moves(self):
+        self.assertIs(self.state.get_entity_at(2, 2), self.obs)
+        self.obs.col = 3
+        self.assertIsNone(self.state.get_entity_at(2, 2))
+        self.assertIs(self.state.get_entity_at(2, 3), self.obs)
+        self.state.entities.verify_index()
+
+    def test_index_follows_collection(self):
+        self.assertIs(self.state.get_entity_at(0, 0), self.coin)
+        self.coin.is_collected = True
+        self.assertTrue(self.state.is_empty(0, 0))
+
+    def test_index_follows_list_changes(self):
+        self.assertFalse(self.state.is_empty(2, 2))
+        self.state.entities.remove(self.obs)
+        self.assertTrue(self.state.is_empty(2, 2))
+
+        other = Obstacle(id="o2", row=4, col=4, color=ColorType.GRAY)
+        self.state.entities.append(other)
+        self.assertIs(self.state.get_entity_at(4, 4), other)
+
+        self.state.entities = [e for e in self.state.entities if e is not other]
+        self.assertTrue(self.state.is_empty(4, 4))
+        self.assertIs(self.state.get_entity_at(0, 0), self.coin)
+
+    def test_copies_do_not_share_index(self):
+        import copy
+        self.state.get_entity_at(0, 0)
+        clone = copy.deepcopy(self.state)
+        clone_coin = clone.get_entity_at(0, 0)
+        clone_coin.row = 3
+
+        self.assertIs(self.state.get_entity_at(0, 0), self.coin)
+        self.assertIs(clone.get_entity_at(3, 0), clone_coin)
+        self.assertIsNone(clone.get_entity_at(0, 0))
+
+    def test_debug_mode_catches_stale_entries(self):
+        self.state.get_entity_at(0, 0)
+        # Bypass the change tracking to corrupt the index
+        object.__setattr__(self.coin, "row", 1)
+        self.state.debug_index = True
+        with self.assertRaises(RuntimeError):
+            self.state.get_entity_at(1, 0)
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,24 @@
+"""Small hand-built grids shared by the solver test modules."""
+
+from src.tetracoin.spec import GridState, ColorType, PiggyBank, Coin, Obstacle, Support
+
+
+def two_column_puzzle(cols=5, second_column=True):
+    """Two stacked blockers under a coin plus a second blocked coin.
+
+    Column 2 alone needs two moves; with the second column it needs three.
+    """
+    grid = GridState(rows=10, cols=cols)
+    grid.entities.extend([
+        PiggyBank(id="p1", row=9, col=2, color=ColorType.RED),
+        Coin(id="c1", row=3, col=2, color=ColorType.RED),
+        Obstacle(id="obs1", row=5, col=2, color=ColorType.GRAY),
+        Support(id="s1", row=7, col=2, color=ColorType.GRAY),
+    ])
+    if second_column:
+        grid.entities.extend([
+            PiggyBank(id="p2", row=9, col=4, color=ColorType.BLUE),
+            Coin(id="c2", row=6, col=4, color=ColorType.BLUE),
+            Obstacle(id="obs2", row=8, col=4, color=ColorType.GRAY),
+        ])
+    return grid
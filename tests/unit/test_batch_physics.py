@@ -0,0 +1,87 @@
+import unittest
+import sys
+import os
+import copy
+import random
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from src.tetracoin.batch_physics import BatchPhysics, np
+from src.tetracoin.spec import (GridState, PhysicsEngine, ColorType, Coin, PiggyBank, Obstacle, FixedBlock,
+                                Support, Deflector)
+
+def random_grid(rng: random.Random, rows: int, cols: int) -> GridState:
+    grid = GridState(rows=rows, cols=cols)
+    colors = [ColorType.RED, ColorType.BLUE]
+    for row in range(rows):
+        for col in range(cols):
+            roll = rng.random()
+            entity_id = f"e{row}_{col}"
+            if row == rows - 1 and roll < 0.6 or roll < 0.05:
+                grid.entities.append(PiggyBank(id=entity_id, row=row, col=col, color=rng.choice(colors),
+                                               capacity=rng.randint(1, 3), current_count=rng.randint(0, 1)))
+            elif roll < 0.3:
+                grid.entities.append(Coin(id=entity_id, row=row, col=col, color=rng.choice(colors),
+                                          is_falling=rng.random() < 0.5))
+            elif roll < 0.4:
+                kind = rng.choice([Obstacle, FixedBlock, Support, Deflector])
+                grid.entities.append(kind(id=entity_id, row=row, col=col, color=ColorType.GRAY))
+    return grid
+
+@unittest.skipIf(np is None, "numpy not installed")
+class TestBatchPhysics(unittest.TestCase):
+
+    def setUp(self):
+        rng = random.Random(21)
+        self.grids = [random_grid(rng, 9, 5) for _ in range(200)]
+
+    def assertSameGrids(self, actual, expected):
+        for n, (a, e) in enumerate(zip(actual, expected)):
+            self.assertEqual([x.to_dict() for x in a.entities], [x.to_dict() for x in e.entities], n)
+
+    def test_settle_matches_physics_engine(self):
+        expected = copy.deepcopy(self.grids)
+        for grid in expected:
+            PhysicsEngine.settle(grid)
+
+        batch = BatchPhysics.from_grids(self.grids)
+        ticks = batch.settle()
+        batch.write_back(self.grids)
+        self.assertSameGrids(self.grids, expected)
+        self.assertTrue((ticks >= 1).all())
+        self.assertEqual(batch.won.tolist(),
+                         [all(e.is_collected for e in g.entities if e.type == "COIN") for g in expected])
+
+    def test_update_matches_ticks(self):
+        expected = copy.deepcopy(self.grids[:20])
+        grids = copy.deepcopy(self.grids[:20])
+        batch = BatchPhysics.from_grids(grids)
+        for _ in range(4):
+            for grid in expected:
+                PhysicsEngine.update(grid)
+            batch.update()
+            batch.write_back(grids)
+            self.assertSameGrids(grids, expected)
+
+    def test_stack_into_small_piggybank(self):
+        grid = GridState(rows=5, cols=5)
+        piggy = PiggyBank(id="p1", row=4, col=1, color=ColorType.RED, capacity=1)
+        c1 = Coin(id="c1", row=0, col=1, color=ColorType.RED)
+        c2 = Coin(id="c2", row=2, col=1, color=ColorType.RED)
+        grid.entities.extend([piggy, c1, c2])
+
+        batch = BatchPhysics.from_grids([grid])
+        self.assertEqual(batch.settle().tolist(), [4])
+        batch.write_back([grid])
+        self.assertTrue(c2.is_collected)
+        self.assertEqual((c1.row, c1.is_falling), (3, False))
+        self.assertEqual(piggy.current_count, 1)
+        self.assertEqual(batch.coins_left.tolist(), [1])
+
+    def test_mixed_sizes_rejected(self):
+        with self.assertRaises(ValueError):
+            BatchPhysics.from_grids([GridState(rows=5, cols=5), GridState(rows=6, cols=5)])
+
+if __name__ == '__main__':
+    unittest.main()
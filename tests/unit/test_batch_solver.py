@@ -0,0 +1,67 @@
+import unittest
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from src.tetracoin.solver import TetracoinSolver, SolveStatus
+from src.tetracoin.solver_state import zobrist_rows
+from src.tetracoin.solver_stats import BatchSolveStats
+from src.tetracoin.spec import GridState, ColorType, PiggyBank, Coin, Obstacle, FixedBlock
+
+class TestBatchSolver(unittest.TestCase):
+
+    def setUp(self):
+        # One-, two- and three-move puzzles plus an unsolvable one, twice
+        self.grids = []
+        for _ in range(2):
+            for blockers in range(1, 4):
+                grid = GridState(rows=10, cols=5)
+                grid.entities.append(PiggyBank(id="p1", row=9, col=2, color=ColorType.RED))
+                grid.entities.append(Coin(id="c1", row=1, col=2, color=ColorType.RED))
+                for k in range(blockers):
+                    grid.entities.append(Obstacle(id=f"obs{k}", row=3 + 2 * k, col=2, color=ColorType.GRAY))
+                self.grids.append(grid)
+            grid = GridState(rows=10, cols=5)
+            grid.entities.extend([
+                PiggyBank(id="p1", row=9, col=2, color=ColorType.RED),
+                Coin(id="c1", row=5, col=2, color=ColorType.RED),
+                FixedBlock(id="fix1", row=7, col=2, color=ColorType.GRAY),
+            ])
+            self.grids.append(grid)
+
+    def test_matches_single_solves(self):
+        expected = [TetracoinSolver.solve(grid, max_depth=6) for grid in self.grids]
+        stats = BatchSolveStats()
+        results = list(TetracoinSolver.solve_many(iter(self.grids), max_depth=6, batch_stats=stats))
+        self.assertEqual([i for i, _ in results], list(range(len(self.grids))))
+        self.assertEqual([(r.status, r.moves) for _, r in results], [(r.status, r.moves) for r in expected])
+        self.assertEqual((stats.grids, stats.solved, stats.unsolvable, stats.unknown), (8, 6, 2, 0))
+        self.assertGreater(stats.grids_per_second, 0.0)
+
+    def test_workers(self):
+        expected = [TetracoinSolver.solve(grid, max_depth=6).moves for grid in self.grids]
+        ordered = list(TetracoinSolver.solve_many(self.grids, max_depth=6, workers=2))
+        self.assertEqual([r.moves for _, r in ordered], expected)
+
+        stats = BatchSolveStats()
+        unordered = dict(TetracoinSolver.solve_many(self.grids, max_depth=6, workers=2, ordered=False,
+                                                    batch_stats=stats, collect_stats=True))
+        self.assertEqual([unordered[i].moves for i in range(len(self.grids))], expected)
+        self.assertEqual((stats.grids, stats.workers), (8, 2))
+        self.assertIsNotNone(unordered[0].stats)
+
+    def test_early_exit(self):
+        results = TetracoinSolver.solve_many(self.grids, max_depth=6, workers=2)
+        index, result = next(results)
+        self.assertEqual((index, result.status), (0, SolveStatus.SOLVED))
+        results.close()
+
+    def test_shared_zobrist_rows(self):
+        rows = zobrist_rows(51, 3)
+        self.assertIs(zobrist_rows(51, 2)[1], rows[1])
+        self.assertEqual(len(rows[0]), 51)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -8,6 +8,7 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../.
 from src.tetracoin.difficulty import TetracoinDifficultyAnalyzer, DifficultyMetrics, DifficultyTier
 from src.tetracoin.spec import GridState, EntityType, ColorType, Coin, Obstacle
 from src.tetracoin.solver import Move
+from src.tetracoin.solver_stats import SolutionSpace
 
 class TestTetracoinDifficulty(unittest.TestCase):
     
@@ -42,6 +43,27 @@ class TestTetracoinDifficulty(unittest.TestCase):
         # All movable are 2. Used "obs1". "obs2" unused. Deception should be 1.
         self.assertEqual(metrics.deception, 1)
         
+    def test_solution_space_metrics(self):
+        """Measured branching and dead ends replace the routing estimate."""
+        obs1 = Obstacle(id="obs1", row=1, col=1, color=ColorType.GRAY)
+        obs2 = Obstacle(id="obs2", row=1, col=2, color=ColorType.GRAY)
+        self.grid.entities.extend([obs1, obs2])
+        path = [Move("obs1", "LEFT"), Move("obs1", "RIGHT")]
+
+        # 16 * 8 move sequences of length 2, one of them optimal: 7 bits
+        single = SolutionSpace(optimal_solutions=1, path_branching=[16, 8], dead_end_ratio=0.3, complete=True)
+        metrics = TetracoinDifficultyAnalyzer._measure(self.grid, path, single)
+        self.assertEqual(metrics.routing, 7)
+        self.assertEqual(metrics.deception, 1 + 3)
+
+        # Four ways through give away two bits
+        several = SolutionSpace(optimal_solutions=4, path_branching=[16, 8], complete=True)
+        self.assertEqual(TetracoinDifficultyAnalyzer._measure(self.grid, path, several).routing, 5)
+
+        report = TetracoinDifficultyAnalyzer.analyze(self.grid, path, single)
+        self.assertIs(report.space, single)
+        self.assertGreater(report.score, TetracoinDifficultyAnalyzer.analyze(self.grid, path, several).score)
+
     def test_tier_mapping(self):
         """Test score to tier mapping."""
         # Fake metrics that should result in EASY
@@ -0,0 +1,68 @@
+import unittest
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+import src.tetracoin.parallel_solver as parallel_solver
+from src.tetracoin.solver import TetracoinSolver, SolveStatus
+from src.tetracoin.solver_stats import SolutionSpace, SolverStats
+from src.tetracoin.spec import GridState, ColorType, PiggyBank, Coin, Obstacle, Support, Deflector
+
+class TestParallelSolver(unittest.TestCase):
+
+    def setUp(self):
+        # Send every layer to the pool, however small
+        self._min_layer = parallel_solver.MIN_PARALLEL_LAYER
+        parallel_solver.MIN_PARALLEL_LAYER = 1
+
+        self.grid = GridState(rows=8, cols=6)
+        self.grid.entities.extend([
+            PiggyBank(id="p1", row=7, col=1, color=ColorType.RED, capacity=2),
+            PiggyBank(id="p2", row=7, col=4, color=ColorType.BLUE, capacity=1),
+            Coin(id="c1", row=0, col=1, color=ColorType.RED),
+            Coin(id="c2", row=1, col=1, color=ColorType.RED),
+            Coin(id="c3", row=0, col=4, color=ColorType.BLUE),
+            Obstacle(id="obs1", row=3, col=1, color=ColorType.GRAY),
+            Support(id="s1", row=5, col=1, color=ColorType.GRAY),
+            Deflector(id="d1", row=2, col=4, color=ColorType.GRAY),
+            Obstacle(id="obs2", row=5, col=4, color=ColorType.GRAY),
+        ])
+
+    def tearDown(self):
+        parallel_solver.MIN_PARALLEL_LAYER = self._min_layer
+
+    @staticmethod
+    def _key(result):
+        return (result.status, result.moves, result.nodes_explored, result.depth_proven, result.pruned)
+
+    def test_matches_serial(self):
+        serial_stats, parallel_stats = SolverStats(), SolverStats()
+        serial = TetracoinSolver.solve_bfs(self.grid, max_depth=10, stats=serial_stats)
+        parallel = TetracoinSolver.solve_bfs(self.grid, max_depth=10, stats=parallel_stats, workers=2)
+        self.assertEqual(serial.status, SolveStatus.SOLVED)
+        self.assertEqual(self._key(parallel), self._key(serial))
+        self.assertEqual(parallel_stats.nodes_generated, serial_stats.nodes_generated)
+        self.assertEqual(parallel_stats.frontier_by_depth, serial_stats.frontier_by_depth)
+
+    def test_node_budget_matches_serial(self):
+        serial = TetracoinSolver.solve_bfs(self.grid, max_depth=10, max_nodes=5)
+        parallel = TetracoinSolver.solve_bfs(self.grid, max_depth=10, max_nodes=5, workers=2)
+        self.assertEqual(serial.status, SolveStatus.UNKNOWN)
+        self.assertEqual(self._key(parallel), self._key(serial))
+
+    def test_solution_space_matches_serial(self):
+        serial_space, parallel_space = SolutionSpace(), SolutionSpace()
+        serial = TetracoinSolver.solve_bfs(self.grid, max_depth=10, solution_space=serial_space)
+        parallel = TetracoinSolver.solve_bfs(self.grid, max_depth=10, solution_space=parallel_space, workers=2)
+        self.assertEqual(self._key(parallel), self._key(serial))
+        self.assertTrue(serial_space.complete)
+        self.assertEqual(parallel_space, serial_space)
+
+    def test_only_bfs_is_parallel(self):
+        with self.assertRaises(ValueError):
+            TetracoinSolver.solve(self.grid, engine="astar", workers=2)
+
+if __name__ == '__main__':
+    unittest.main()
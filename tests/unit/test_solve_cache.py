@@ -0,0 +1,136 @@
+import unittest
+import sys
+import os
+import tempfile
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from src.tetracoin.solver import TetracoinSolver, SolveStatus
+from src.tetracoin.solver_stats import SolutionSpace, SolverStats
+from src.tetracoin.solve_cache import SolveCache, grid_fingerprint
+from src.tetracoin.spec import GridState, ColorType, PiggyBank, Coin, Obstacle, Support
+from tests.unit.puzzles import two_column_puzzle
+
+class TestSolveCache(unittest.TestCase):
+
+    def setUp(self):
+        self.grid = two_column_puzzle(second_column=False)
+
+    def test_fingerprint(self):
+        reference = grid_fingerprint(self.grid)
+        # Entity order and coins still falling do not matter
+        shuffled = GridState(rows=10, cols=5, entities=list(reversed(self.grid.entities)))
+        shuffled.entities[-2] = Coin(id="c1", row=1, col=2, color=ColorType.RED)
+        self.assertEqual(grid_fingerprint(shuffled), reference)
+
+        moved = GridState(rows=10, cols=5, entities=list(self.grid.entities))
+        moved.entities[2] = Obstacle(id="obs1", row=6, col=2, color=ColorType.GRAY)
+        self.assertNotEqual(grid_fingerprint(moved), reference)
+        renamed = GridState(rows=10, cols=5, entities=list(self.grid.entities))
+        renamed.entities[3] = Support(id="s2", row=7, col=2, color=ColorType.GRAY)
+        self.assertNotEqual(grid_fingerprint(renamed), reference)
+
+    def test_fingerprint_swapped_piggybanks(self):
+        def grid(red_col, blue_col):
+            g = GridState(rows=4, cols=2)
+            g.entities.extend([
+                PiggyBank(id="pa", row=3, col=red_col, color=ColorType.RED),
+                PiggyBank(id="pb", row=3, col=blue_col, color=ColorType.BLUE),
+                Coin(id="c1", row=0, col=0, color=ColorType.RED),
+                Obstacle(id="obs1", row=2, col=0, color=ColorType.GRAY),
+            ])
+            return g
+
+        solvable, unsolvable = grid(0, 1), grid(1, 0)
+        self.assertNotEqual(grid_fingerprint(solvable), grid_fingerprint(unsolvable))
+        cache = SolveCache()
+        self.assertEqual(cache.solve(solvable, max_depth=4).status, SolveStatus.SOLVED)
+        self.assertEqual(cache.solve(unsolvable, max_depth=4).status, SolveStatus.UNSOLVABLE)
+        self.assertEqual(cache.hits, 0)
+
+    def test_hit_reuses_result(self):
+        cache = SolveCache()
+        first = TetracoinSolver.solve(self.grid, max_depth=8, stats=SolverStats(), cache=cache)
+        self.assertTrue(first.found)
+        self.assertFalse(first.cached)
+
+        stats = SolverStats()
+        again = TetracoinSolver.solve(self.grid, max_depth=12, stats=stats, cache=cache)
+        self.assertTrue(again.cached)
+        self.assertEqual((again.moves, again.nodes_explored), (first.moves, first.nodes_explored))
+        self.assertEqual(stats.nodes_expanded, first.stats.nodes_expanded)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+        # Too shallow for the cached solution, or another engine: searched again
+        self.assertFalse(TetracoinSolver.solve(self.grid, max_depth=1, cache=cache).cached)
+        self.assertFalse(TetracoinSolver.solve(self.grid, engine="astar", max_depth=8, cache=cache).cached)
+
+    def test_stats_requested_after_plain_solve(self):
+        cache = SolveCache()
+        cache.solve(self.grid, max_depth=8)
+        # Entries stored without stats cannot fill them in
+        stats = SolverStats()
+        result = cache.solve(self.grid, max_depth=8, stats=stats)
+        self.assertFalse(result.cached)
+        self.assertIs(result.stats, stats)
+        self.assertGreater(stats.nodes_expanded, 0)
+
+        again = SolverStats()
+        self.assertTrue(cache.solve(self.grid, max_depth=8, stats=again).cached)
+        self.assertEqual(again, stats)
+
+    def test_solution_space(self):
+        cache = SolveCache()
+        cache.solve(self.grid, max_depth=8)
+        # Entries solved without the measurements cannot answer for them
+        space = SolutionSpace()
+        self.assertFalse(cache.solve(self.grid, max_depth=8, solution_space=space).cached)
+        self.assertTrue(space.complete)
+
+        again = SolutionSpace()
+        result = cache.solve(self.grid, max_depth=8, solution_space=again)
+        self.assertTrue(result.cached)
+        self.assertEqual(again, space)
+
+        # Likewise for an UNSOLVABLE entry
+        cache.solve(self.grid, max_depth=1)
+        shallow = SolutionSpace()
+        self.assertFalse(cache.solve(self.grid, max_depth=1, solution_space=shallow).cached)
+        self.assertTrue(shallow.complete)
+        self.assertTrue(cache.solve(self.grid, max_depth=1, solution_space=SolutionSpace()).cached)
+
+    def test_unsolvable_depths(self):
+        cache = SolveCache()
+        self.assertEqual(cache.solve(self.grid, max_depth=1).status, SolveStatus.UNSOLVABLE)
+        self.assertTrue(cache.solve(self.grid, max_depth=1).cached)
+        self.assertTrue(cache.solve(self.grid, max_depth=3).found)
+
+    def test_unknown_not_cached(self):
+        cache = SolveCache()
+        self.assertEqual(cache.solve(self.grid, max_nodes=0).status, SolveStatus.UNKNOWN)
+        self.assertEqual(len(cache), 0)
+
+    def test_lru_eviction(self):
+        cache = SolveCache(max_entries=1)
+        cache.solve(self.grid)
+        cache.solve(self.grid, engine="astar")
+        self.assertEqual(len(cache), 1)
+        self.assertFalse(cache.solve(self.grid).cached)
+
+    def test_disk_tier(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "solves.sqlite")
+            cache = SolveCache(path=path)
+            expected = cache.solve(self.grid)
+            cache.close()
+
+            # A new process (or run) sees the result through the file
+            reopened = SolveCache(path=path)
+            result = reopened.solve(self.grid)
+            reopened.close()
+            self.assertTrue(result.cached)
+            self.assertEqual(result.moves, expected.moves)
+
+if __name__ == '__main__':
+    unittest.main()
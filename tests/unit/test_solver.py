@@ -6,8 +6,9 @@ import random
 # Add project root to path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 
-from src.tetracoin.solver import TetracoinSolver, GameState
+from src.tetracoin.solver import TetracoinSolver, GameState, SolveStatus
 from src.tetracoin.spec import GridState, EntityType, ColorType, PiggyBank, Coin, Obstacle
+from tests.unit.puzzles import two_column_puzzle
 
 class TestTetracoinSolver(unittest.TestCase):
     
@@ -55,5 +56,218 @@ class TestTetracoinSolver(unittest.TestCase):
         found, _, _ = TetracoinSolver.solve_bfs(self.grid, max_depth=5)
         self.assertFalse(found, "Should be unsolvable with FixedBlock")
 
+    def test_astar_matches_bfs_length(self):
+        self.grid = two_column_puzzle()
+        found_bfs, steps_bfs, _ = TetracoinSolver.solve_bfs(self.grid, max_depth=8)
+        found_astar, steps_astar, moves = TetracoinSolver.solve_astar(self.grid, max_depth=8)
+        found_ida, steps_ida, _ = TetracoinSolver.solve_idastar(self.grid, max_depth=8)
+
+        self.assertTrue(found_bfs)
+        self.assertEqual((found_astar, steps_astar), (True, steps_bfs))
+        self.assertEqual((found_ida, steps_ida), (True, steps_bfs))
+        self.assertEqual(len(moves), steps_bfs)
+
+    def test_lower_bound_is_admissible(self):
+        from src.tetracoin.solver_state import PackedLevel
+        self.grid = two_column_puzzle()
+        level = PackedLevel(self.grid)
+        start = level.settled(level.initial)
+        _, steps, _ = TetracoinSolver.solve_bfs(self.grid, max_depth=8)
+        self.assertLessEqual(level.lower_bound(start), steps)
+        self.assertEqual(level.lower_bound(start), 3)
+
+    def test_engines_report_unsolvable(self):
+        from src.tetracoin.spec import FixedBlock
+        self.grid.entities.append(Coin(id="c2", row=5, col=2, color=ColorType.RED))
+        self.grid.entities.append(FixedBlock(id="fix1", row=7, col=2, color=ColorType.GRAY))
+
+        for engine in ("astar", "idastar"):
+            found, _, _ = TetracoinSolver.solve(self.grid, engine=engine, max_depth=5)
+            self.assertFalse(found, engine)
+
+        # Dead from the start: proven without searching
+        result = TetracoinSolver.solve_bfs(self.grid, max_depth=5)
+        self.assertEqual((result.status, result.nodes_explored), (SolveStatus.UNSOLVABLE, 0))
+
+    def test_result_status(self):
+        self.grid = two_column_puzzle()
+        result = TetracoinSolver.solve(self.grid, engine="astar", max_depth=8)
+        self.assertEqual(result.status, SolveStatus.SOLVED)
+        found, steps, moves = result
+        self.assertEqual((found, steps), (True, len(moves)))
+
+        # Too shallow to reach the solution: proven within the bound
+        for engine in ("bfs", "astar", "idastar"):
+            result = TetracoinSolver.solve(self.grid, engine=engine, max_depth=2)
+            self.assertEqual(result.status, SolveStatus.UNSOLVABLE, engine)
+            self.assertEqual(result.depth_proven, 2)
+
+    def test_budget_exhaustion_is_unknown(self):
+        self.grid = two_column_puzzle()
+        for engine in ("bfs", "astar", "idastar"):
+            result = TetracoinSolver.solve(self.grid, engine=engine, max_depth=8, max_nodes=0)
+            self.assertEqual(result.status, SolveStatus.UNKNOWN, engine)
+            self.assertFalse(result.found)
+
+            result = TetracoinSolver.solve(self.grid, engine=engine, max_depth=8, timeout=0)
+            self.assertEqual(result.status, SolveStatus.UNKNOWN, engine)
+            self.assertLess(result.depth_proven, 4)
+
+    def test_dead_children_pruned(self):
+        from src.tetracoin.spec import FixedBlock
+        # Narrow shaft above p1: obs2 must leave sideways from row 7
+        self.grid.entities.append(Coin(id="c2", row=4, col=2, color=ColorType.RED))
+        self.grid.entities.append(Obstacle(id="obs1", row=5, col=2, color=ColorType.GRAY))
+        self.grid.entities.append(Obstacle(id="obs2", row=7, col=2, color=ColorType.GRAY))
+        self.grid.entities.append(FixedBlock(id="fix1", row=8, col=1, color=ColorType.GRAY))
+        self.grid.entities.append(FixedBlock(id="fix2", row=8, col=3, color=ColorType.GRAY))
+
+        for engine in ("bfs", "astar", "idastar"):
+            result = TetracoinSolver.solve(self.grid, engine=engine, max_depth=6)
+            self.assertEqual(result.steps, 2, engine)
+        result = TetracoinSolver.solve_bfs(self.grid, max_depth=6)
+        self.assertGreater(result.pruned, 0)
+
+    def test_symmetric_obstacles_keep_ids(self):
+        """Solutions name the concrete obstacle even when twins are merged."""
+        self.grid.entities.append(Coin(id="c1", row=5, col=2, color=ColorType.RED))
+        self.grid.entities.append(Obstacle(id="obs1", row=6, col=2, color=ColorType.GRAY))
+        self.grid.entities.append(Obstacle(id="obs2", row=6, col=3, color=ColorType.GRAY))
+        self.grid.entities.append(Obstacle(id="obs3", row=8, col=2, color=ColorType.GRAY))
+
+        for engine in ("bfs", "astar", "idastar"):
+            found, steps, moves = TetracoinSolver.solve(self.grid, engine=engine, max_depth=6)
+            self.assertTrue(found, engine)
+            state = GameState(self.grid)
+            for move in moves:
+                state = state.apply_move(move)
+            self.assertTrue(state.is_winning(), engine)
+
+    def test_macro_moves(self):
+        """Multi-cell slides count as one move but come back as single steps."""
+        from src.tetracoin.spec import FixedBlock, Support
+        self.grid.entities.append(Coin(id="c1", row=4, col=2, color=ColorType.RED))
+        self.grid.entities.append(Obstacle(id="obs1", row=5, col=2, color=ColorType.GRAY))
+        # s1 can only leave the column through row 6 or row 8: two steps
+        self.grid.entities.append(Support(id="s1", row=7, col=2, color=ColorType.GRAY))
+        self.grid.entities.append(FixedBlock(id="fix1", row=7, col=1, color=ColorType.GRAY))
+        self.grid.entities.append(FixedBlock(id="fix2", row=7, col=3, color=ColorType.GRAY))
+
+        found, _, _ = TetracoinSolver.solve_bfs(self.grid, max_depth=2)
+        self.assertFalse(found)
+        for engine in ("bfs", "astar", "idastar"):
+            found, steps, moves = TetracoinSolver.solve(self.grid, engine=engine, max_depth=2, macro_moves=True)
+            self.assertEqual((found, steps), (True, 3), engine)
+            state = GameState(self.grid)
+            for move in moves:
+                self.assertIn(move, state.get_valid_moves())
+                state = state.apply_move(move)
+            self.assertTrue(state.is_winning(), engine)
+
+    def test_beam_search(self):
+        self.grid = two_column_puzzle()
+        exact = TetracoinSolver.solve_bfs(self.grid, max_depth=8)
+        self.assertTrue(exact.proven_optimal)
+
+        # Wide enough to never cut a layer: as exact as BFS
+        wide = TetracoinSolver.solve(self.grid, engine="beam", max_depth=8, beam_width=1000)
+        self.assertEqual((wide.found, wide.steps, wide.proven_optimal), (True, exact.steps, True))
+
+        # Narrow beams still solve it, without the optimality guarantee
+        narrow = TetracoinSolver.solve_beam(self.grid, width=1, max_depth=8)
+        self.assertEqual((narrow.found, narrow.proven_optimal), (True, False))
+        blind = TetracoinSolver.solve_beam(self.grid, width=2, heuristic=lambda level, state: 0, max_depth=12)
+        self.assertTrue(blind.found)
+        self.assertGreater(blind.steps, exact.steps)
+        state = GameState(self.grid)
+        for move in blind.moves:
+            state = state.apply_move(move)
+        self.assertTrue(state.is_winning())
+
+    def test_beam_search_gives_up(self):
+        self.grid = two_column_puzzle()
+        # Too shallow: unsolvable only when no layer was cut
+        self.assertEqual(TetracoinSolver.solve_beam(self.grid, width=1000, max_depth=2).status,
+                         SolveStatus.UNSOLVABLE)
+        self.assertEqual(TetracoinSolver.solve_beam(self.grid, width=1, max_depth=2).status,
+                         SolveStatus.UNKNOWN)
+
+    def test_verify(self):
+        from src.tetracoin.solver import Move
+        self.grid = two_column_puzzle()
+        _, steps, moves = TetracoinSolver.solve_bfs(self.grid, max_depth=8)
+
+        self.assertTrue(TetracoinSolver.verify(self.grid, moves))
+        checked = TetracoinSolver.verify(self.grid, moves, max_depth=8)
+        self.assertEqual((checked.optimal, checked.depth_checked), (True, steps - 1))
+        # Bound too small to rule out every shorter length
+        self.assertIsNone(TetracoinSolver.verify(self.grid, moves, max_depth=1).optimal)
+
+        # A detour is still a solution, just not an optimal one
+        detour = [Move("s1", "LEFT"), Move("s1", "RIGHT")] + moves
+        self.assertTrue(TetracoinSolver.verify(self.grid, detour))
+        self.assertFalse(TetracoinSolver.verify(self.grid, detour, max_depth=8).optimal)
+
+        self.assertEqual(TetracoinSolver.verify(self.grid, moves[:-1]).failed_at, steps - 1)
+        blocked = [Move("obs1", "UP")] + moves  # c1 rests on obs1
+        self.assertEqual(TetracoinSolver.verify(self.grid, blocked).failed_at, 0)
+        self.assertEqual(TetracoinSolver.verify(self.grid, [Move("c1", "LEFT")]).failed_at, 0)
+
+    def test_solution_space(self):
+        from src.tetracoin.solver_stats import SolutionSpace
+        self.grid = two_column_puzzle()
+        plain = TetracoinSolver.solve_bfs(self.grid, max_depth=8)
+        space = SolutionSpace()
+        result = TetracoinSolver.solve(self.grid, max_depth=8, solution_space=space)
+        self.assertEqual(result.moves, plain.moves)
+        self.assertIs(result.solution_space, space)
+        # Commuting moves are counted in one order only
+        self.assertEqual((space.optimal_solutions, space.complete), (8, True))
+        self.assertEqual(space.path_branching, [8, 8, 9])
+        self.assertGreater(space.near_win_states, 0)
+
+        with self.assertRaises(ValueError):
+            TetracoinSolver.solve(self.grid, engine="astar", solution_space=SolutionSpace())
+
+    def test_solution_space_macro_branching(self):
+        from src.tetracoin.spec import FixedBlock, Support, Deflector
+        from src.tetracoin.solver import Move
+        from src.tetracoin.solver_stats import SolutionSpace
+        grid = GridState(rows=5, cols=3)
+        grid.entities.extend([
+            PiggyBank(id="p0", row=4, col=0, color=ColorType.RED, capacity=3),
+            PiggyBank(id="p1", row=4, col=1, color=ColorType.BLUE, capacity=3),
+            PiggyBank(id="p2", row=4, col=2, color=ColorType.RED, capacity=3),
+            Coin(id="c1", row=1, col=1, color=ColorType.BLUE),
+            Deflector(id="d1", row=1, col=0, color=ColorType.GRAY),
+            FixedBlock(id="fix1", row=3, col=0, color=ColorType.GRAY),
+            FixedBlock(id="fix2", row=0, col=1, color=ColorType.GRAY),
+            Support(id="s1", row=3, col=2, color=ColorType.GRAY),
+            Deflector(id="d2", row=3, col=1, color=ColorType.GRAY),
+        ])
+        space = SolutionSpace()
+        result = TetracoinSolver.solve_bfs(grid, max_depth=6, macro_moves=True, solution_space=space)
+        self.assertEqual(result.moves[0], Move("s1", "UP"))
+        # s1 may still slide after its quiet slide: the search skips those moves, the count does not
+        self.assertEqual(space.path_branching, [10, 10])
+
+    def test_solution_space_dead_ends(self):
+        from src.tetracoin.spec import FixedBlock
+        from src.tetracoin.solver_stats import SolutionSpace
+        self.grid.entities.append(Coin(id="c2", row=4, col=2, color=ColorType.RED))
+        self.grid.entities.append(Obstacle(id="obs1", row=5, col=2, color=ColorType.GRAY))
+        self.grid.entities.append(Obstacle(id="obs2", row=7, col=2, color=ColorType.GRAY))
+        self.grid.entities.append(FixedBlock(id="fix1", row=8, col=1, color=ColorType.GRAY))
+        self.grid.entities.append(FixedBlock(id="fix2", row=8, col=3, color=ColorType.GRAY))
+
+        space = SolutionSpace()
+        TetracoinSolver.solve_bfs(self.grid, max_depth=6, solution_space=space)
+        self.assertGreater(space.dead_end_ratio, 0.0)
+        self.assertEqual(len(space.path_branching), 2)
+
+    def test_unknown_engine(self):
+        with self.assertRaises(ValueError):
+            TetracoinSolver.solve(self.grid, engine="dfs")
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,248 @@
+import unittest
+import sys
+import os
+import random
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from src.tetracoin.solver import GameState, Move
+from src.tetracoin.solver_state import PackedLevel, StateSet, StateMap, SearchTree
+from src.tetracoin.spec import GridState, EntityType, ColorType, PiggyBank, Coin, Obstacle, Support, FixedBlock
+
+class TestPackedLevel(unittest.TestCase):
+
+    def setUp(self):
+        self.grid = GridState(rows=6, cols=4)
+        self.grid.entities.extend([
+            PiggyBank(id="p1", row=5, col=1, color=ColorType.RED, capacity=2),
+            Coin(id="c1", row=0, col=1, color=ColorType.RED),
+            Coin(id="c2", row=1, col=1, color=ColorType.RED),
+            Obstacle(id="obs1", row=3, col=1, color=ColorType.GRAY),
+            Support(id="s1", row=2, col=3, color=ColorType.GRAY),
+            FixedBlock(id="fix1", row=4, col=0, color=ColorType.GRAY),
+        ])
+
+    def test_state_is_compact(self):
+        """Nodes are a few bytes: one per coin, movable and piggybank."""
+        level = PackedLevel(self.grid)
+        self.assertIsInstance(level.initial, bytes)
+        self.assertEqual(len(level.initial), 2 + 2 + 1)
+
+    def test_settle_stacks_coins(self):
+        level = PackedLevel(self.grid)
+        grid = level.to_grid_state(level.settled(level.initial))
+        c1 = next(e for e in grid.entities if e.id == "c1")
+        c2 = next(e for e in grid.entities if e.id == "c2")
+        self.assertEqual((c2.row, c2.col), (2, 1))
+        self.assertEqual((c1.row, c1.col), (1, 1))
+
+    def test_successors_match_game_state(self):
+        """Every packed child equals the GameState.apply_move result."""
+        level = PackedLevel(self.grid)
+        start = level.settled(level.initial)
+        game_state = GameState(level.to_grid_state(start))
+
+        expected = game_state.get_valid_moves()
+        children = level.successors(start)
+        self.assertEqual([Move(*level.decode_move(code)) for code, _, _ in children], expected)
+
+        for (code, child, _), move in zip(children, expected):
+            reference = game_state.apply_move(move)
+            self.assertEqual(GameState(level.to_grid_state(child)).data, reference.data)
+
+    def test_collection_and_win(self):
+        level = PackedLevel(self.grid)
+        start = level.settled(level.initial)
+        # Sliding the obstacle away drops both coins into the piggybank
+        code, child = next((c, s) for c, s, _ in level.successors(start)
+                           if level.decode_move(c) == ("obs1", "LEFT"))
+        self.assertTrue(level.is_winning(child))
+        grid = level.to_grid_state(child)
+        piggy = next(e for e in grid.entities if e.type == EntityType.PIGGYBANK)
+        self.assertEqual(piggy.current_count, 2)
+
+    def test_incremental_zobrist(self):
+        """Hashes updated through moves and physics match a full rehash."""
+        level = PackedLevel(self.grid)
+        frontier = [level.settled(level.initial)]
+        seen = {frontier[0]}
+        while frontier:
+            state = frontier.pop()
+            for _, child, child_hash in level.successors(state, level.zobrist(state)):
+                self.assertEqual(child_hash, level.zobrist(child))
+                if child not in seen:
+                    seen.add(child)
+                    frontier.append(child)
+        self.assertGreater(len(seen), 10)
+
+    def test_state_set_collisions(self):
+        """States sharing a hash are still told apart."""
+        states = StateSet()
+        self.assertTrue(states.add(7, b"a"))
+        self.assertTrue(states.add(7, b"b"))
+        self.assertFalse(states.add(7, b"a"))
+        self.assertFalse(states.add(7, b"b"))
+        self.assertEqual(len(states), 2)
+        states.discard(7, b"a")
+        self.assertFalse(states.add(7, b"b"))
+        self.assertTrue(states.add(7, b"a"))
+
+        table = StateMap()
+        table.put(7, b"a", 1)
+        table.put(7, b"b", 2)
+        self.assertEqual((table.get(7, b"a"), table.get(7, b"b"), table.get(7, b"c")), (1, 2, None))
+
+    def test_dead_states(self):
+        level = PackedLevel(self.grid)
+        start = level.settled(level.initial)
+        self.assertFalse(level.is_dead(start))
+
+        # A coin on the floor of a column without a piggybank is lost
+        self.grid.entities.append(Coin(id="c3", row=5, col=3, color=ColorType.RED))
+        level = PackedLevel(self.grid)
+        self.assertTrue(level.is_dead(level.settled(level.initial)))
+
+    def test_dead_by_capacity(self):
+        # Three coins above a piggybank with room for two
+        self.grid.entities.append(Coin(id="c3", row=2, col=1, color=ColorType.RED))
+        level = PackedLevel(self.grid)
+        self.assertTrue(level.is_dead(level.settled(level.initial)))
+
+    def test_successors_prune_dead_children(self):
+        # Column 1 narrows to a one-cell shaft (row 5) above the piggybank
+        grid = GridState(rows=7, cols=3)
+        grid.entities.extend([
+            PiggyBank(id="p1", row=6, col=1, color=ColorType.RED, capacity=1),
+            FixedBlock(id="fix1", row=5, col=0, color=ColorType.GRAY),
+            FixedBlock(id="fix2", row=5, col=2, color=ColorType.GRAY),
+            Coin(id="c1", row=2, col=1, color=ColorType.RED),
+            Obstacle(id="obs1", row=3, col=1, color=ColorType.GRAY),
+            Obstacle(id="obs2", row=4, col=1, color=ColorType.GRAY),
+        ])
+        level = PackedLevel(grid)
+        start = level.settled(level.initial)
+        self.assertFalse(level.is_dead(start))
+
+        # Pushing obs2 into the shaft is fine while obs1 holds the coin up...
+        shaft = next(s for c, s, _ in level.successors(start) if level.decode_move(c) == ("obs2", "DOWN"))
+        self.assertEqual(level.pruned, 0)
+        # ...but once the coin lands on it, obs2 can never leave
+        moves = [level.decode_move(c) for c, _, _ in level.successors(shaft)]
+        self.assertNotIn(("obs1", "LEFT"), moves)
+        self.assertNotIn(("obs1", "RIGHT"), moves)
+        self.assertEqual(level.pruned, 2)
+
+    def test_interchangeable_movables(self):
+        """Swapping two identical obstacles gives the same state up to symmetry."""
+        self.grid.entities.append(Obstacle(id="obs2", row=0, col=3, color=ColorType.GRAY))
+        level = PackedLevel(self.grid)
+        state = level.settled(level.initial)
+        buf = level.unpack(state)
+        a, b = level.movable_offset, level.movable_offset + level.movable_ids.index("obs2")
+        buf[a], buf[b] = buf[b], buf[a]
+        swapped = level.pack(buf)
+
+        self.assertNotEqual(swapped, state)
+        self.assertEqual(level.canonical(swapped), level.canonical(state))
+        self.assertEqual(level.zobrist(swapped), level.zobrist(state))
+        visited = level.state_set()
+        self.assertTrue(visited.add(level.zobrist(state), state))
+        self.assertFalse(visited.add(level.zobrist(swapped), swapped))
+
+        # The support is not interchangeable with the obstacles
+        buf = level.unpack(state)
+        s1 = level.movable_offset + level.movable_ids.index("s1")
+        buf[a], buf[s1] = buf[s1], buf[a]
+        self.assertNotEqual(level.canonical(level.pack(buf)), level.canonical(state))
+
+    def test_skipped_moves_commute(self):
+        """A move skipped after `last` reaches the same child when played before it."""
+        self.grid.entities.append(Obstacle(id="obs2", row=0, col=3, color=ColorType.GRAY))
+        level = PackedLevel(self.grid)
+        start = level.settled(level.initial)
+        from_start = {c: s for c, s, _ in level.successors(start)}
+        skipped = 0
+        for last, state in from_start.items():
+            kept = {c for c, _, _ in level.successors(state, last_move=last)}
+            for code, child, _ in level.successors(state):
+                if code in kept:
+                    continue
+                skipped += 1
+                self.assertLess(code, len(level.movable_ids) * 4)
+                swapped = {c: s for c, s, _ in level.successors(from_start[code])}
+                self.assertEqual(swapped[last], child)
+        self.assertGreater(skipped, 0)
+        self.assertEqual(level.skipped, skipped)
+
+    def test_macro_moves(self):
+        level = PackedLevel(self.grid, macro_moves=True)
+        start = level.settled(level.initial)
+        children = {divmod(c >> 1, level.num_cells) for c, _, _ in level.successors(start)}
+        obs1, s1 = level.movable_ids.index("obs1"), level.movable_ids.index("s1")
+
+        # obs1 holds the coins up: single steps only
+        self.assertEqual(sorted(t for j, t in children if j == obs1),
+                         [level._cell(3, 0), level._cell(3, 2), level._cell(4, 1)])
+        # s1 can reach any cell of its empty region in one move
+        far = level._cell(5, 3)
+        self.assertIn((s1, far), children)
+        path = level.primitive_path(start, [(s1 * level.num_cells + far) * 2 + 1])
+        self.assertEqual([level.decode_move(c) for c in path], [("s1", "DOWN")] * 3)
+
+    def test_apply_matches_successors(self):
+        level = PackedLevel(self.grid)
+        start = level.settled(level.initial)
+        for code, child, _ in level.successors(start):
+            self.assertEqual(level.apply(start, code), child)
+            self.assertEqual(level.encode_move(*level.decode_move(code)), code)
+        # obs1 sits right under the coins: UP is blocked
+        self.assertIsNone(level.apply(start, level.encode_move("obs1", "UP")))
+        self.assertEqual(level.encode_move("c1", "UP"), -1)
+
+    def test_closed_form_settle_matches_ticks(self):
+        """settle() lands every coin where settle_ticked() does, hash included."""
+        rng = random.Random(20)
+        colors = [ColorType.RED, ColorType.BLUE]
+        for case in range(300):
+            grid = GridState(rows=rng.randint(3, 12), cols=rng.randint(1, 6))
+            for row in range(grid.rows):
+                for col in range(grid.cols):
+                    roll = rng.random()
+                    if roll < 0.25 or (row == grid.rows - 1 and roll < 0.6):
+                        grid.entities.append(PiggyBank(id=f"p{row}_{col}", row=row, col=col, color=rng.choice(colors),
+                                                       capacity=rng.randint(1, 3)) if row == grid.rows - 1 or roll < 0.05
+                                             else Coin(id=f"c{row}_{col}", row=row, col=col, color=rng.choice(colors)))
+                    elif roll < 0.4:
+                        kind = rng.choice([Obstacle, Support, FixedBlock])
+                        grid.entities.append(kind(id=f"b{row}_{col}", row=row, col=col, color=ColorType.GRAY))
+            level = PackedLevel(grid)
+            columns = None if case % 2 else rng.sample(range(grid.cols), rng.randint(0, grid.cols))
+
+            results = []
+            for settle in (level.settle, lambda b, o, c: level.settle_ticked(b, o, c, max_ticks=grid.rows + 2)):
+                buf = level.unpack(level.initial)
+                occ = level.occupancy(buf)
+                ticks, delta = settle(buf, occ, columns)
+                results.append((buf, occ, ticks, delta))
+            self.assertEqual(results[0], results[1], case)
+
+    def test_search_tree_paths(self):
+        tree = SearchTree(b"root", 0)
+        a = tree.add(b"a", 1, 0, 5)
+        b = tree.add(b"b", 2, a, 6)
+        c = tree.add(b"c", 3, b, 7)
+        self.assertEqual(tree.path(c), (5, 6, 7))
+        self.assertEqual(tree.depth[c], 3)
+        tree.reparent(c, a, 9, b"c2")
+        self.assertEqual((tree.path(c), tree.depth[c], tree.states[c]), ((5, 9), 2, b"c2"))
+        self.assertEqual(tree.path(0), ())
+
+    def test_input_grid_untouched(self):
+        level = PackedLevel(self.grid)
+        level.to_grid_state(level.settled(level.initial))
+        c1 = next(e for e in self.grid.entities if e.id == "c1")
+        self.assertEqual((c1.row, c1.col), (0, 1))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+import json
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from src.tetracoin.solver import TetracoinSolver
+from src.tetracoin.solver_stats import SolverStats
+from tests.unit.puzzles import two_column_puzzle
+
+class TestSolverStats(unittest.TestCase):
+
+    def setUp(self):
+        # Two blocked columns: needs three moves
+        self.grid = two_column_puzzle(cols=6)
+
+    def test_counters_consistent(self):
+        for engine in ("bfs", "astar", "idastar"):
+            stats = SolverStats()
+            result = TetracoinSolver.solve(self.grid, engine=engine, max_depth=8, stats=stats)
+            self.assertTrue(result.found, engine)
+            self.assertIs(result.stats, stats)
+            self.assertEqual(stats.engine, engine)
+            self.assertEqual(stats.nodes_expanded, result.nodes_explored)
+            self.assertEqual(stats.dead_states_pruned, result.pruned)
+            self.assertGreater(stats.nodes_generated, 0)
+            self.assertLessEqual(stats.duplicate_hits, stats.nodes_generated)
+            self.assertLessEqual(stats.mean_branching, stats.max_branching)
+            self.assertGreater(stats.physics_ticks, 0)
+            self.assertGreater(stats.peak_visited_bytes, 0)
+            self.assertIn(1, stats.frontier_by_depth)
+            self.assertGreater(stats.wall_time, 0.0)
+            self.assertLessEqual(stats.time_physics + stats.time_hashing + stats.time_move_generation,
+                                 stats.wall_time + 1e-3)
+
+    def test_bfs_frontier_is_visited_set(self):
+        stats = SolverStats()
+        TetracoinSolver.solve_bfs(self.grid, max_depth=8, stats=stats)
+        # Everything queued is in the visited set, plus the start state
+        self.assertEqual(sum(stats.frontier_by_depth.values()) + 1, stats.peak_visited)
+
+    def test_results_unchanged(self):
+        plain = TetracoinSolver.solve_bfs(self.grid, max_depth=8)
+        instrumented = TetracoinSolver.solve_bfs(self.grid, max_depth=8, stats=SolverStats())
+        self.assertIsNone(plain.stats)
+        self.assertEqual(plain.moves, instrumented.moves)
+
+    def test_to_dict_is_json(self):
+        stats = SolverStats()
+        TetracoinSolver.solve_astar(self.grid, max_depth=8, stats=stats)
+        data = json.loads(json.dumps(stats.to_dict()))
+        self.assertEqual(data["nodes_expanded"], stats.nodes_expanded)
+        self.assertIn("nodes_per_second", data)
+        self.assertIn("astar", stats.summary())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -7,6 +7,7 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../.
 
 from src.tetracoin.level_generator import TetracoinLevelGenerator
 from src.tetracoin.level_generator_spec import TetracoinGenerationConfig, DifficultyLevel, TetracoinLevel
+from src.tetracoin.solve_cache import SolveCache
 
 class TestTetracoinLevelGenerator(unittest.TestCase):
     def setUp(self):
@@ -61,6 +62,36 @@ class TestTetracoinLevelGenerator(unittest.TestCase):
         self.assertEqual(level.grid.cols, 6) # Easy width defined in spec
         self.assertEqual(level.grid.rows, 8) 
 
+    def test_solver_engine_from_config(self):
+        """The configured engine survives difficulty presets."""
+        config = TetracoinGenerationConfig(
+            grid_width=6, grid_height=6,
+            num_coins=2, num_piggybanks=1,
+            solver_engine="astar"
+        )
+        generator = TetracoinLevelGenerator(config=config, enable_auto_adjustment=False, max_generation_attempts=20)
+        self.assertEqual(generator.auto_adjuster.config.solver_engine, "astar")
+        level = generator.generate(difficulty_target=DifficultyLevel.EASY, return_metadata=False)
+        self.assertEqual(level.config.solver_engine, "astar")
+
+    def test_solver_stats_in_metadata(self):
+        # The same level already solved without stats (e.g. by the auto-adjuster)
+        cache = SolveCache()
+        plain_config = TetracoinGenerationConfig(grid_width=6, grid_height=6, num_coins=2, num_piggybanks=1,
+                                                 max_adjustment_iterations=2, collect_solver_stats=False)
+        TetracoinLevelGenerator(config=plain_config, enable_auto_adjustment=False, max_generation_attempts=20,
+                                solve_cache=cache).generate(difficulty_target=DifficultyLevel.EASY, seed=37)
+        generator = TetracoinLevelGenerator(config=self.config, enable_auto_adjustment=False,
+                                            max_generation_attempts=20, solve_cache=cache)
+
+        # Seeded: most EASY levels are already won before the first move
+        level, metadata = generator.generate(difficulty_target=DifficultyLevel.EASY, seed=37)
+        self.assertGreater(metadata.solution_length, 0)
+        self.assertIsNotNone(metadata.solver_stats)
+        self.assertEqual(metadata.solver_stats["engine"], "bfs")
+        self.assertGreater(metadata.solver_stats["nodes_expanded"], 0)
+        self.assertTrue(metadata.solver_stats["frontier_by_depth"])
+
     def test_legacy_wrappers(self):
         """Test legacy compatibility."""
         from src.tetracoin.legacy_generators import generate_drop_away_level
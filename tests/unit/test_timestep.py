@@ -0,0 +1,41 @@
+import unittest
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from src.tetracoin.timestep import FixedTimestep, interpolate
+
+class TestFixedTimestep(unittest.TestCase):
+
+    def test_ticks_independent_of_frame_rate(self):
+        """One second of play simulates the same ticks at any frame rate."""
+        for fps in (24, 30, 45, 60, 144):
+            clock = FixedTimestep.from_rate(60)
+            ticks = sum(clock.advance(1.0 / fps) for _ in range(fps))
+            self.assertIn(ticks, (59, 60), fps)
+
+    def test_catch_up(self):
+        clock = FixedTimestep.from_rate(60, max_steps=5)
+        # A 50 ms frame is three ticks late
+        self.assertEqual(clock.advance(0.05), 3)
+        # A two second stall runs max_steps and drops the rest
+        self.assertEqual(clock.advance(2.0), 5)
+        self.assertLess(clock.accumulator, clock.step)
+        self.assertEqual(clock.advance(0.0), 0)
+
+    def test_alpha(self):
+        clock = FixedTimestep(0.1)
+        self.assertEqual(clock.advance(0.25), 2)
+        self.assertAlmostEqual(clock.alpha, 0.5)
+        self.assertAlmostEqual(interpolate(3, 4, clock.alpha), 3.5)
+        clock.reset()
+        self.assertEqual(clock.alpha, 0.0)
+
+    def test_invalid_step(self):
+        with self.assertRaises(ValueError):
+            FixedTimestep(0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import unittest
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from src.tetracoin.solver import TetracoinSolver, SolveStatus
+from src.tetracoin.solver_state import PackedLevel
+from src.tetracoin.visited_stores import BloomStateSet, DiskStateSet, make_visited_store
+from tests.unit.puzzles import two_column_puzzle
+
+class TestVisitedStores(unittest.TestCase):
+
+    def setUp(self):
+        self.grid = two_column_puzzle()
+
+    def test_bloom_set(self):
+        store = BloomStateSet(memory_mb=0.01)
+        self.assertTrue(store.add(0x1234_5678_9ABC, b"a"))
+        self.assertFalse(store.add(0x1234_5678_9ABC, b"a"))
+        self.assertTrue(store.add(0x9999_0000_1111, b"b"))
+        self.assertEqual(len(store), 2)
+        self.assertGreater(store.fill_ratio, 0.0)
+
+    def test_disk_set(self):
+        store = DiskStateSet()
+        try:
+            self.assertTrue(store.add(7, b"a"))
+            self.assertTrue(store.add(7, b"b"))  # Hash collision, different state
+            self.assertFalse(store.add(7, b"a"))
+            self.assertTrue(store.add((1 << 64) - 1, b"c"))
+            self.assertEqual(len(store), 3)
+        finally:
+            store.close()
+        self.assertFalse(os.path.exists(store.path))
+
+    def test_factory(self):
+        level = PackedLevel(self.grid)
+        self.assertIsNone(make_visited_store(level).max_entries)
+        self.assertEqual(make_visited_store(level, "exact", memory_mb=1, entry_bytes=1024).max_entries, 1024)
+        with self.assertRaises(ValueError):
+            make_visited_store(level, "tape")
+
+    def test_stores_agree(self):
+        reference = TetracoinSolver.solve_bfs(self.grid, max_depth=8)
+        self.assertTrue(reference.found)
+        for store in ("bloom", "disk"):
+            result = TetracoinSolver.solve_bfs(self.grid, max_depth=8, visited_store=store)
+            self.assertEqual((result.moves, result.nodes_explored), (reference.moves, reference.nodes_explored), store)
+            self.assertFalse(result.approximate)
+
+    def test_memory_budget(self):
+        result = TetracoinSolver.solve_bfs(self.grid, max_depth=8, memory_mb=0.001)
+        self.assertEqual(result.status, SolveStatus.UNKNOWN)
+
+    def test_bloom_exhaustion_is_approximate(self):
+        result = TetracoinSolver.solve(self.grid, max_depth=2, visited_store="bloom")
+        self.assertEqual(result.status, SolveStatus.UNSOLVABLE)
+        self.assertTrue(result.approximate)
+        exact = TetracoinSolver.solve(self.grid, max_depth=2)
+        self.assertEqual(exact.status, SolveStatus.UNSOLVABLE)
+        self.assertFalse(exact.approximate)
+
+    def test_bfs_only(self):
+        with self.assertRaises(ValueError):
+            TetracoinSolver.solve(self.grid, engine="astar", visited_store="disk")
+
+if __name__ == '__main__':
+    unittest.main()
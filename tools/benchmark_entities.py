@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Benchmark the slotted entity model. Builds random grids holding every
+entity type and measures memory per grid, copy.deepcopy and clone() cost,
+and to_dict / from_dict throughput. The baseline is the previous layout:
+the same attributes in a per-instance __dict__, copied through
+__getstate__.
+"""
+import sys
+import os
+import argparse
+import copy
+import random
+import time
+import tracemalloc
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.tetracoin.spec import GridState, Entity, EntityType, ColorType, ENTITY_CLASSES
+
+class DictEntity:
+    """Stand-in for the dict-backed entity dataclasses."""
+    def __init__(self, **attributes):
+        self.__dict__.update(attributes)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state.pop("_owners", None)
+        return state
+
+def random_specs(rng: random.Random, rows: int, cols: int):
+    types = list(ENTITY_CLASSES)
+    specs = []
+    for n, (row, col) in enumerate(rng.sample([(r, c) for r in range(rows) for c in range(cols)], rows * cols // 2)):
+        entity_type = rng.choice(types)
+        specs.append(Entity.from_dict({"id": f"e{n}", "type": entity_type.value, "row": row, "col": col,
+                                       "color": rng.choice(list(ColorType)).value}).to_dict())
+    return specs
+
+def build(specs, rows, cols, slotted: bool) -> GridState:
+    grid = GridState(rows=rows, cols=cols)
+    for spec in specs:
+        if slotted:
+            grid.entities.append(Entity.from_dict(spec))
+        else:
+            attributes = dict(spec, type=EntityType(spec["type"]), color=ColorType(spec["color"]))
+            grid.entities.append(DictEntity(**attributes))
+    return grid
+
+def measure(label, fn, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    elapsed = (time.perf_counter() - started) / repeat
+    print(f"{label:<28} {elapsed * 1e6:>10.1f} us")
+    return elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description="Slotted entity memory and copy benchmark")
+    parser.add_argument("--grids", type=int, default=2000, help="Grids kept alive for the memory measurement")
+    parser.add_argument("--rows", type=int, default=14)
+    parser.add_argument("--cols", type=int, default=7)
+    parser.add_argument("--repeat", type=int, default=500, help="Repetitions of each timed operation")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    specs = [random_specs(rng, args.rows, args.cols) for _ in range(args.grids)]
+    print(f"{args.grids} grids of {args.rows}x{args.cols}, {len(specs[0])} entities each")
+
+    memory = {}
+    for slotted in (False, True):
+        tracemalloc.start()
+        grids = [build(s, args.rows, args.cols, slotted) for s in specs]
+        memory[slotted] = tracemalloc.get_traced_memory()[0] / len(grids)
+        tracemalloc.stop()
+        del grids
+    print(f"{'memory per grid (dict)':<28} {memory[False]:>10.0f} B")
+    print(f"{'memory per grid (slots)':<28} {memory[True]:>10.0f} B  ({memory[True] / memory[False]:.0%})")
+
+    dict_grid = build(specs[0], args.rows, args.cols, slotted=False)
+    grid = build(specs[0], args.rows, args.cols, slotted=True)
+    before = measure("deepcopy grid (dict)", lambda: copy.deepcopy(dict_grid), args.repeat)
+    after = measure("deepcopy grid (slots)", lambda: copy.deepcopy(grid), args.repeat)
+    measure("clone() every entity", lambda: [e.clone() for e in grid.entities], args.repeat)
+    print(f"{'deepcopy speedup':<28} {before / after:>10.1f} x")
+
+    dicts = [e.to_dict() for e in grid.entities]
+    measure("to_dict every entity", lambda: [e.to_dict() for e in grid.entities], args.repeat)
+    measure("from_dict every entity", lambda: [Entity.from_dict(d) for d in dicts], args.repeat)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Benchmark the parallel BFS against the serial one. Grids are sized from the
+generator's difficulty presets: coins sit above matching piggybanks behind
+movable blockers, so the solver has to search. Prints wall time and speedup
+per worker count, and checks that every run returns the serial result.
+"""
+import sys
+import os
+import argparse
+import random
+import time
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.tetracoin.level_generator_spec import TetracoinGenerationConfig, DifficultyLevel
+from src.tetracoin.solver import TetracoinSolver
+from src.tetracoin.spec import GridState, ColorType, Coin, PiggyBank, Obstacle, Support, Deflector, FixedBlock
+
+COLORS = [ColorType.RED, ColorType.BLUE, ColorType.GREEN, ColorType.YELLOW]
+
+def blocked_grid(config: TetracoinGenerationConfig, rng: random.Random) -> GridState:
+    """Solvable-by-construction grid: every coin falls into its piggybank once its column is cleared."""
+    rows, cols = config.grid_height, config.grid_width
+    grid = GridState(rows=rows, cols=cols)
+    used = set()
+
+    def place(cls, row, col, **kwargs):
+        if (row, col) in used:
+            return False
+        used.add((row, col))
+        grid.entities.append(cls(id=f"{cls.__name__.lower()}_{len(used)}", row=row, col=col, **kwargs))
+        return True
+
+    piggy_cols = rng.sample(range(cols), min(config.num_piggybanks, cols, len(COLORS)))
+    counts = [0] * len(piggy_cols)
+    for _ in range(config.num_coins):
+        k = rng.randrange(len(piggy_cols))
+        if place(Coin, rng.randrange(rows - 2), piggy_cols[k], color=COLORS[k]):
+            counts[k] += 1
+    for k, col in enumerate(piggy_cols):
+        place(PiggyBank, rows - 1, col, color=COLORS[k], capacity=max(1, counts[k]))
+
+    blockers = max(1, int(config.obstacle_density * rows * cols) // 4)
+    for _ in range(blockers):
+        place(rng.choice([Obstacle, Support, Deflector]), rng.randrange(1, rows - 1), rng.choice(piggy_cols),
+              color=ColorType.GRAY)
+    other_cols = [c for c in range(cols) if c not in piggy_cols]
+    for _ in range(blockers if other_cols else 0):
+        place(rng.choice([Obstacle, Support, FixedBlock]), rng.randrange(rows - 1), rng.choice(other_cols),
+              color=ColorType.GRAY)
+    return grid
+
+def main():
+    parser = argparse.ArgumentParser(description="Parallel BFS speedup benchmark")
+    parser.add_argument("--difficulties", type=str, default="EASY,MEDIUM,HARD", help="Presets (comma separated)")
+    parser.add_argument("--workers", type=str, default="1,2,4,8", help="Worker counts (comma separated)")
+    parser.add_argument("--grids", type=int, default=5, help="Grids per preset")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-depth", type=int, default=20)
+    parser.add_argument("--max-nodes", type=int, default=50000)
+    args = parser.parse_args()
+
+    worker_counts = [int(w) for w in args.workers.split(",")]
+
+    print(f"CPUs: {os.cpu_count()}")
+    print(f"{'preset':<8} {'workers':>7} {'time (s)':>9} {'speedup':>8} {'nodes':>8}")
+    for name in args.difficulties.split(","):
+        difficulty = DifficultyLevel[name.strip().upper()]
+        config = TetracoinGenerationConfig.from_difficulty(difficulty)
+        rng = random.Random(args.seed)
+        grids = [blocked_grid(config, rng) for _ in range(args.grids)]
+        baseline = None
+        reference = None
+        for workers in worker_counts:
+            started = time.perf_counter()
+            results = [TetracoinSolver.solve_bfs(g, max_depth=args.max_depth, max_nodes=args.max_nodes, workers=workers)
+                       for g in grids]
+            elapsed = time.perf_counter() - started
+
+            signature = [(r.status, r.moves, r.nodes_explored) for r in results]
+            if reference is None:
+                reference, baseline = signature, elapsed
+            elif signature != reference:
+                print(f"MISMATCH: {difficulty.name} with {workers} workers differs from {worker_counts[0]} worker(s)")
+                sys.exit(1)
+
+            nodes = sum(r.nodes_explored for r in results)
+            print(f"{difficulty.name:<8} {workers:>7} {elapsed:>9.2f} {baseline / elapsed:>7.2f}x {nodes:>8}")
+
+if __name__ == "__main__":
+    main()
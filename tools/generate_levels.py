@@ -14,12 +14,14 @@ from src.tetracoin.level_generator import TetracoinLevelGenerator
 from src.tetracoin.level_generator_spec import TetracoinGenerationConfig, DifficultyLevel, TetracoinLevel
 from src.tetracoin.config_validator import TetracoinConfigValidator
 from src.tetracoin.solver import TetracoinSolver
+from src.tetracoin.solve_cache import SolveCache
 
 def main():
     parser = argparse.ArgumentParser(description="Generate Tetracoin Levels V2")
     parser.add_argument("--count", type=int, default=10, help="Number of levels to generate")
     parser.add_argument("--out", type=str, required=True, help="Output directory")
     parser.add_argument("--curve", type=str, default="EASY,MEDIUM", help="Difficulty curve (comma separated)")
+    parser.add_argument("--cache", type=str, default=None, help="sqlite file caching solver results across runs")
 
     args = parser.parse_args()
     
@@ -35,7 +37,10 @@ def main():
     curve = [DifficultyLevel[d.upper()] for d in args.curve.split(",")]
     # Cycle curve if count > len(curve)
     
-    lvl_gen = TetracoinLevelGenerator(enable_detailed_logging=True, enable_auto_adjustment=False)
+    # Persisted with --cache: candidates seen in earlier runs are not searched again
+    solve_cache = SolveCache(path=args.cache)
+    lvl_gen = TetracoinLevelGenerator(enable_detailed_logging=True, enable_auto_adjustment=False,
+                                      solve_cache=solve_cache)
     validator = TetracoinConfigValidator()
     solver = TetracoinSolver()
     
@@ -65,10 +70,11 @@ def main():
         val_status = "OK" if val_res.is_valid else "FAIL"
         
         # 3. Solvability Check
-        found, steps, moves = solver.solve_bfs(level.grid)
-        solution = moves if found else None
-        sol_len = steps if found else 0
-        sol_status = "OK" if solution else "FAIL"
+        # Replay the generator's solution instead of searching again
+        solution = level.solution_hint or []
+        verification = solver.verify(level.grid, solution)
+        sol_len = len(solution) if verification else 0
+        sol_status = "OK" if verification else "FAIL"
         
         # GDD: target_moves? Generator doesn't explicitly output target moves yet, 
         # usually derived from solution length.
@@ -124,7 +130,8 @@ def main():
     with open(os.path.join(out_dir, "solver_results.json"), 'w') as f:
         json.dump(results, f, indent=2)
         
-    print("Generation Batch Complete.")
+    solve_cache.close()
+    print(f"Generation Batch Complete. Solve cache: {solve_cache.hits} hits, {solve_cache.misses} misses.")
 
 if __name__ == "__main__":
     main()